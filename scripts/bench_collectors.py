@@ -0,0 +1,143 @@
+"""采集器离线基准：回放录制的响应，不访问网络
+
+每个采集器分别计时（HTTP 采集器走回放 transport，Playwright 采集器读录制的渲染后 HTML），
+报告解析耗时、条目/秒和峰值内存，再测一次 NewsAggregator.collect_all 的端到端耗时。
+录制见 tests/fixtures/replay/manifest.json。
+
+用法：
+    uv run python scripts/bench_collectors.py [--rounds 20] [--json out.json] [--compare base.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.collectors import NewsAggregator, rss_base  # noqa: E402
+from src.collectors.http_cache import HttpCache  # noqa: E402
+from src.collectors.replay import Recording  # noqa: E402
+
+STATE_DIR = Path(tempfile.mkdtemp(prefix="bench_collectors_"))
+
+
+def _fresh_state():
+    """每轮换一个空的 HTTP 缓存，避免 RSS 复用上轮条目而跳过解析；不写 data/archive"""
+    rss_base.http_cache = HttpCache(path=STATE_DIR / "http_cache.json")
+
+
+def _aggregator(recording: Recording) -> NewsAggregator:
+    aggregator = NewsAggregator()
+    for collector in [*aggregator.collectors, *aggregator.playwright_collectors]:
+        recording.attach(collector)
+    return aggregator
+
+
+async def _bench_collector(collector, rounds: int) -> dict:
+    times = []
+    items = []
+    for _ in range(rounds):
+        _fresh_state()
+        start = time.perf_counter()
+        items = await collector.collect()
+        times.append(time.perf_counter() - start)
+
+    _fresh_state()
+    tracemalloc.start()
+    await collector.collect()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "items": len(items),
+        "best_ms": best * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "items_per_sec": len(items) / best if best else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+async def _bench_collect_all(recording: Recording, rounds: int) -> dict:
+    times = []
+    count = 0
+    for _ in range(rounds):
+        _fresh_state()
+        aggregator = _aggregator(recording)
+        start = time.perf_counter()
+        collection = await aggregator.collect_all()
+        times.append(time.perf_counter() - start)
+        count = len(collection.items)
+        for collector in aggregator.collectors:
+            await collector.close()
+    return {"items": count, "best_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000}
+
+
+async def run(rounds: int) -> dict:
+    recording = Recording()
+    aggregator = _aggregator(recording)
+    sources = {}
+    try:
+        for collector in [*aggregator.collectors, *aggregator.playwright_collectors]:
+            sources[collector.name] = await _bench_collector(collector, rounds)
+    finally:
+        for collector in aggregator.collectors:
+            await collector.close()
+    return {"sources": sources, "collect_all": await _bench_collect_all(recording, rounds)}
+
+
+def _report(result: dict, baseline: dict | None):
+    def delta(now: float, before: float | None) -> str:
+        if not before:
+            return ""
+        return f"{(now - before) / before * 100:+6.1f}%"
+
+    base_sources = (baseline or {}).get("sources", {})
+    header = f"{'source':<30}{'items':>6}{'best ms':>10}{'median ms':>11}{'items/s':>10}{'peak KB':>10}"
+    if baseline:
+        header += f"{'Δ best':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, s in result["sources"].items():
+        line = (
+            f"{name:<30}{s['items']:>6}{s['best_ms']:>10.2f}{s['median_ms']:>11.2f}"
+            f"{s['items_per_sec']:>10.0f}{s['peak_kb']:>10.0f}"
+        )
+        if baseline:
+            line += f"{delta(s['best_ms'], base_sources.get(name, {}).get('best_ms')):>9}"
+        print(line)
+    print("-" * len(header))
+    total = result["collect_all"]
+    line = f"{'collect_all':<30}{total['items']:>6}{total['best_ms']:>10.2f}{total['median_ms']:>11.2f}"
+    if baseline:
+        line += " " * 20 + f"{delta(total['best_ms'], baseline.get('collect_all', {}).get('best_ms')):>9}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="把结果写入 JSON 文件")
+    parser.add_argument("--compare", type=Path, help="与之前 --json 保存的结果对比")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    result = asyncio.run(run(args.rounds))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    _report(result, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
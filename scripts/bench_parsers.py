@@ -0,0 +1,81 @@
+"""HTML 解析后端微基准：在保存的样例页面上对比各后端的解析耗时
+
+样例页面在 tests/fixtures/html/，每个来源分别计时：
+- parse：只建树（parse_html）
+- extract：完整的 parse_page（建树 + 选择器提取 NewsItem）
+
+用法：
+    uv run python scripts/bench_parsers.py [--rounds 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.collectors import html_parser  # noqa: E402
+from src.collectors.cls_playwright import CLSPlaywrightCollector  # noqa: E402
+from src.collectors.eastmoney_playwright import EastMoneyPlaywrightCollector  # noqa: E402
+from src.collectors.jin10 import Jin10Collector  # noqa: E402
+from src.collectors.sina_playwright import SinaPlaywrightCollector  # noqa: E402
+from src.collectors.stcn import StcnCollector  # noqa: E402
+from src.collectors.wallstreetcn import WallStreetCNCollector  # noqa: E402
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "html"
+
+# 复用同一个事件循环，避免 asyncio.run 的建/关循环开销混进计时
+_run = asyncio.new_event_loop().run_until_complete
+
+SOURCES = {
+    "stcn": lambda html: StcnCollector().parse_page(html),
+    "cls": lambda html: _run(CLSPlaywrightCollector().parse_page("", html)),
+    "sina": lambda html: _run(SinaPlaywrightCollector().parse_page("", html)),
+    "eastmoney": lambda html: _run(EastMoneyPlaywrightCollector().parse_page("", html)),
+    "wallstreetcn": lambda html: _run(WallStreetCNCollector().parse_page("", html)),
+    "jin10": lambda html: _run(Jin10Collector().parse_page("", html)),
+}
+
+
+def _best_ms(fn, rounds: int) -> float:
+    """取多轮中最快的一次，减少调度抖动"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    backends = html_parser.available_backends()
+    header = f"{'source':<14}{'KB':>6}" + "".join(f"{b + ' parse/extract ms':>34}" for b in backends)
+    print(header)
+    print("-" * len(header))
+
+    totals = {b: 0.0 for b in backends}
+    for source, extract in SOURCES.items():
+        html = (FIXTURES / f"{source}.html").read_text()
+        row = f"{source:<14}{len(html.encode()) / 1024:>6.1f}"
+        for backend in backends:
+            html_parser.DEFAULT_BACKEND = backend
+            parse_ms = _best_ms(lambda: html_parser.parse_html(html, backend), args.rounds)
+            extract_ms = _best_ms(lambda: extract(html), args.rounds)
+            totals[backend] += extract_ms
+            row += f"{f'{parse_ms:.2f} / {extract_ms:.2f}':>34}"
+        print(row)
+
+    baseline = totals["html.parser"]
+    print("-" * len(header))
+    for backend, total in totals.items():
+        print(f"{backend:<14} extract 合计 {total:7.2f} ms  ({baseline / total:4.1f}x vs html.parser)")
+
+
+if __name__ == "__main__":
+    main()
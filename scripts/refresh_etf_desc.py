@@ -2,22 +2,25 @@
 
 用法：
     CLAUDE_API_KEY=xxx uv run python scripts/refresh_etf_desc.py
+
+AI 请求走 AIClient（与分析流程同一接口），输入不变的批次直接复用缓存；
+要强制重新生成，设置 AI_CACHE_BYPASS=1。
 """
 
 import asyncio
 import json
 import os
+import sys
 from pathlib import Path
 
-import httpx
 from loguru import logger
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY", "")
-CLAUDE_BASE_URL = os.getenv("CLAUDE_BASE_URL", "https://api.anthropic.com")
-CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
 
-async def ai_generate_desc(client: httpx.AsyncClient, etf_infos: list[dict]) -> dict:
+async def ai_generate_desc(etf_infos: list[dict]) -> dict:
     """AI 批量生成 ETF 描述"""
     etf_list = "\n".join([
         f"- {info['code']} {info.get('name','')}: {info.get('scope','')[:150]}"
@@ -43,28 +46,16 @@ async def ai_generate_desc(client: httpx.AsyncClient, etf_infos: list[dict]) ->
 {{"ETF代码": {{"desc": "描述", "tags": ["别名1", "别名2", ...]}}, ...}}
 ```"""
 
+    from src.services.ai_client import AIClient, AIRequest, parse_json_with_repair
+
     try:
-        resp = await client.post(
-            f"{CLAUDE_BASE_URL.rstrip('/')}/v1/messages",
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": CLAUDE_API_KEY,
-                "anthropic-version": "2023-06-01",
-            },
-            json={
-                "model": CLAUDE_MODEL,
-                "max_tokens": 4096,
-                "messages": [{"role": "user", "content": prompt}]
-            },
+        text = await AIClient().send(AIRequest(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=4096,
             timeout=120,
-        )
-        resp.raise_for_status()
-        text = resp.json()["content"][0]["text"].strip()
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
-        return json.loads(text)
+            purpose="etf_desc_refresh",
+        ))
+        return parse_json_with_repair(text)
     except Exception as e:
         logger.warning(f"AI生成描述失败: {e}")
         return {}
@@ -84,15 +75,17 @@ async def main():
     # 转为列表
     etf_list = list(etfs.values())
 
-    # 批量生成描述
+    # 批量生成描述（各批次并发，并发数和速率由 AIClient 统一控制）
+    from src.services.ai_client import close_ai_client
+
+    batches = [etf_list[i:i+30] for i in range(0, len(etf_list), 30)]
+    logger.info(f"分 {len(batches)} 批并发处理...")
     all_descs = {}
-    async with httpx.AsyncClient(timeout=120) as client:
-        for i in range(0, len(etf_list), 30):
-            batch = etf_list[i:i+30]
-            logger.info(f"处理 {i+1}-{i+len(batch)}/{len(etf_list)}...")
-            descs = await ai_generate_desc(client, batch)
+    try:
+        for descs in await asyncio.gather(*(ai_generate_desc(b) for b in batches)):
             all_descs.update(descs)
-            await asyncio.sleep(1)
+    finally:
+        await close_ai_client()
 
     # 更新描述和tags
     updated = 0
@@ -6,24 +6,31 @@
 功能：
     1. 从新浪获取全量 ETF 列表
     2. 爬取东方财富获取详细信息（管理人、投资范围等）
-    3. AI 批量分类到板块 + 精炼描述
+    3. AI 批量分类到板块 + 精炼描述 + 板块别名（一批一次调用）
     4. 保存到 config/etf_master.json
+
+AI 调用走 AIClient（OpenAI 兼容的 {CLAUDE_BASE_URL}/chat/completions，模型取 CLAUDE_MODEL），
+与分析流程共用同一套 key 和中转地址；只支持 Anthropic /v1/messages 的地址不可用。
+GitHub Actions 每月 1 号运行一次（update_etf_master.yml）。
 """
 
 import asyncio
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 
-import httpx
 from loguru import logger
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.services.http_pool import HostPool  # noqa: E402
+from src.services.kline_store import KlineStore  # noqa: E402
+from src.services.rate_limiter import HostScheduler, parse_policies  # noqa: E402
+
 # 配置
 CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY", "")
-CLAUDE_BASE_URL = os.getenv("CLAUDE_BASE_URL", "https://api.anthropic.com")
-CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
 # 排除关键词
 EXCLUDE_KEYWORDS = [
@@ -41,36 +48,35 @@ def should_exclude(name: str) -> bool:
     return any(kw in name for kw in EXCLUDE_KEYWORDS)
 
 
-async def fetch_all_etfs() -> list[dict]:
+async def fetch_all_etfs(client: HostPool) -> list[dict]:
     """从新浪获取全量 ETF"""
     all_etfs = []
-    async with httpx.AsyncClient(timeout=30) as client:
-        for page in range(1, 15):
-            resp = await client.get(
-                "https://vip.stock.finance.sina.com.cn/quotes_service/api/json_v2.php/Market_Center.getHQNodeData",
-                params={
-                    "page": page, "num": 100,
-                    "sort": "amount", "asc": 0,
-                    "node": "etf_hq_fund",
-                },
-                headers={"Referer": "https://finance.sina.com.cn"},
-            )
-            data = resp.json()
-            if not data:
-                break
-            for item in data:
-                all_etfs.append({
-                    "code": item.get("code", ""),
-                    "name": item.get("name", ""),
-                    "amount": float(item.get("amount", 0)),
-                })
-            if len(data) < 100:
-                break
+    for page in range(1, 15):
+        resp = await client.get(
+            "https://vip.stock.finance.sina.com.cn/quotes_service/api/json_v2.php/Market_Center.getHQNodeData",
+            params={
+                "page": page, "num": 100,
+                "sort": "amount", "asc": 0,
+                "node": "etf_hq_fund",
+            },
+            headers={"Referer": "https://finance.sina.com.cn"},
+        )
+        data = resp.json()
+        if not data:
+            break
+        for item in data:
+            all_etfs.append({
+                "code": item.get("code", ""),
+                "name": item.get("name", ""),
+                "amount": float(item.get("amount", 0)),
+            })
+        if len(data) < 100:
+            break
     logger.info(f"获取到 {len(all_etfs)} 个 ETF")
     return all_etfs
 
 
-async def fetch_etf_detail(client: httpx.AsyncClient, code: str) -> dict:
+async def fetch_etf_detail(client: HostPool, code: str) -> dict:
     """从东方财富爬取 ETF 详细信息"""
     try:
         url = f"https://fundf10.eastmoney.com/jbgk_{code}.html"
@@ -117,106 +123,79 @@ async def fetch_etf_detail(client: httpx.AsyncClient, code: str) -> dict:
         return {"code": code}
 
 
-async def ai_classify_batch(client: httpx.AsyncClient, etf_infos: list[dict]) -> dict:
-    """AI 批量分类 ETF 到板块"""
-    if not etf_infos or not CLAUDE_API_KEY:
-        return {}
-
-    etf_list = "\n".join([
-        f"- {info['code']} {info.get('short_name','')}: {info.get('scope','')[:150]}"
-        for info in etf_infos
-    ])
-
-    prompt = f"""对以下ETF进行行业板块分类并生成描述。
-
-## ETF列表
-{etf_list}
+# AI 分类只能使用的板块（无法归类的为"其他"）
+SECTORS = [
+    "AI", "白酒", "传媒", "电力", "房地产", "钢铁", "港股", "光伏", "互联网", "化工",
+    "环保", "黄金", "机器人", "家电", "军工", "煤炭", "农业", "汽车", "软件", "石油",
+    "通信", "消费", "芯片", "新能源", "医药", "银行", "游戏", "有色", "证券", "锂电池",
+]
 
-## 分类规则
-1. 分类到A股行业板块：AI、白酒、传媒、电力、房地产、钢铁、港股、光伏、互联网、化工、环保、黄金、机器人、家电、军工、煤炭、农业、汽车、软件、石油、通信、消费、芯片、新能源、医药、银行、游戏、有色、证券、锂电池
-2. 无法分类的标记为"其他"
 
-## 描述要求
-- 20-30字，突出投资标的和特点
-- 不要重复ETF名称
-- 示例：
-  - 黄金ETF → "跟踪上海金现货，对冲通胀和避险首选"
-  - 芯片ETF → "覆盖半导体设计、制造、封测全产业链龙头"
-  - 证券ETF → "券商股打包投资，牛市弹性大"
+KLINE_LIMIT = 95
 
-## 输出JSON
-```json
-{{
-  "ETF代码": {{"sector": "板块", "desc": "描述"}},
-  ...
-}}
-```"""
 
-    try:
-        resp = await client.post(
-            f"{CLAUDE_BASE_URL.rstrip('/')}/v1/messages",
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": CLAUDE_API_KEY,
-                "anthropic-version": "2023-06-01",
-            },
-            json={
-                "model": CLAUDE_MODEL,
-                "max_tokens": 4096,
-                "messages": [{"role": "user", "content": prompt}]
-            },
-            timeout=120,
-        )
-        resp.raise_for_status()
-        text = resp.json()["content"][0]["text"].strip()
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
-        return json.loads(text)
-    except Exception as e:
-        logger.warning(f"AI分类失败: {e}")
-        return {}
-
-
-async def fetch_kline_changes(client: httpx.AsyncClient, code: str) -> dict:
-    """获取 ETF 的 90 天 K 线数据和 5日/20日涨跌幅（东方财富 → 新浪降级）"""
+async def _fetch_kline_bars(
+    client: HostPool, code: str, beg: str | None = None
+) -> list[tuple[str, float]]:
+    """拉取 (date, close) 序列，beg 非空时只拉取增量（东方财富 → 新浪降级）"""
     # 优先东方财富
     secid = f"1.{code}" if code.startswith("5") else f"0.{code}"
+    params = {
+        "secid": secid,
+        "fields1": "f1,f2,f3",
+        "fields2": "f51,f52,f53,f54,f55,f56",
+        "klt": "101",
+        "fqt": "1",
+        "end": "20500101",
+        "lmt": str(KLINE_LIMIT),
+    }
+    if beg:
+        params["beg"] = beg.replace("-", "")
     try:
         resp = await client.get(
             "https://push2his.eastmoney.com/api/qt/stock/kline/get",
-            params={
-                "secid": secid,
-                "fields1": "f1,f2,f3",
-                "fields2": "f51,f52,f53,f54,f55,f56",
-                "klt": "101",
-                "fqt": "1",
-                "end": "20500101",
-                "lmt": "95",
-            },
+            params=params,
         )
-        klines = resp.json().get("data", {}).get("klines", [])
+        klines = (resp.json().get("data") or {}).get("klines", [])
         if klines:
-            return _calc_changes([float(k.split(",")[2]) for k in klines])
+            return [(k.split(",")[0], float(k.split(",")[2])) for k in klines]
     except Exception:
         pass
 
-    # 降级：新浪 K 线 API
+    # 降级：新浪 K 线 API（只能按根数取）
     try:
         prefix = "sh" if code.startswith("5") else "sz"
+        datalen = KLINE_LIMIT
+        if beg:
+            gap = (datetime.now() - datetime.strptime(beg, "%Y-%m-%d")).days
+            datalen = min(KLINE_LIMIT, max(gap + 1, 5))
         resp = await client.get(
             "https://money.finance.sina.com.cn/quotes_service/api/json_v2.php/CN_MarketData.getKLineData",
-            params={"symbol": f"{prefix}{code}", "scale": "240", "ma": "no", "datalen": "95"},
+            params={"symbol": f"{prefix}{code}", "scale": "240", "ma": "no", "datalen": str(datalen)},
             headers={"Referer": "https://finance.sina.com.cn"},
         )
         data = resp.json()
-        if data and isinstance(data, list) and len(data) >= 2:
-            return _calc_changes([float(item["close"]) for item in data])
+        if data and isinstance(data, list):
+            bars = [(item["day"], float(item["close"])) for item in data]
+            return [(d, c) for d, c in bars if not beg or d >= beg]
     except Exception:
         pass
 
-    return {}
+    return []
+
+
+async def fetch_kline_changes(client: HostPool, code: str, store: KlineStore) -> dict:
+    """获取 ETF 的 90 天 K 线数据和 5日/20日涨跌幅（本地 K 线库只拉增量）"""
+    secid = f"1.{code}" if code.startswith("5") else f"0.{code}"
+    beg = store.plan(secid, KLINE_LIMIT)
+    bars = await _fetch_kline_bars(client, code, beg)
+    if beg and bars and not store.update(secid, bars):
+        # 历史价格变动（复权），全量重拉
+        beg = None
+        bars = await _fetch_kline_bars(client, code)
+    if not beg and bars:
+        store.replace(secid, bars, depth=KLINE_LIMIT)
+    return _calc_changes([c for _, c in store.load(secid)])
 
 
 def _calc_changes(closes: list[float]) -> dict:
@@ -235,13 +214,23 @@ def _calc_changes(closes: list[float]) -> dict:
 
 async def main():
     """主函数"""
+    # 行情请求共用一个按主机限速的连接池（RATE_LIMITS 环境变量可覆盖默认速率）
+    market = HostPool(timeout=30, scheduler=HostScheduler(parse_policies(os.getenv("RATE_LIMITS", ""))))
+    try:
+        await _main(market)
+    finally:
+        logger.info(f"行情请求调度统计: {market.scheduler.stats()}")
+        await market.aclose()
+
+
+async def _main(market: HostPool):
     if not CLAUDE_API_KEY:
         logger.error("请设置 CLAUDE_API_KEY 环境变量")
         return
 
     # Step 1: 获取全量 ETF
     logger.info("=== Step 1: 获取 ETF 列表 ===")
-    all_etfs = await fetch_all_etfs()
+    all_etfs = await fetch_all_etfs(market)
 
     # 筛选活跃 ETF
     active_etfs = [
@@ -252,54 +241,40 @@ async def main():
 
     # Step 2: 爬取详细信息
     logger.info("=== Step 2: 获取 ETF 详情 ===")
-    details = []
-    async with httpx.AsyncClient(timeout=30) as client:
-        sem = asyncio.Semaphore(5)
-
-        async def fetch_with_sem(etf):
-            async with sem:
-                detail = await fetch_etf_detail(client, etf["code"])
-                detail["name"] = etf["name"]
-                detail["amount_yi"] = round(etf["amount"] / 1e8, 2)
-                return detail
-
-        tasks = [fetch_with_sem(e) for e in active_etfs]
-        details = await asyncio.gather(*tasks)
-        details = [d for d in details if d.get("code")]
+
+    async def fetch_detail(etf):
+        detail = await fetch_etf_detail(market, etf["code"])
+        detail["name"] = etf["name"]
+        detail["amount_yi"] = round(etf["amount"] / 1e8, 2)
+        return detail
+
+    details = await asyncio.gather(*(fetch_detail(e) for e in active_etfs))
+    details = [d for d in details if d.get("code")]
     logger.info(f"获取到 {len(details)} 个 ETF 详情")
 
-    # Step 3: AI 批量分类
+    # Step 3: AI 批量分类 + 描述 + 别名（与 FundService.build_etf_master 同一流程：
+    # 一批一次调用，按输入长度分批并发，失败的批次拆开重试；并发数和速率见 AI_CONCURRENCY / AI_RATE）
     logger.info("=== Step 3: AI 分类 ===")
-    all_classifications = {}
-    async with httpx.AsyncClient(timeout=120) as client:
-        for i in range(0, len(details), 30):
-            batch = details[i:i+30]
-            logger.info(f"处理 {i+1}-{i+len(batch)}/{len(details)}...")
-            result = await ai_classify_batch(client, batch)
-            all_classifications.update(result)
-            await asyncio.sleep(1)  # 避免限流
-
-    # Step 4: 获取 K 线数据（小批量 + 长间隔，避免被限流）
+    from src.services.ai_client import close_ai_client
+    from src.services.fund_service import fund_service
+
+    try:
+        all_classifications = await fund_service.enrich_etfs(details, sectors=SECTORS)
+    finally:
+        await close_ai_client()
+
+    # Step 4: 获取 K 线数据（本地 K 线库增量更新；速率由主机调度器控制）
     logger.info("=== Step 4: 获取 K 线数据 ===")
+    store = KlineStore()
     kline_map = {}
     codes = [d["code"] for d in details]
-    batch_size = 10
-    async with httpx.AsyncClient(
-        timeout=15,
-        limits=httpx.Limits(max_connections=2),
-        headers={"Referer": "https://finance.sina.com.cn"},
-    ) as client:
-        for i in range(0, len(codes), batch_size):
-            batch = codes[i:i + batch_size]
-            tasks = [fetch_kline_changes(client, c) for c in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for code, result in zip(batch, results):
-                if isinstance(result, dict) and result:
-                    kline_map[code] = result
-            if (i // batch_size) % 10 == 0:
-                logger.info(f"  K线进度: {min(i + batch_size, len(codes))}/{len(codes)}, 成功: {len(kline_map)}")
-            if i + batch_size < len(codes):
-                await asyncio.sleep(2)
+    results = await asyncio.gather(
+        *(fetch_kline_changes(market, c, store) for c in codes),
+        return_exceptions=True,
+    )
+    for code, result in zip(codes, results):
+        if isinstance(result, dict) and result:
+            kline_map[code] = result
     logger.info(f"获取到 {len(kline_map)}/{len(details)} 个 ETF 的 K 线数据")
 
     # Step 5: 构建最终数据
@@ -311,6 +286,8 @@ async def main():
         code = detail["code"]
         classify = all_classifications.get(code, {})
         sector = classify.get("sector", "其他")
+        if sector not in SECTORS:
+            sector = "其他"
         desc = classify.get("desc", "")
 
         kline_data = kline_map.get(code, {})
@@ -323,7 +300,9 @@ async def main():
             "establish_date": detail.get("establish_date", ""),
             "amount_yi": detail.get("amount_yi", 0),
             "sector": sector,
+            "related": [r for r in classify.get("related") or [] if r in SECTORS and r != sector],
             "desc": desc,
+            "tags": [t for t in classify.get("tags") or [] if isinstance(t, str)],
             "scope": detail.get("scope", "")[:200],
             "risk": detail.get("risk", "")[:100],
             "change_5d": kline_data.get("change_5d", 0),
@@ -6,14 +6,18 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from loguru import logger
 
-from src.models import NewsItem
+from src.models import NewsCategory, NewsItem
+from src.collectors.seen_store import SeenStore, build_seen_digest
 from src.config import settings
+from src.metrics import metrics
 from src.worker_simple import (
     DATA_DIR, ARCHIVE_DIR,
     archive_data, load_history, format_history_context,
-    enrich_sectors_with_etfs, save_news, build_sector_trends, update_review,
+    EtfPrefetcher, enrich_sectors_with_etfs, save_news, build_sector_trends, update_review,
 )
 from src.analyzers.realtime import analyze
+from src.services.ai_client import close_ai_client
+from src.services.fund_service import fund_service
 from src.notify import send_wechat_message, format_analysis_message
 
 
@@ -57,6 +61,9 @@ def load_news_raw() -> tuple[list[NewsItem], dict]:
             title=item["title"],
             source=item["source"],
             url=item.get("url", ""),
+            dup_count=item.get("dup_count", 1),
+            is_new=item.get("is_new", True),
+            category=item.get("category", NewsCategory.OTHER),
         )
         if item.get("published_at"):
             news_item.published_at = datetime.fromisoformat(item["published_at"])
@@ -65,8 +72,32 @@ def load_news_raw() -> tuple[list[NewsItem], dict]:
     return items, data.get("source_stats", {})
 
 
+def _write_metrics():
+    """写 metrics.json（与 latest.json 同目录），附上 news_raw.json 中采集阶段的指标"""
+    collect_metrics = None
+    raw_file = DATA_DIR / "news_raw.json"
+    if raw_file.exists():
+        try:
+            collect_metrics = json.loads(raw_file.read_text()).get("metrics")
+        except Exception as e:
+            logger.warning(f"读取采集指标失败: {e}")
+    try:
+        metrics.write(DATA_DIR / "metrics.json", extra={"collect": collect_metrics} if collect_metrics else None)
+    except Exception as e:
+        logger.warning(f"写入运行指标失败: {e}")
+
+
 async def run():
     """运行分析"""
+    try:
+        await _run()
+    finally:
+        await fund_service.aclose()
+        await close_ai_client()
+        _write_metrics()
+
+
+async def _run():
     logger.info("=" * 50)
     logger.info("开始分析新闻")
     logger.info("=" * 50)
@@ -74,32 +105,64 @@ async def run():
     beijing_tz = timezone(timedelta(hours=8))
 
     # 加载新闻
-    items, source_stats = load_news_raw()
+    with metrics.timer("stage_seconds", stage="load_news"):
+        items, source_stats = load_news_raw()
+    metrics.inc("news_loaded", len(items))
     if len(items) < 20:
         logger.warning(f"新闻不足 ({len(items)} < 20)")
         return
 
     logger.info(f"加载 {len(items)} 条新闻")
 
+    # 增量模式：只分析今天新出现的新闻，已分析过的压缩成摘要作为背景
+    seen = SeenStore()
+    analyze_items, seen_digest = items, ""
+    if settings.analysis_mode == "incremental" and len(seen):
+        seen.tag(items)
+        analyze_items = [item for item in items if item.is_new]
+        if not analyze_items:
+            logger.info("没有今日未分析过的新闻，跳过分析")
+            return
+        seen_digest = build_seen_digest([item for item in items if not item.is_new])
+        logger.info(f"增量分析: {len(analyze_items)} 条新新闻，{len(items) - len(analyze_items)} 条已分析过（摘要）")
+
     # 归档旧数据
-    archive_data(beijing_tz)
+    with metrics.timer("stage_seconds", stage="archive"):
+        archive_data(beijing_tz)
+
+    # 交易日历（沪深300日K，本地K线库增量更新），信号复盘用
+    with metrics.timer("stage_seconds", stage="trading_calendar"):
+        calendar = await fund_service.get_trading_calendar()
 
     # 加载历史
-    history = load_history(days=7)
-    history_context = format_history_context(history)
+    with metrics.timer("stage_seconds", stage="load_history"):
+        history = load_history(days=7)
+        history_context = format_history_context(history)
     if history_context:
         logger.info(f"📜 历史上下文:\n{history_context}")
 
     # 读取板块列表
     master_file = Path(__file__).parent.parent / "config" / "etf_master.json"
     sector_list = None
+    prefetcher = None
     if master_file.exists():
         master = json.loads(master_file.read_text())
         sector_list = master.get("sector_list", [])
+        prefetcher = EtfPrefetcher(master)
 
     # AI 分析
     logger.info("AI 分析中...")
-    result = await analyze(items, sector_list=sector_list, history_context=history_context)
+    metrics.inc("news_analyzed", len(analyze_items))
+    sent: list[NewsItem] = []  # 实际送入提示词的新闻
+    with metrics.timer("stage_seconds", stage="ai_analyze"):
+        result = await analyze(
+            analyze_items,
+            sector_list=sector_list,
+            history_context=history_context,
+            seen_digest=seen_digest,
+            on_sector=prefetcher.add if prefetcher else None,
+            sent=sent,
+        )
 
     if not result or not result.get("sectors"):
         logger.error("分析失败")
@@ -110,14 +173,17 @@ async def run():
     logger.info(f"分析完成: {len(result['sectors'])} 个板块")
 
     # 匹配 ETF
-    await enrich_sectors_with_etfs(result)
+    with metrics.timer("stage_seconds", stage="enrich_etfs"):
+        await enrich_sectors_with_etfs(result, prefetcher)
 
     # 构建7日趋势
-    sector_trends = build_sector_trends(history, result.get("sectors", []))
+    with metrics.timer("stage_seconds", stage="sector_trends"):
+        sector_trends = build_sector_trends(history, result.get("sectors", []))
     logger.info(f"构建趋势: {len(sector_trends)} 个板块")
 
     # 信号复盘
-    review = await update_review(result, beijing_tz)
+    with metrics.timer("stage_seconds", stage="update_review"):
+        review = await update_review(result, beijing_tz, calendar)
 
     # 过热预警（P1）：基于热度、方向、置信度的轻量规则
     overheat = None
@@ -158,14 +224,20 @@ async def run():
     output_file.write_text(json.dumps(output, ensure_ascii=False, indent=2))
     logger.info(f"保存: {output_file}")
 
+    # 记录已分析的新闻指纹（下次增量分析时跳过）：只记实际送入提示词的，预算省略的下次还能分析
+    seen.add(sent)
+    seen.save()
+
     # 保存新闻列表
-    await save_news(items, beijing_tz)
+    with metrics.timer("stage_seconds", stage="save_news"):
+        await save_news(items, beijing_tz)
 
     # 企业微信推送
     if settings.wechat_webhook_url:
         logger.info("发送企业微信推送...")
         message = format_analysis_message(output)
-        await send_wechat_message(settings.wechat_webhook_url, message)
+        with metrics.timer("stage_seconds", stage="notify"):
+            await send_wechat_message(settings.wechat_webhook_url, message)
 
     logger.info("分析完成")
 
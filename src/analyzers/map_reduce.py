@@ -0,0 +1,123 @@
+"""分片汇总 - 新闻量大时先按类别分片并发提炼要点（map），再由主分析汇总（reduce）
+
+- 分片：按新闻类别（采集时的 category，缺失时用 classify_news 按标题归类），
+  每片最多 SHARD_SIZE 条，超出的再切
+- map：每片一次 AI 调用，输出若干条「- 要点」，并发数受信号量限制
+- 容错：单片失败只记录并在汇总里注明缺失，全部失败时返回空串，由调用方退回单次分析；
+  同时返回成功分片覆盖的新闻，增量模式只把这些记为已分析
+- reduce：realtime.analyze 用汇总替换新闻列表，沿用原有提示词和输出格式
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.collectors.base import classify_news
+from src.metrics import metrics
+from src.models import NewsCategory, NewsItem
+from src.services.ai_client import AIClient, AIRequest
+from src.analyzers.prompt_budget import format_news_line
+
+SHARD_SIZE = 60
+MAX_POINTS = 8
+
+CATEGORY_NAMES = {
+    NewsCategory.MACRO: "宏观政策",
+    NewsCategory.INDUSTRY: "行业板块",
+    NewsCategory.COMPANY: "公司动态",
+    NewsCategory.INTERNATIONAL: "国际市场",
+    NewsCategory.OTHER: "其他",
+}
+
+MAP_PROMPT = """你是A股ETF投资分析师。下面是「{category}」类新闻（共{count}条），请提炼对A股板块有影响的要点。
+
+## 新闻
+{news_list}
+
+## 输出要求
+- 最多{max_points}条，每条一行，以「- 」开头，30字以内
+- 每条写明涉及的板块和方向（利好/利空/中性），多家来源报道的优先
+- 只输出要点，不要其他内容
+"""
+
+
+@dataclass
+class Shard:
+    category: NewsCategory
+    part: int
+    items: list[NewsItem]
+
+    @property
+    def label(self) -> str:
+        name = CATEGORY_NAMES[self.category]
+        return f"{name}（{self.part}）" if self.part > 1 else name
+
+
+def shard_news(items: list[NewsItem], size: int = SHARD_SIZE) -> list[Shard]:
+    """按类别分片，保持原有顺序；类别内超过 size 条的按 size 切开"""
+    groups: dict[NewsCategory, list[NewsItem]] = {category: [] for category in CATEGORY_NAMES}
+    for item in items:
+        category = item.category
+        if category == NewsCategory.OTHER:
+            category = classify_news(item.title)
+        groups[category].append(item)
+    shards = []
+    for category, group in groups.items():
+        for start in range(0, len(group), size):
+            shards.append(Shard(category, start // size + 1, group[start:start + size]))
+    return shards
+
+
+async def _map_shard(client: AIClient, shard: Shard, semaphore: asyncio.Semaphore) -> list[str]:
+    news_list = "\n".join(format_news_line(i + 1, item) for i, item in enumerate(shard.items))
+    prompt = MAP_PROMPT.format(
+        category=CATEGORY_NAMES[shard.category],
+        count=len(shard.items),
+        news_list=news_list,
+        max_points=MAX_POINTS,
+    )
+    async with semaphore:
+        text = await client.send(AIRequest(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=1024,
+            timeout=60,
+            purpose="analyze_map",
+            cache=False,
+        ))
+    points = [line.strip() for line in text.splitlines() if line.strip().startswith("-")]
+    if not points:
+        raise ValueError(f"无要点输出: {text[:50]!r}")
+    return points[:MAX_POINTS]
+
+
+async def summarize_shards(items: list[NewsItem], concurrency: int = 3) -> tuple[str, list[NewsItem]]:
+    """分片并发提炼要点，返回 (按类别排列的汇总文本, 成功分片覆盖的新闻)；全部分片失败时返回 ("", [])"""
+    shards = shard_news(items)
+    client = AIClient()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_map_shard(client, shard, semaphore) for shard in shards),
+        return_exceptions=True,
+    )
+
+    sections, failed, covered = [], [], []
+    for shard, result in zip(shards, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"分片汇总失败 [{shard.label}]: {result}")
+            metrics.inc("analyze_shards", status="error")
+            failed.append(shard)
+            continue
+        metrics.inc("analyze_shards", status="ok")
+        covered.extend(shard.items)
+        sections.append(f"### {shard.label}（{len(shard.items)}条）\n" + "\n".join(result))
+
+    logger.info(f"分片汇总: {len(shards) - len(failed)}/{len(shards)} 片成功，耗时 {time.perf_counter() - start:.1f}s")
+    if not sections:
+        return "", []
+    if failed:
+        missing = "、".join(f"{s.label}{len(s.items)}条" for s in failed)
+        sections.append(f"（以下分片汇总失败，未纳入：{missing}）")
+    return "以下为按类别提炼的新闻要点：\n\n" + "\n\n".join(sections), covered
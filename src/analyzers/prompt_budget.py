@@ -0,0 +1,88 @@
+"""分析提示词预算 - 按 token 预算挑选送给 AI 的新闻
+
+新闻按优先级贪心装入预算：
+- 时效：越新越重要，按 RECENCY_HALF_LIFE_HOURS 半衰
+- 多源：被多个来源报道的（dup_count）加分
+- 来源多样性：同一来源每多选一条，后续条目的分数乘以 SOURCE_DECAY
+
+选中的新闻保持原有顺序输出，装不下的只统计条数。
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.models import NewsItem
+from src.services.ai_client import estimate_tokens
+
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+RECENCY_HALF_LIFE_HOURS = 6
+UNKNOWN_AGE_HOURS = 12  # 没有发布时间的新闻按这个时长计
+DUP_WEIGHT = 0.5  # 每翻一倍来源数增加的分数
+SOURCE_DECAY = 0.85
+
+
+def format_news_line(index: int, item: NewsItem) -> str:
+    dup = f"·{item.dup_count}源" if item.dup_count > 1 else ""
+    return f"{index}. [{item.source}{dup}] {item.title}"
+
+
+def _age_hours(item: NewsItem, now: datetime) -> float:
+    if item.published_at is None:
+        return UNKNOWN_AGE_HOURS
+    published = item.published_at
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=BEIJING_TZ)
+    return max(0.0, (now - published).total_seconds() / 3600)
+
+
+def score(item: NewsItem, now: datetime) -> float:
+    """不考虑来源多样性的基础分"""
+    recency = 0.5 ** (_age_hours(item, now) / RECENCY_HALF_LIFE_HOURS)
+    return recency + DUP_WEIGHT * math.log2(max(item.dup_count, 1))
+
+
+@dataclass
+class PackedNews:
+    items: list[NewsItem] = field(default_factory=list)
+    tokens: int = 0
+    dropped: int = 0
+
+    def render(self) -> str:
+        lines = [format_news_line(i + 1, item) for i, item in enumerate(self.items)]
+        if self.dropped:
+            lines.append(f"（另有 {self.dropped} 条较旧或来源重复的新闻因篇幅省略）")
+        return "\n".join(lines)
+
+
+def pack_news(items: list[NewsItem], budget: int, now: Optional[datetime] = None) -> PackedNews:
+    """在 token 预算内挑选新闻（预算按渲染后的行估算，含编号和换行）"""
+    now = now or datetime.now(BEIJING_TZ)
+    # 编号按最大序号估算、另加换行，保证渲染后不超预算
+    costs = [estimate_tokens(format_news_line(len(items), item)) + 1 for item in items]
+    scores = [score(item, now) for item in items]
+
+    # 惰性贪心：堆里是入堆时的有效分数；弹出后按当前来源计数重算，仍不低于堆顶才选中
+    heap = [(-s, i) for i, s in enumerate(scores)]
+    heapq.heapify(heap)
+    picked_per_source: dict[str, int] = {}
+    chosen: list[int] = []
+    used = 0
+    while heap:
+        _, i = heapq.heappop(heap)
+        source = items[i].source
+        current = scores[i] * SOURCE_DECAY ** picked_per_source.get(source, 0)
+        if heap and current < -heap[0][0]:
+            heapq.heappush(heap, (-current, i))
+            continue
+        if used + costs[i] > budget:
+            continue
+        used += costs[i]
+        chosen.append(i)
+        picked_per_source[source] = picked_per_source.get(source, 0) + 1
+
+    chosen.sort()
+    return PackedNews(items=[items[i] for i in chosen], tokens=used, dropped=len(items) - len(chosen))
@@ -1,15 +1,22 @@
 """简化版投资分析 - 无数据库，实时分析"""
 
 import asyncio
+from typing import Callable
 from datetime import datetime, timezone, timedelta
 from collections import Counter
 from loguru import logger
 from src.config import settings
 from src.models import NewsItem
 from src.collectors import NewsAggregator
-from src.services.ai_client import AIClient, AIRequest, parse_json_with_repair
+from src.metrics import metrics
+from src.services.ai_client import AIClient, AIRequest, JsonArrayStream, estimate_tokens, parse_json_with_repair
+from src.analyzers.map_reduce import summarize_shards
+from src.analyzers.prompt_budget import pack_news
 
 
+# 新闻列表至少保留的 token 预算（固定部分很长时也不至于一条新闻都不送）
+MIN_NEWS_TOKENS = 2000
+
 # 全局缓存
 _cache = {
     "result": None,
@@ -102,19 +109,24 @@ async def collect_news() -> tuple[list[NewsItem], dict]:
         await agg.close()
 
 
-async def analyze(items: list[NewsItem], sector_list: list[str] = None, history_context: str = "") -> dict:
+async def analyze(
+    items: list[NewsItem],
+    sector_list: list[str] = None,
+    history_context: str = "",
+    seen_digest: str = "",
+    on_sector: Callable[[dict], None] | None = None,
+    sent: list[NewsItem] | None = None,
+) -> dict:
     """AI分析新闻
 
     Args:
         items: 新闻列表
         sector_list: 可选板块列表（从 etf_master.json 读取）
         history_context: 历史分析上下文（用于趋势对比）
+        seen_digest: 今日此前已分析过的新闻摘要（增量模式）
+        on_sector: 开启 AI_STREAMING 时，每个板块一输出完就回调（用于提前预取 ETF 行情）
+        sent: 可选，传入列表时追加实际送入提示词的新闻（预算省略、分片失败的不算）
     """
-    news_list = "\n".join([
-        f"{i+1}. [{item.source}] {item.title}"
-        for i, item in enumerate(items)
-    ])
-
     # 默认板块列表（与 etf_master.json 同步，含常用别名）
     if not sector_list:
         sector_list = [
@@ -126,13 +138,46 @@ async def analyze(items: list[NewsItem], sector_list: list[str] = None, history_
         ]
 
     sector_str = "/".join(sector_list)
+    seen_section = f"\n\n## 今日此前已分析过的新闻（摘要，仅作背景）\n{seen_digest}" if seen_digest else ""
+
+    # 新闻量超过阈值时先分片提炼要点（map），主分析只看汇总（reduce）
+    news_list, count, included = "", len(items), []
+    if settings.map_reduce_threshold and len(items) > settings.map_reduce_threshold:
+        with metrics.timer("stage_seconds", stage="analyze_map"):
+            news_list, included = await summarize_shards(items, settings.map_reduce_concurrency)
+        if not news_list:
+            logger.warning("分片汇总全部失败，退回单次分析")
+
+    if not news_list:
+        # 新闻列表按 token 预算装入：预算扣除模板、历史上下文等固定部分后留给新闻
+        fixed = estimate_tokens(ANALYSIS_PROMPT.format(
+            count=len(items), news_list=seen_section, history_context=history_context, sector_list=sector_str,
+        ))
+        packed = pack_news(items, max(settings.analysis_input_tokens - fixed, MIN_NEWS_TOKENS))
+        metrics.inc("news_prompt_kept", len(packed.items))
+        metrics.inc("news_prompt_dropped", packed.dropped)
+        if packed.dropped:
+            logger.info(f"提示词预算: 保留 {len(packed.items)} 条新闻（约 {packed.tokens} tokens），省略 {packed.dropped} 条")
+        news_list, count, included = packed.render(), len(packed.items), packed.items
+    if sent is not None:
+        sent.extend(included)
+
     prompt = ANALYSIS_PROMPT.format(
-        count=len(items),
-        news_list=news_list,
+        count=count,
+        news_list=news_list + seen_section,
         history_context=history_context,
         sector_list=sector_str
     )
 
+    on_text = None
+    if on_sector and settings.ai_streaming:
+        stream = JsonArrayStream("sectors")
+
+        def on_text(text: str):
+            for sector in stream.feed(text):
+                if isinstance(sector, dict):
+                    on_sector(sector)
+
     try:
         client = AIClient()
         text = await client.send(AIRequest(
@@ -140,6 +185,9 @@ async def analyze(items: list[NewsItem], sector_list: list[str] = None, history_
             max_tokens=4096,
             timeout=120,
             model=settings.claude_model,
+            purpose="analyze",
+            cache=False,  # 每次新闻都不同，缓存只会挤掉可复用的条目
+            on_text=on_text,
         ))
         return parse_json_with_repair(text, fix_newlines=True)
     except Exception as e:
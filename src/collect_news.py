@@ -7,30 +7,27 @@ from pathlib import Path
 from collections import Counter
 from loguru import logger
 
-from src.collectors import NewsAggregator
+from src.collectors import NewsAggregator, sort_news
+from src.collectors.seen_store import SeenStore
+from src.config import settings
+from src.metrics import metrics
+from src.models import NewsItem
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
 
-async def collect():
-    """采集所有源的新闻"""
-    logger.info("=" * 50)
-    logger.info("开始采集新闻")
-    logger.info("=" * 50)
+# 采集整体时限（秒）：到期后放弃未完成的来源，保证作业按时结束
+COLLECT_DEADLINE = 180
 
-    agg = NewsAggregator(include_international=True, include_playwright=True)
-    try:
-        news = await agg.collect_all()
-        source_stats = dict(Counter(item.source for item in news.items))
-        logger.info(f"采集完成: {len(news.items)} 条新闻")
-        for src, cnt in sorted(source_stats.items(), key=lambda x: -x[1]):
-            logger.info(f"  - {src}: {cnt} 条")
-    finally:
-        await agg.close()
 
-    # 保存原始新闻
+def _write_news_raw(items: list[NewsItem], complete: bool) -> dict:
+    """写入 news_raw.json（先写临时文件再替换，读取方不会读到半个文件）
+
+    完成时附上采集阶段的运行指标，由分析阶段合并进 metrics.json。
+    """
     beijing_tz = timezone(timedelta(hours=8))
+    items = sort_news(items)
     news_raw = {
         "items": [
             {
@@ -38,16 +35,55 @@ async def collect():
                 "source": item.source,
                 "url": item.url,
                 "published_at": item.published_at.isoformat() if item.published_at else None,
+                "dup_count": item.dup_count,
+                "is_new": item.is_new,
+                "category": item.category.value,
             }
-            for item in news.items
+            for item in items
         ],
-        "source_stats": source_stats,
+        "source_stats": dict(Counter(item.source for item in items)),
         "collected_at": datetime.now(beijing_tz).isoformat(),
+        "complete": complete,
     }
-
+    if complete:
+        news_raw["metrics"] = metrics.snapshot()
     output_file = DATA_DIR / "news_raw.json"
-    output_file.write_text(json.dumps(news_raw, ensure_ascii=False, indent=2))
-    logger.info(f"保存到 {output_file}")
+    tmp = output_file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(news_raw, ensure_ascii=False, indent=2))
+    tmp.replace(output_file)
+    return news_raw
+
+
+async def collect(deadline: float = COLLECT_DEADLINE):
+    """采集所有源的新闻，每个来源完成后即更新 news_raw.json"""
+    logger.info("=" * 50)
+    logger.info("开始采集新闻")
+    logger.info("=" * 50)
+
+    # 当天已分析过的新闻指纹（只读，分析成功后由 analyze_news 写入）
+    seen = SeenStore()
+    items: list[NewsItem] = []
+    agg = NewsAggregator(
+        include_international=True,
+        include_playwright=True,
+        dedup_distance=settings.news_dedup_distance,
+    )
+    try:
+        with metrics.timer("stage_seconds", stage="collect"):
+            async for name, new_items in agg.stream(timeout=deadline):
+                seen.tag(new_items)
+                items.extend(new_items)
+                metrics.inc("news_unique", len(new_items), collector=name)
+                logger.info(f"{name} 完成，新增 {len(new_items)} 条（累计 {len(items)} 条）")
+                _write_news_raw(items, complete=False)
+    finally:
+        await agg.close()
+
+    news_raw = _write_news_raw(items, complete=True)
+    logger.info(f"采集完成: {len(items)} 条新闻，其中 {sum(i.is_new for i in items)} 条今日未分析过")
+    for src, cnt in sorted(news_raw["source_stats"].items(), key=lambda x: -x[1]):
+        logger.info(f"  - {src}: {cnt} 条")
+    logger.info(f"保存到 {DATA_DIR / 'news_raw.json'}")
 
     return news_raw
 
@@ -1,13 +1,16 @@
 """采集器模块"""
 
 import asyncio
-import random
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
 from loguru import logger
 
 from src.models import NewsItem, NewsCollection
 from .base import BaseCollector
+from .dedup import DEFAULT_MAX_DISTANCE, NearDuplicateIndex
+from .http_cache import http_cache
+from .latency import latency_tracker
 from .cls_news import CLSNewsCollector
 from .eastmoney import EastMoneyCollector
 from .sina_finance import SinaFinanceCollector
@@ -40,10 +43,31 @@ except ImportError:
     pass
 
 
+def _sort_key(item: NewsItem) -> datetime:
+    """按发布时间排序（处理时区混合问题）"""
+    if item.published_at is None:
+        return datetime.min
+    # 移除时区信息以便比较
+    if item.published_at.tzinfo is not None:
+        return item.published_at.replace(tzinfo=None)
+    return item.published_at
+
+
+def sort_news(items: list[NewsItem]) -> list[NewsItem]:
+    """按发布时间倒序"""
+    return sorted(items, key=_sort_key, reverse=True)
+
+
 class NewsAggregator:
     """新闻聚合器"""
 
-    def __init__(self, include_international: bool = True, include_playwright: bool = True):
+    def __init__(
+        self,
+        include_international: bool = True,
+        include_playwright: bool = True,
+        dedup_distance: int = DEFAULT_MAX_DISTANCE,
+    ):
+        self.dedup_distance = dedup_distance  # 近似去重的 SimHash 汉明距离阈值
         self.collectors: list[BaseCollector] = [
             CLSNewsCollector(),
             EastMoneyCollector(),
@@ -63,46 +87,49 @@ class NewsAggregator:
         if include_playwright and _playwright_collectors:
             self.playwright_collectors = [c() for c in _playwright_collectors]
 
-    async def collect_all(self) -> NewsCollection:
-        """并发采集所有来源的新闻"""
-        # 普通采集器
-        tasks = [c.safe_collect() for c in self.collectors]
-        results = await asyncio.gather(*tasks)
-
+    async def stream(self, timeout: Optional[float] = None) -> AsyncIterator[tuple[str, list[NewsItem]]]:
+        """按来源完成顺序产出 (来源名, 新条目)
+
+        所有采集器（含 Playwright，页面数和同域名间隔由页面池控制）同时启动，
+        每个来源完成即产出（各采集器自身的 deadline 限制单个来源耗时），
+        与之前产出的条目近似重复的会被去掉，并计入代表条目的 dup_count。
+        timeout 为整体时限（秒），到期后放弃仍未完成的来源。
+        """
+        collectors = [*self.collectors, *self.playwright_collectors]
+        tasks = {asyncio.ensure_future(c.safe_collect()): c for c in collectors}
+        pending = set(tasks)
+        dedup = NearDuplicateIndex(max_distance=self.dedup_distance)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        try:
+            while pending:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    names = ", ".join(tasks[t].name for t in pending)
+                    logger.warning(f"采集到达时限，放弃未完成的来源: {names}")
+                    break
+                for task in done:
+                    collector = tasks[task]
+                    try:
+                        items = task.result()
+                    except Exception as e:
+                        logger.warning(f"{collector.name} 采集失败: {e}")
+                        items = []
+                    new_items = [item for item in items if dedup.add(item)]
+                    yield collector.name, new_items
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def collect_all(self, timeout: Optional[float] = None) -> NewsCollection:
+        """并发采集所有来源的新闻（去重、按时间倒序）"""
         all_items: list[NewsItem] = []
-        for items in results:
+        async for _, items in self.stream(timeout=timeout):
             all_items.extend(items)
 
-        # Playwright 采集器（串行执行，随机间隙避免被封）
-        for i, pw_collector in enumerate(self.playwright_collectors):
-            try:
-                if i > 0:
-                    delay = random.uniform(1.0, 2.5)  # 随机1-2.5秒
-                    await asyncio.sleep(delay)
-                pw_items = await pw_collector.safe_collect()
-                all_items.extend(pw_items)
-            except Exception as e:
-                logger.warning(f"Playwright 采集失败: {e}")
-
-        # 去重（按标题）
-        seen_titles = set()
-        unique_items = []
-        for item in all_items:
-            if item.title not in seen_titles:
-                seen_titles.add(item.title)
-                unique_items.append(item)
-
-        # 按时间排序（处理时区混合问题）
-        def get_sort_key(x):
-            if x.published_at is None:
-                return datetime.min
-            # 移除时区信息以便比较
-            if x.published_at.tzinfo is not None:
-                return x.published_at.replace(tzinfo=None)
-            return x.published_at
-
-        unique_items.sort(key=get_sort_key, reverse=True)
-
+        unique_items = sort_news(all_items)
         logger.info(f"共采集 {len(unique_items)} 条去重新闻")
 
         return NewsCollection(items=unique_items)
@@ -111,6 +138,8 @@ class NewsAggregator:
         """关闭所有采集器"""
         for collector in self.collectors:
             await collector.close()
+        latency_tracker.save()
+        http_cache.save()
         # 关闭 Playwright 浏览器
         if close_browser:
             await close_browser()
@@ -127,4 +156,5 @@ __all__ = [
     "TechCrunchCollector",
     "BBCCollector",
     "NewsAggregator",
+    "sort_news",
 ]
@@ -1,18 +1,42 @@
 """采集器基类"""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import Optional
+from urllib.parse import urlsplit
 import httpx
 from loguru import logger
 
-from src.models import NewsItem
+from src.metrics import metrics
+from src.models import NewsCategory, NewsItem
+from .latency import latency_tracker
+
+
+def classify_news(text: str) -> NewsCategory:
+    """按关键词粗分新闻类别（采集时打标签，分片分析时也用它给没有类别的新闻归类）"""
+    if any(k in text for k in ["央行", "政策", "国务院", "发改委", "财政"]):
+        return NewsCategory.MACRO
+    if any(k in text for k in ["美股", "美联储", "欧洲", "日本", "外资"]):
+        return NewsCategory.INTERNATIONAL
+    if any(k in text for k in ["板块", "行业", "概念", "涨停", "跌停"]):
+        return NewsCategory.INDUSTRY
+    if any(k in text for k in ["公司", "股份", "集团", "业绩", "财报"]):
+        return NewsCategory.COMPANY
+    return NewsCategory.OTHER
 
 
 class BaseCollector(ABC):
     """新闻采集器基类"""
 
-    def __init__(self, timeout: float = 30.0):
+    deadline = 40.0  # 整个 collect 的时限（秒），含重试
+    hedge = False  # 对冲请求：首个请求超过历史 p90 耗时仍未返回时再发一个，取先返回的
+    hedge_min_delay = 0.2  # 对冲触发的最短等待（秒）
+
+    def __init__(self, timeout: float = 30.0, deadline: Optional[float] = None):
         self.timeout = timeout
+        if deadline is not None:
+            self.deadline = deadline
         self._client: Optional[httpx.AsyncClient] = None
 
     @property
@@ -36,17 +60,95 @@ class BaseCollector(ABC):
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+    async def hedged_get(self, url: str, **kwargs) -> httpx.Response:
+        """GET 请求（hedge=True 时启用对冲），并记录耗时
+
+        耗时取胜出请求自身的耗时；发出过对冲的请求不计入 p90 样本，否则等待对冲的时间会让 p90 一轮轮往上抬。
+        """
+        client = await self.get_client()
+        delay = latency_tracker.p90(self.name) if self.hedge else None
+        tasks = [asyncio.ensure_future(self._timed_get(client, url, **kwargs))]
+        hedged = False
+        try:
+            if delay is None:
+                resp, elapsed = await tasks[0]
+            else:
+                done, _ = await asyncio.wait(tasks, timeout=max(delay, self.hedge_min_delay))
+                if done:
+                    resp, elapsed = tasks[0].result()
+                else:
+                    logger.debug(f"{self.name} 请求超过 p90（{delay:.2f}s），发出对冲请求")
+                    metrics.inc("collector_hedges", collector=self.name)
+                    hedged = True
+                    tasks.append(asyncio.ensure_future(self._timed_get(client, url, **kwargs)))
+                    resp, elapsed = await self._first_success(*tasks)
+        finally:
+            # 调用方被取消（如 safe_collect 的 deadline）时不留下悬空请求
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if not hedged:
+            latency_tracker.record(self.name, elapsed)
+        metrics.record_response(urlsplit(url).hostname or "", resp.status_code, len(resp.content), elapsed)
+        return resp
+
+    @staticmethod
+    async def _timed_get(client: httpx.AsyncClient, url: str, **kwargs) -> tuple[httpx.Response, float]:
+        """GET 请求，返回 (响应, 该请求自身耗时)"""
+        start = time.monotonic()
+        resp = await client.get(url, **kwargs)
+        return resp, time.monotonic() - start
+
+    @staticmethod
+    async def _first_success(*tasks: asyncio.Future) -> tuple[httpx.Response, float]:
+        """返回最先成功的 (响应, 耗时)，取消其余请求；全部失败时抛出最后一个异常"""
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     @abstractmethod
     async def collect(self) -> list[NewsItem]:
         """采集新闻，子类实现"""
         pass
 
+    def collect_summary(self) -> str:
+        """采集成功后附加在日志里的说明（子类可记录额外指标）"""
+        return ""
+
     async def safe_collect(self) -> list[NewsItem]:
-        """安全采集，捕获异常"""
+        """安全采集，捕获异常，超过 deadline 按无结果处理"""
+        return await run_collect(self)
+
+
+async def run_collect(collector) -> list[NewsItem]:
+    """按 collector.deadline 执行 collect()，记录耗时、条数和错误；异常和超时都按无结果处理
+
+    HTTP 采集器和 Playwright 采集器共用，差异只在 collect_summary() 返回的说明。
+    """
+    name = collector.name
+    with metrics.timer("collector_seconds", collector=name):
         try:
-            items = await self.collect()
-            logger.info(f"{self.name} 采集到 {len(items)} 条新闻")
+            items = await asyncio.wait_for(collector.collect(), timeout=collector.deadline)
+            logger.info(f"{name} 采集到 {len(items)} 条新闻{collector.collect_summary()}")
+            metrics.inc("collector_items", len(items), collector=name)
             return items
+        except asyncio.TimeoutError:
+            logger.error(f"{name} 采集超过 {collector.deadline:.0f}s 时限")
+            metrics.inc("collector_errors", collector=name, kind="timeout")
+            return []
         except Exception as e:
-            logger.error(f"{self.name} 采集失败: {e}")
+            logger.error(f"{name} 采集失败: {e}")
+            metrics.inc("collector_errors", collector=name, kind="error")
             return []
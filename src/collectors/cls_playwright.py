@@ -2,36 +2,57 @@
 
 import re
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, SourceType
+from .cls_news import parse_telegraph
+from .html_parser import parse_html
 from .playwright_base import PlaywrightCollector
 
 
 class CLSPlaywrightCollector(PlaywrightCollector):
     """财联社电报采集器（Playwright 版本）"""
 
+    ready_selector = ".telegraph-list .telegraph-item, .telegraph-content-box"
+    ready_min_items = 5
+    capture_patterns = ("nodeapi/telegraphList", "nodeapi/updateTelegraphList")
+
     async def get_urls(self) -> list[str]:
         return ["https://www.cls.cn/telegraph"]
 
+    def parse_captured(self, url: str, payloads: list) -> list[NewsItem]:
+        """解析电报接口：{"data": {"roll_data": [...]}}"""
+        items = []
+        seen = set()
+        for payload in payloads:
+            for raw in ((payload or {}).get("data") or {}).get("roll_data") or []:
+                news = parse_telegraph(raw)
+                if not news or news.title in seen:
+                    continue
+                seen.add(news.title)
+                items.append(news.model_copy(update={
+                    "source": "财联社电报",
+                    "url": raw.get("shareurl") or url,
+                }))
+        return items[:30]
+
     async def parse_page(self, url: str, content: str) -> list[NewsItem]:
         """解析财联社电报页面"""
-        soup = BeautifulSoup(content, "html.parser")
+        doc = parse_html(content)
         items = []
 
         # 查找电报列表
-        telegraphs = soup.select(".telegraph-list .telegraph-item, .telegraph-content-box")
+        telegraphs = doc.select(".telegraph-list .telegraph-item, .telegraph-content-box")
 
         for tg in telegraphs[:30]:  # 最多30条
             try:
                 # 提取标题/内容 - strong 标签包含标题
                 title_el = tg.select_one("strong")
-                title = title_el.get_text(strip=True) if title_el else ""
+                title = title_el.text() if title_el else ""
 
                 # 如果没有 strong，取整个内容
                 if not title:
-                    title = tg.get_text(strip=True)[:100]
+                    title = tg.text()[:100]
 
                 if not title or len(title) < 10:
                     continue
@@ -40,7 +61,7 @@ class CLSPlaywrightCollector(PlaywrightCollector):
                 time_el = tg.select_one(".telegraph-time-box")
                 pub_time = None
                 if time_el:
-                    time_text = time_el.get_text(strip=True)
+                    time_text = time_el.text()
                     pub_time = self._parse_time(time_text)
 
                 items.append(NewsItem(
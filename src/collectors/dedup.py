@@ -0,0 +1,122 @@
+"""近似重复新闻检测 - 字符 shingle SimHash + LSH 分段索引
+
+同一条电报经不同来源转载后，标点、前缀（"财联社3月2日电"）、截断长度各不相同。
+去重流程：
+1. 标题归一化：去掉来源/日期前缀、标点和空白
+2. 字符 3-gram shingle 计算 64 位 SimHash
+3. 64 位切成 max_distance+1 段建索引：汉明距离 ≤ max_distance 的两条
+   至少有一段完全相同（抽屉原理），只需比较同段候选，整体近似线性
+4. 另按归一化前缀分桶，处理被截断的长标题：同桶内只有一条是另一条的前缀时才算重复，
+   避免 "Stocks making the biggest moves midday: …" 这类模板标题被误合并
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+import numpy as np
+
+from src.models import NewsItem
+
+# 默认汉明距离阈值（越大越宽松）
+DEFAULT_MAX_DISTANCE = 3
+# 截断转载检测的分桶前缀长度（同桶内还需一条是另一条的前缀）
+DEFAULT_PREFIX_LEN = 20
+SHINGLE_SIZE = 3
+
+_BITS = np.arange(64, dtype=np.uint64)
+_PREFIX_RE = re.compile(r"^(【[^】]{0,30}】)?\s*(财联社|金十数据|华尔街见闻|新浪财经|证券时报|e公司)?\s*(\d{1,2}月\d{1,2}日)?(电|讯|消息)?[，,：:\s]*")
+_STRIP_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """去掉来源/日期前缀、标点、空白，英文转小写"""
+    text = _PREFIX_RE.sub("", text.strip(), count=1)
+    return _STRIP_RE.sub("", text).lower()
+
+
+def _shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    grams = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "little") for g in grams],
+        dtype=np.uint64,
+    )
+
+
+def simhash(text: str) -> int:
+    """64 位 SimHash（输入应为归一化文本）"""
+    if not text:
+        return 0
+    hashes = _shingle_hashes(text)
+    bits = ((hashes[:, None] >> _BITS) & np.uint64(1)).astype(np.int32)
+    votes = bits.sum(axis=0) * 2 - len(hashes)
+    return int(sum(1 << i for i in np.nonzero(votes > 0)[0]))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """增量去重索引：add() 返回 False 表示与已收录条目近似重复
+
+    每个簇保留首个收录的条目作为代表，其 dup_count 记录报道该新闻的不同来源数。
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, prefix_len: int = DEFAULT_PREFIX_LEN):
+        self.max_distance = max_distance
+        self.prefix_len = prefix_len
+        bands = max_distance + 1
+        self._band_bits = [(i * 64 // bands, (i + 1) * 64 // bands) for i in range(bands)]
+        self._reps: list[NewsItem] = []
+        self._hashes: list[int] = []
+        self._norms: list[str] = []
+        self._sources: list[set[str]] = []
+        self._bands: dict[tuple[int, int], list[int]] = {}
+        self._prefixes: dict[str, list[int]] = {}
+
+    def _band_keys(self, h: int) -> list[tuple[int, int]]:
+        return [(i, (h >> lo) & ((1 << (hi - lo)) - 1)) for i, (lo, hi) in enumerate(self._band_bits)]
+
+    def _match(self, norm: str) -> tuple[Optional[int], int]:
+        h = simhash(norm)
+        if len(norm) >= self.prefix_len:
+            for idx in self._prefixes.get(norm[:self.prefix_len], ()):
+                other = self._norms[idx]
+                if norm.startswith(other) or other.startswith(norm):
+                    return idx, h
+        for key in self._band_keys(h):
+            for idx in self._bands.get(key, ()):
+                if hamming(h, self._hashes[idx]) <= self.max_distance:
+                    return idx, h
+        return None, h
+
+    def add(self, item: NewsItem) -> bool:
+        norm = normalize(item.title)
+        idx, h = self._match(norm)
+        if idx is not None:
+            sources = self._sources[idx]
+            sources.add(item.source)
+            self._reps[idx].dup_count = len(sources)
+            return False
+
+        idx = len(self._reps)
+        self._reps.append(item)
+        self._hashes.append(h)
+        self._norms.append(norm)
+        self._sources.append({item.source})
+        for key in self._band_keys(h):
+            self._bands.setdefault(key, []).append(idx)
+        if len(norm) >= self.prefix_len:
+            self._prefixes.setdefault(norm[:self.prefix_len], []).append(idx)
+        return True
+
+
+def dedup_news(
+    items: list[NewsItem],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+    prefix_len: int = DEFAULT_PREFIX_LEN,
+) -> list[NewsItem]:
+    """去掉近似重复的新闻，保留每簇首条"""
+    index = NearDuplicateIndex(max_distance=max_distance, prefix_len=prefix_len)
+    return [item for item in items if index.add(item)]
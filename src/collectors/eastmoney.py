@@ -18,9 +18,7 @@ class EastMoneyCollector(BaseCollector):
 
     async def collect(self) -> list[NewsItem]:
         """采集东方财富要闻"""
-        client = await self.get_client()
-
-        response = await client.get(self.API_URL)
+        response = await self.hedged_get(self.API_URL)
         response.raise_for_status()
 
         # 解析 JSONP 格式: var ajaxResult={...}
@@ -2,55 +2,41 @@
 
 import re
 from datetime import datetime, timezone, timedelta
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, SourceType
+from .html_parser import parse_html
 from .playwright_base import PlaywrightCollector
 
 
 class EastMoneyPlaywrightCollector(PlaywrightCollector):
     """东方财富快讯采集器（Playwright 版本）"""
 
+    wait_time = 3000  # 等待动态内容加载的上限
+    ready_selector = "a[href*='finance.eastmoney.com']"
+    ready_min_items = 10
+
     def __init__(self):
         super().__init__(timeout=30000)
-        self.wait_time = 3000  # 等待动态内容加载
 
     async def get_urls(self) -> list[str]:
         return ["https://kuaixun.eastmoney.com/"]
 
-    async def fetch_page(self, url: str):
-        """重写 fetch_page 增加等待时间"""
-        try:
-            from .playwright_base import get_browser
-            browser = await get_browser()
-            page = await browser.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
-                await page.wait_for_timeout(self.wait_time)
-                content = await page.content()
-                return content
-            finally:
-                await page.close()
-        except Exception as e:
-            logger.warning(f"{self.name} 获取页面失败 {url}: {e}")
-            return None
-
     async def parse_page(self, url: str, content: str) -> list[NewsItem]:
-        soup = BeautifulSoup(content, "html.parser")
+        doc = parse_html(content)
         items = []
         beijing_tz = timezone(timedelta(hours=8))
 
         # 新版页面结构：查找所有包含 finance.eastmoney.com 链接的 a 标签
-        for link in soup.find_all('a', href=True):
+        for link in doc.select("a[href]"):
             try:
-                href = link.get('href', '')
+                href = link.attr("href", "")
                 # 只处理财经新闻链接
                 if 'finance.eastmoney.com' not in href:
                     continue
 
                 # 获取链接文本
-                title = link.get_text(strip=True)
+                title = link.text()
                 # 移除 [点击查看全文] 后缀
                 title = re.sub(r'\[点击查看全文\]$', '', title).strip()
 
@@ -0,0 +1,127 @@
+"""HTML 解析后端 - 采集器共用的小型选择器 API
+
+按可用性自动选择后端（也可用环境变量 HTML_PARSER 指定）：
+1. selectolax（lexbor，C 实现，最快）
+2. lxml：BeautifulSoup + lxml 建树
+3. html.parser：BeautifulSoup 纯 Python 兜底
+
+API 只覆盖采集器用到的部分：select / select_one / text / attr / parent / elements_with_text。
+text() 与 BeautifulSoup 的 get_text(strip=True) 一致：各文本节点去空白后直接拼接。
+"""
+
+import importlib.util
+import re
+from typing import Optional, Union
+
+from loguru import logger
+
+from src.config import settings
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> list[str]:
+    available = []
+    if importlib.util.find_spec("selectolax") is not None:
+        available.append("selectolax")
+    if importlib.util.find_spec("lxml") is not None:
+        available.append("lxml")
+    available.append("html.parser")
+    return available
+
+
+def _default_backend() -> str:
+    wanted = settings.html_parser
+    available = available_backends()
+    if wanted:
+        if wanted in available:
+            return wanted
+        logger.warning(f"HTML_PARSER={wanted} 不可用，使用 {available[0]}")
+    return available[0]
+
+
+DEFAULT_BACKEND = _default_backend()
+
+
+class _LexborNode:
+    """selectolax 节点"""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, css: str) -> list["Node"]:
+        return [_LexborNode(n) for n in self._node.css(css)]
+
+    def select_one(self, css: str) -> Optional["Node"]:
+        node = self._node.css_first(css)
+        return _LexborNode(node) if node is not None else None
+
+    def text(self) -> str:
+        return self._node.text(deep=True, separator="", strip=True)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        node = self._node.parent
+        return _LexborNode(node) if node is not None and node.tag != "-document" else None
+
+    def elements_with_text(self, pattern: re.Pattern) -> list["Node"]:
+        """直接包含匹配文本的元素"""
+        return [
+            _LexborNode(n.parent)
+            for n in self._node.traverse(include_text=True)
+            if n.tag == "-text" and n.parent is not None and pattern.search(n.text_content or "")
+        ]
+
+
+class _SoupNode:
+    """BeautifulSoup 节点"""
+
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def select(self, css: str) -> list["Node"]:
+        return [_SoupNode(t) for t in self._tag.select(css)]
+
+    def select_one(self, css: str) -> Optional["Node"]:
+        tag = self._tag.select_one(css)
+        return _SoupNode(tag) if tag is not None else None
+
+    def text(self) -> str:
+        return self._tag.get_text(strip=True)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self._tag.get(name)
+        if isinstance(value, list):  # class 等多值属性
+            value = " ".join(value)
+        return default if value is None else value
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        tag = self._tag.parent
+        return _SoupNode(tag) if tag is not None and tag.name != "[document]" else None
+
+    def elements_with_text(self, pattern: re.Pattern) -> list["Node"]:
+        return [_SoupNode(s.parent) for s in self._tag.find_all(string=pattern) if s.parent is not None]
+
+
+Node = Union[_LexborNode, _SoupNode]
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> Node:
+    """解析 HTML，返回文档根节点"""
+    backend = backend or DEFAULT_BACKEND
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return _LexborNode(LexborHTMLParser(html).root)
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的 HTML 解析后端: {backend}")
+    from bs4 import BeautifulSoup
+    return _SoupNode(BeautifulSoup(html, backend))
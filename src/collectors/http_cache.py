@@ -0,0 +1,72 @@
+"""采集器 HTTP 缓存 - 按 URL 保存 ETag/Last-Modified 和上次解析出的条目
+
+存储在 data/archive/http_cache.json：
+    {url: {"etag": ..., "last_modified": ..., "items": {guid: NewsItem 字典, ...}}}
+
+条件请求返回 304 时直接复用上次的条目；返回 200 时，GUID 已知的条目也不再重新解析。
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from src.models import NewsItem
+
+CACHE_FILE = Path(__file__).parent.parent / "data" / "archive" / "http_cache.json"
+
+
+class HttpCache:
+    """按 URL 的条件请求缓存"""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self._entries: Optional[dict[str, dict]] = None
+        self._dirty = False
+
+    def _data(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                try:
+                    self._entries = json.loads(self.path.read_text())
+                except Exception as e:
+                    logger.warning(f"读取 HTTP 缓存失败: {e}")
+        return self._entries
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """条件请求头（无缓存条目时为空）"""
+        entry = self._data().get(url)
+        if not entry or not entry.get("items"):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def known_items(self, url: str) -> dict[str, dict]:
+        """上次解析出的条目 {guid: NewsItem 字典}"""
+        return (self._data().get(url) or {}).get("items", {})
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], entries: list[tuple[str, NewsItem]]):
+        self._data()[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": {guid: item.model_dump(mode="json") for guid, item in entries},
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._data(), ensure_ascii=False, separators=(",", ":")))
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+http_cache = HttpCache()
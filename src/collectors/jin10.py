@@ -2,72 +2,80 @@
 
 import re
 from datetime import datetime, timezone, timedelta
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, SourceType
+from .html_parser import parse_html
 from .playwright_base import PlaywrightCollector
 
 
 class Jin10Collector(PlaywrightCollector):
     """金十数据快讯采集器"""
 
+    wait_time = 5000  # 金十需要更长等待时间（上限）
+    ready_response = "flash-api.jin10.com/get_flash_list"  # 快讯列表接口
+    ready_selector = ".jin-flash-item"
+    ready_min_items = 5
+    capture_patterns = ("flash-api.jin10.com/get_flash_list",)
+
     def __init__(self):
         super().__init__(timeout=30000)
-        self.wait_time = 5000  # 金十需要更长等待时间
 
     async def get_urls(self) -> list[str]:
         return ["https://www.jin10.com/"]
 
-    async def fetch_page(self, url: str):
-        """重写 fetch_page 增加等待时间"""
-        try:
-            from .playwright_base import get_browser
-            browser = await get_browser()
-            page = await browser.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
-                await page.wait_for_timeout(self.wait_time)
-                content = await page.content()
-                return content
-            finally:
-                await page.close()
-        except Exception as e:
-            logger.warning(f"{self.name} 获取页面失败 {url}: {e}")
-            return None
+    def parse_captured(self, url: str, payloads: list) -> list[NewsItem]:
+        """解析快讯列表接口：{"data": [{"time": "YYYY-MM-DD HH:MM:SS", "data": {"content": ...}}]}"""
+        beijing_tz = timezone(timedelta(hours=8))
+        items = []
+        seen = set()
+        for payload in payloads:
+            for flash in (payload or {}).get("data") or []:
+                body = flash.get("data") or {}
+                text = re.sub(r"<[^>]+>", "", body.get("content") or body.get("title") or "").strip()
+                if len(text) < 10 or text in seen:
+                    continue
+                seen.add(text)
+                try:
+                    pub_time = datetime.strptime(flash["time"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=beijing_tz)
+                except (KeyError, TypeError, ValueError):
+                    pub_time = None
+                items.append(NewsItem(
+                    title=text[:200],
+                    content=text,
+                    source="金十数据",
+                    source_type=SourceType.INTERNATIONAL,
+                    url=url,
+                    published_at=pub_time,
+                ))
+        return items[:30]
 
     async def parse_page(self, url: str, content: str) -> list[NewsItem]:
-        soup = BeautifulSoup(content, "html.parser")
+        doc = parse_html(content)
         items = []
         beijing_tz = timezone(timedelta(hours=8))
 
         # 新版金十数据页面结构：查找包含时间和内容的快讯块
         # 时间格式如 14:25:13，内容在相邻元素
-        all_text = soup.get_text()
-
         # 查找所有时间戳和对应内容
         time_pattern = re.compile(r'(\d{2}:\d{2}:\d{2})')
 
         # 遍历所有包含时间的元素
-        for el in soup.find_all(string=time_pattern):
+        for parent in doc.elements_with_text(time_pattern):
             try:
-                parent = el.find_parent()
-                if not parent:
-                    continue
-
                 # 获取时间
-                time_match = time_pattern.search(el)
+                time_match = time_pattern.search(parent.text())
                 if not time_match:
                     continue
                 time_text = time_match.group(1)
 
                 # 查找相邻的内容元素
-                container = parent.find_parent()
+                container = parent.parent
                 if not container:
                     continue
 
                 # 获取容器内所有文本
-                full_text = container.get_text(strip=True)
+                full_text = container.text()
                 # 移除时间部分
                 title = full_text.replace(time_text, '').strip()
 
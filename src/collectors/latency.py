@@ -0,0 +1,62 @@
+"""采集接口耗时统计 - 持久化最近的耗时样本，作为对冲请求的触发阈值
+
+存储在 data/archive/collector_latency.json：{"CLSNewsCollector": [0.31, 0.28, ...], ...}
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+LATENCY_FILE = Path(__file__).parent.parent / "data" / "archive" / "collector_latency.json"
+
+# 每个来源保留的样本数
+MAX_SAMPLES = 50
+# 样本不足时不计算分位数（不触发对冲）
+MIN_SAMPLES = 5
+
+
+class LatencyTracker:
+    """按来源记录请求耗时，计算 p90"""
+
+    def __init__(self, path: Path = LATENCY_FILE, max_samples: int = MAX_SAMPLES):
+        self.path = path
+        self.max_samples = max_samples
+        self._samples: Optional[dict[str, list[float]]] = None
+        self._dirty = False
+
+    def _data(self) -> dict[str, list[float]]:
+        if self._samples is None:
+            self._samples = {}
+            if self.path.exists():
+                try:
+                    self._samples = json.loads(self.path.read_text())
+                except Exception as e:
+                    logger.warning(f"读取采集耗时统计失败: {e}")
+        return self._samples
+
+    def record(self, key: str, seconds: float):
+        samples = self._data().setdefault(key, [])
+        samples.append(round(seconds, 3))
+        del samples[:-self.max_samples]
+        self._dirty = True
+
+    def p90(self, key: str) -> Optional[float]:
+        samples = self._data().get(key, [])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._data(), separators=(",", ":")))
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+latency_tracker = LatencyTracker()
@@ -1,14 +1,50 @@
 """Playwright 网页采集器基类"""
 
+import asyncio
+import random
+import time
 from abc import abstractmethod
+from collections import Counter
+from contextlib import asynccontextmanager
 from typing import Optional
+from urllib.parse import urlsplit
 from loguru import logger
 
+from src.metrics import metrics
 from src.models import NewsItem
+from .base import run_collect
 
 # Playwright 延迟导入，避免未安装时报错
 _playwright = None
 _browser = None
+_page_pool: Optional["PagePool"] = None
+
+# 同时打开的页面数上限
+MAX_PAGES = 3
+# 同一域名两次打开页面的随机间隔（秒），不同域名互不影响
+DOMAIN_INTERVAL = (1.0, 2.5)
+
+# 统计/广告域名，任何资源类型都拦截（匹配自身及子域名）
+BLOCKED_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "doubleclick.net", "hm.baidu.com", "cpro.baidustatic.com", "pos.baidu.com",
+    "cnzz.com", "umeng.com", "growingio.com", "sensorsdata.cn",
+    "mediav.com", "tanx.com", "beacon.sina.com.cn", "sax.sina.com.cn",
+)
+
+# 被拦截资源的估算大小（字节），用于统计节省的流量
+ESTIMATED_BYTES = {
+    "image": 30_000,
+    "media": 200_000,
+    "font": 60_000,
+    "stylesheet": 25_000,
+    "script": 40_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+def is_blocked_domain(host: str) -> bool:
+    return any(host == d or host.endswith("." + d) for d in BLOCKED_DOMAINS)
 
 
 async def get_browser():
@@ -21,9 +57,76 @@ async def get_browser():
     return _browser
 
 
+class PagePool:
+    """浏览器页面池
+
+    - 全局最多 max_pages 个页面同时加载，不同网站并行
+    - 每个域名一个独立的浏览器上下文（cookie 隔离，复用到进程结束）
+    - 同一域名两次打开页面之间保持随机间隔，保留防封节奏
+    """
+
+    def __init__(self, max_pages: int = MAX_PAGES, domain_interval: tuple[float, float] = DOMAIN_INTERVAL):
+        self.domain_interval = domain_interval
+        self._sem = asyncio.Semaphore(max_pages)
+        self._contexts: dict[str, object] = {}
+        self._domain_locks: dict[str, asyncio.Lock] = {}
+        self._last_open: dict[str, float] = {}
+
+    async def _wait_turn(self, domain: str):
+        """同域名排队，距离上次打开不足间隔时等待"""
+        lock = self._domain_locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            last = self._last_open.get(domain)
+            if last is not None:
+                gap = random.uniform(*self.domain_interval) - (time.monotonic() - last)
+                if gap > 0:
+                    await asyncio.sleep(gap)
+            self._last_open[domain] = time.monotonic()
+
+    async def _context_for(self, domain: str):
+        context = self._contexts.get(domain)
+        if context is None:
+            browser = await get_browser()
+            context = self._contexts[domain] = await browser.new_context()
+        return context
+
+    @asynccontextmanager
+    async def page(self, url: str):
+        """获取一个新页面（用完自动关闭）"""
+        domain = urlsplit(url).hostname or ""
+        await self._wait_turn(domain)
+        async with self._sem:
+            context = await self._context_for(domain)
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+
+    async def close(self):
+        contexts = list(self._contexts.values())
+        self._contexts.clear()
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+def get_page_pool() -> PagePool:
+    """获取共享的页面池"""
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = PagePool()
+    return _page_pool
+
+
 async def close_browser():
     """关闭浏览器"""
-    global _playwright, _browser
+    global _playwright, _browser, _page_pool
+    if _page_pool:
+        await _page_pool.close()
+        _page_pool = None
     if _browser:
         await _browser.close()
         _browser = None
@@ -33,10 +136,52 @@ async def close_browser():
 
 
 class PlaywrightCollector:
-    """Playwright 网页采集器基类"""
+    """Playwright 网页采集器基类
+
+    子类声明就绪条件后，页面内容一出现就返回，wait_time 只作为等待上限；
+    未声明任何条件时，固定等待 wait_time。
+    """
+
+    wait_time = 2000  # 页面加载后最长等待 JS 渲染的毫秒数，子类按需调整
+    ready_selector: Optional[str] = None  # 匹配元素数达到 ready_min_items 即就绪
+    ready_min_items: int = 1
+    ready_response: Optional[str] = None  # 数据接口 URL 片段，收到其响应后才检查 selector
+
+    # 捕获模式：记录 URL 含这些片段的 JSON 响应，由 parse_captured 直接解析
+    capture_patterns: tuple[str, ...] = ()
 
-    def __init__(self, timeout: float = 30000):
+    deadline = 60.0  # 整个 collect 的时限（秒）
+
+    # 资源拦截：只放行解析需要的资源类型，统计/广告域名一律拦截
+    block_resources = True
+    allowed_resource_types: tuple[str, ...] = ("document", "script", "xhr", "fetch")
+
+    def __init__(self, timeout: float = 30000, deadline: Optional[float] = None):
         self.timeout = timeout  # 毫秒
+        if deadline is not None:
+            self.deadline = deadline
+        self.blocked: Counter = Counter()  # 按资源类型统计的拦截数
+        self.bytes_saved = 0  # 估算节省的字节数
+        self._captured: dict[str, list] = {}
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """判断请求是否应拦截"""
+        if resource_type not in self.allowed_resource_types:
+            return True
+        return is_blocked_domain(urlsplit(url).hostname or "")
+
+    async def _handle_route(self, route):
+        request = route.request
+        try:
+            if self.should_block(request.url, request.resource_type):
+                self.blocked[request.resource_type] += 1
+                self.bytes_saved += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception as e:
+            # 页面关闭时未完成的请求会报错，忽略
+            logger.debug(f"{self.name} 路由处理失败 {request.url}: {e}")
 
     @property
     def name(self) -> str:
@@ -53,43 +198,133 @@ class PlaywrightCollector:
         pass
 
     async def fetch_page(self, url: str) -> Optional[str]:
-        """使用 Playwright 获取页面内容"""
+        """使用 Playwright 获取页面内容（捕获模式下同时记录匹配的 JSON 响应）"""
+        captured: list = []
+        self._captured[url] = captured
+        host = urlsplit(url).hostname or ""
+        start = time.perf_counter()
         try:
-            browser = await get_browser()
-            page = await browser.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
-                await page.wait_for_timeout(2000)  # 等待JS渲染
+            async with get_page_pool().page(url) as page:
+                if self.block_resources:
+                    await page.route("**/*", self._handle_route)
+                # 数据接口可能在 domcontentloaded 之前返回，先挂上监听
+                got_capture = None
+                if self.capture_patterns:
+                    got_capture = asyncio.Event()
+                    page.on("response", lambda r: self._capture(r, captured, got_capture))
+                response_waiter = None
+                if self.ready_response:
+                    response_waiter = asyncio.ensure_future(page.wait_for_event(
+                        "response",
+                        predicate=lambda r: self.ready_response in r.url,
+                        timeout=self.timeout + self.wait_time,
+                    ))
+                try:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+                    await self.wait_ready(page, response_waiter, got_capture)
+                finally:
+                    if response_waiter is not None and not response_waiter.done():
+                        response_waiter.cancel()
+                        await asyncio.gather(response_waiter, return_exceptions=True)
                 content = await page.content()
-                return content
-            finally:
-                await page.close()
+            metrics.observe("page_fetch_seconds", time.perf_counter() - start, host=host)
+            metrics.inc("page_bytes", len(content.encode()), host=host)
+            return content
         except Exception as e:
             logger.warning(f"{self.name} 获取页面失败 {url}: {e}")
+            metrics.inc("page_fetch_errors", host=host)
             return None
 
+    async def _capture(self, response, captured: list, got_capture: asyncio.Event):
+        """记录匹配 capture_patterns 的 JSON 响应"""
+        if not any(p in response.url for p in self.capture_patterns):
+            return
+        try:
+            captured.append(await response.json())
+            got_capture.set()
+        except Exception as e:
+            logger.debug(f"{self.name} 读取接口响应失败 {response.url}: {e}")
+
+    async def _wait_dom(self, page, response_waiter: Optional[asyncio.Future], deadline: float):
+        loop = asyncio.get_running_loop()
+        if response_waiter is not None:
+            await asyncio.wait_for(response_waiter, timeout=max(deadline - loop.time(), 0.001))
+        if self.ready_selector:
+            await page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length >= n",
+                arg=[self.ready_selector, self.ready_min_items],
+                timeout=max((deadline - loop.time()) * 1000, 1),
+            )
+
+    async def wait_ready(
+        self,
+        page,
+        response_waiter: Optional[asyncio.Future] = None,
+        got_capture: Optional[asyncio.Event] = None,
+    ):
+        """等待页面就绪（捕获到接口数据或 DOM 就绪，先到先得；超过 wait_time 后按当前内容继续）"""
+        if not self.ready_selector and response_waiter is None and got_capture is None:
+            await page.wait_for_timeout(self.wait_time)  # 等待JS渲染
+            return
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.wait_time / 1000
+        waiters = []
+        if got_capture is not None:
+            waiters.append(asyncio.ensure_future(got_capture.wait()))
+        if self.ready_selector or response_waiter is not None:
+            waiters.append(asyncio.ensure_future(self._wait_dom(page, response_waiter, deadline)))
+        done, pending = await asyncio.wait(waiters, timeout=self.wait_time / 1000, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        if any(not t.cancelled() and t.exception() is None for t in done):
+            logger.debug(f"{self.name} 页面就绪，用时 {(loop.time() - start) * 1000:.0f}ms")
+        else:
+            logger.debug(f"{self.name} 等待就绪超时（{self.wait_time}ms），按当前内容解析")
+
+    def parse_captured(self, url: str, payloads: list) -> list[NewsItem]:
+        """解析捕获到的接口 JSON，子类在声明 capture_patterns 时实现"""
+        return []
+
     async def collect(self) -> list[NewsItem]:
-        """采集新闻"""
+        """采集新闻（捕获到接口数据时直接解析 JSON，否则解析渲染后的页面）"""
         items = []
         urls = await self.get_urls()
 
         for url in urls:
             content = await self.fetch_page(url)
+            payloads = self._captured.pop(url, [])
+            if payloads:
+                try:
+                    with metrics.timer("parse_seconds", collector=self.name, kind="captured"):
+                        page_items = self.parse_captured(url, payloads)
+                    if page_items:
+                        items.extend(page_items)
+                        continue
+                except Exception as e:
+                    logger.warning(f"{self.name} 解析接口数据失败 {url}: {e}")
             if content:
                 try:
-                    page_items = await self.parse_page(url, content)
+                    with metrics.timer("parse_seconds", collector=self.name, kind="dom"):
+                        page_items = await self.parse_page(url, content)
                     items.extend(page_items)
                 except Exception as e:
                     logger.warning(f"{self.name} 解析页面失败 {url}: {e}")
 
         return items
 
+    def collect_summary(self) -> str:
+        """资源拦截统计：记录指标，并返回附加在采集日志里的说明"""
+        if not self.blocked:
+            return ""
+        total = sum(self.blocked.values())
+        metrics.inc("playwright_blocked_requests", total, collector=self.name)
+        metrics.inc("playwright_bytes_saved", self.bytes_saved, collector=self.name)
+        return f"（拦截 {total} 个请求 {dict(self.blocked)}，约节省 {self.bytes_saved / 1024:.0f} KB）"
+
     async def safe_collect(self) -> list[NewsItem]:
-        """安全采集，捕获异常"""
-        try:
-            items = await self.collect()
-            logger.info(f"{self.name} 采集到 {len(items)} 条新闻")
-            return items
-        except Exception as e:
-            logger.error(f"{self.name} 采集失败: {e}")
-            return []
+        """安全采集，捕获异常，超过 deadline 按无结果处理"""
+        return await run_collect(self)
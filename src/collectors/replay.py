@@ -0,0 +1,79 @@
+"""离线回放 - 用录制的响应驱动采集器，不访问网络（供基准和测试使用）
+
+录制目录（默认 tests/fixtures/replay）下的 manifest.json：
+    {"http": {url: 文件, ...}, "pages": {url: 文件, ...}}
+
+- http：HTTP 采集器的接口/RSS 响应体，按 scheme+host+path 匹配（忽略查询参数），
+  经 httpx.MockTransport 返回；未录制的 URL 返回 404
+- pages：Playwright 采集器 get_urls() 中页面渲染后的 HTML，替代浏览器抓取
+
+文件路径相对 manifest 所在目录。
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from .base import BaseCollector
+from .rss_base import RSSCollector
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures" / "replay"
+
+
+def _key(url: str) -> str:
+    parts = urlsplit(str(url))
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class Recording:
+    """一套录制的响应"""
+
+    def __init__(self, root: Path = FIXTURES_DIR):
+        self.root = root
+        manifest = json.loads((root / "manifest.json").read_text())
+        self._http = {_key(url): root / name for url, name in manifest.get("http", {}).items()}
+        self._pages = {url: root / name for url, name in manifest.get("pages", {}).items()}
+        self._bodies: dict[Path, bytes] = {}
+
+    def _read(self, path: Path) -> bytes:
+        # 预先读入内存，计时不含磁盘 IO
+        if path not in self._bodies:
+            self._bodies[path] = path.read_bytes()
+        return self._bodies[path]
+
+    def covers(self, url: str) -> bool:
+        return _key(url) in self._http or url in self._pages
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = self._http.get(_key(request.url))
+        if path is None:
+            logger.warning(f"回放中没有录制: {request.url}")
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=self._read(path), request=request)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    async def _fetch_page(self, url: str) -> Optional[str]:
+        path = self._pages.get(url)
+        if path is None:
+            logger.warning(f"回放中没有录制页面: {url}")
+            return None
+        return self._read(path).decode()
+
+    def attach(self, collector) -> None:
+        """让采集器从录制中取数据
+
+        Playwright 采集器的 fetch_page 改为读取录制页面；HTTP 采集器换成回放 transport。
+        录制的条目时间是固定的，RSS 的新鲜度截止在回放时关闭。
+        """
+        if isinstance(collector, BaseCollector):
+            collector._client = httpx.AsyncClient(transport=self.transport(), timeout=collector.timeout)
+            if isinstance(collector, RSSCollector):
+                collector.MAX_AGE_HOURS = None
+        else:
+            collector.fetch_page = self._fetch_page
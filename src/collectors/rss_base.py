@@ -1,13 +1,95 @@
 """RSS 采集器基类"""
 
-from datetime import datetime
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 from loguru import logger
 
+from src.metrics import metrics
 from src.models import NewsItem, NewsCategory, SourceType
 from .base import BaseCollector
+from .http_cache import http_cache
+
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+
+# 连续遇到这么多条早于截止时间的条目即停止解析（feed 一般按时间倒序）
+OLD_STREAK_TO_STOP = 5
+
+
+class _FeedStream:
+    """单遍流式解析 RSS 2.0 / Atom
+
+    边接收数据边产出条目，处理完的元素立即清空；
+    条目数达到上限或连续遇到过旧条目时标记 done，调用方可停止下载。
+    """
+
+    def __init__(self, collector: "RSSCollector", known: dict[str, dict], max_items: int, cutoff: Optional[datetime]):
+        self.collector = collector
+        self.known = known
+        self.max_items = max_items
+        self.cutoff = cutoff
+        self.entries: list[tuple[str, NewsItem]] = []
+        self.done = False
+        self.reused = 0  # 直接复用缓存、未重新解析的条目数
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._old_streak = 0
+
+    def feed(self, data) -> bool:
+        """喂入一段数据，返回是否已可停止"""
+        if not self.done:
+            self._parser.feed(data)
+            self._drain()
+        return self.done
+
+    def close(self):
+        if not self.done:
+            self._parser.close()
+            self._drain()
+
+    def _drain(self):
+        c = self.collector
+        for _, el in self._parser.read_events():
+            if self.done:
+                break
+            if el.tag == "item":
+                guid = c._get_text(el, "guid") or c._get_text(el, "link") or c._get_text(el, "title")
+                self.reused += guid in self.known
+                news = NewsItem(**self.known[guid]) if guid in self.known else c._parse_item(el)
+            elif el.tag == _ATOM_ENTRY:
+                guid = c._get_text(el, "atom:id", ATOM_NS) or c._get_text(el, "atom:title", ATOM_NS)
+                self.reused += guid in self.known
+                news = NewsItem(**self.known[guid]) if guid in self.known else c._parse_atom_entry(el, ATOM_NS)
+            else:
+                continue
+            el.clear()
+            self._accept(guid, news)
+
+    def replay(self, known: dict[str, dict]):
+        """304 时按同样的截止时间和条数上限重放缓存的条目"""
+        for guid, data in known.items():
+            if self.done:
+                break
+            self._accept(guid, NewsItem(**data))
+
+    def _accept(self, guid: str, news: Optional[NewsItem]):
+        if news is None:
+            return
+        published = news.published_at
+        if self.cutoff and published:
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            if published < self.cutoff:
+                self._old_streak += 1
+                self.done = self._old_streak >= OLD_STREAK_TO_STOP
+                return
+        self._old_streak = 0
+        self.entries.append((guid, news))
+        self.done = len(self.entries) >= self.max_items
 
 
 class RSSCollector(BaseCollector):
@@ -17,42 +99,75 @@ class RSSCollector(BaseCollector):
     SOURCE_NAME: str = ""
     SOURCE_TYPE: SourceType = SourceType.INTERNATIONAL
     LANGUAGE: str = "en"
+    MAX_ITEMS: int = 50  # 单个 feed 最多取的条目数
+    MAX_AGE_HOURS: Optional[float] = 48  # 早于此时长的条目丢弃（None 不限）
+
+    def _feed_stream(self, known: Optional[dict[str, dict]] = None) -> _FeedStream:
+        cutoff = None
+        if self.MAX_AGE_HOURS is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=self.MAX_AGE_HOURS)
+        return _FeedStream(self, known or {}, self.MAX_ITEMS, cutoff)
 
     async def collect(self) -> list[NewsItem]:
-        """采集 RSS 新闻"""
+        """采集 RSS 新闻
+
+        条件请求：未变化时复用上次的条目；否则边下载边解析，取够条目后不再下载剩余内容。
+        """
         if not self.RSS_URL:
             return []
 
         client = await self.get_client()
+        host = urlsplit(self.RSS_URL).hostname or ""
+        start = time.perf_counter()
         try:
-            response = await client.get(self.RSS_URL)
-            response.raise_for_status()
-            return self._parse_rss(response.text)
+            headers = http_cache.conditional_headers(self.RSS_URL)
+            async with client.stream("GET", self.RSS_URL, headers=headers) as response:
+                if response.status_code == 304:
+                    metrics.record_response(host, 304, 0, time.perf_counter() - start)
+                    logger.debug(f"{self.SOURCE_NAME} RSS 未变化（304）")
+                    metrics.inc("http_cache_hits", source=self.SOURCE_NAME, kind="not_modified")
+                    # feed 多日未变时，缓存里的条目同样要按 MAX_AGE_HOURS 过滤
+                    stream = self._feed_stream()
+                    stream.replay(http_cache.known_items(self.RSS_URL))
+                    return [item for _, item in stream.entries]
+                response.raise_for_status()
+                stream = self._feed_stream(http_cache.known_items(self.RSS_URL))
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if stream.feed(chunk):
+                        break
+                try:
+                    stream.close()
+                except ET.ParseError as e:
+                    logger.warning(f"{self.SOURCE_NAME} RSS XML 不完整，保留已解析的 {len(stream.entries)} 条: {e}")
+            metrics.record_response(host, response.status_code, received, time.perf_counter() - start)
+            if stream.reused:
+                metrics.inc("http_cache_hits", stream.reused, source=self.SOURCE_NAME, kind="guid")
+            http_cache.store(
+                self.RSS_URL,
+                response.headers.get("etag"),
+                response.headers.get("last-modified"),
+                stream.entries,
+            )
+            return [item for _, item in stream.entries]
         except Exception as e:
             logger.error(f"{self.SOURCE_NAME} RSS 采集失败: {e}")
             return []
 
     def _parse_rss(self, xml_content: str) -> list[NewsItem]:
         """解析 RSS XML"""
-        import xml.etree.ElementTree as ET
+        return [item for _, item in self._parse_entries(xml_content)]
 
-        items = []
+    def _parse_entries(self, xml_content: str, known: Optional[dict[str, dict]] = None) -> list[tuple[str, NewsItem]]:
+        """解析 RSS/Atom，返回 [(guid, NewsItem)]；guid 在 known 中的条目直接复用，不再解析"""
+        stream = self._feed_stream(known)
         try:
-            root = ET.fromstring(xml_content)
-            # 处理 RSS 2.0 格式
-            for item in root.findall(".//item"):
-                news = self._parse_item(item)
-                if news:
-                    items.append(news)
-            # 处理 Atom 格式
-            ns = {"atom": "http://www.w3.org/2005/Atom"}
-            for entry in root.findall(".//atom:entry", ns):
-                news = self._parse_atom_entry(entry, ns)
-                if news:
-                    items.append(news)
+            stream.feed(xml_content)
+            stream.close()
         except ET.ParseError as e:
             logger.error(f"RSS XML 解析失败: {e}")
-        return items
+        return stream.entries
 
     def _parse_item(self, item) -> Optional[NewsItem]:
         """解析 RSS item"""
@@ -124,7 +239,7 @@ class RSSCollector(BaseCollector):
             logger.debug(f"解析 Atom entry 失败: {e}")
             return None
 
-    def _get_text(self, element, tag: str) -> Optional[str]:
+    def _get_text(self, element, tag: str, ns: Optional[dict] = None) -> Optional[str]:
         """获取子元素文本"""
-        child = element.find(tag)
+        child = element.find(tag, ns)
         return child.text if child is not None else None
@@ -0,0 +1,80 @@
+"""已分析新闻指纹库 - 跨运行记录当天已送入分析的新闻，支持增量分析
+
+存储在 data/archive/seen_news.json（随归档同步到 R2），按北京时间每天重置：
+    {"date": "2026-03-02", "fingerprints": ["9f86d081884c7d65", ...]}
+
+指纹取归一化标题（见 dedup.normalize）的 64 位 blake2b，转载时的标点、前缀差异不影响匹配。
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from src.models import NewsItem
+from .dedup import normalize
+
+SEEN_FILE = Path(__file__).parent.parent / "data" / "archive" / "seen_news.json"
+
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+
+def fingerprint(item: NewsItem) -> str:
+    return hashlib.blake2b(normalize(item.title).encode(), digest_size=8).hexdigest()
+
+
+class SeenStore:
+    """当天已分析新闻的指纹集合"""
+
+    def __init__(self, path: Path = SEEN_FILE, today: Optional[str] = None):
+        self.path = path
+        self.today = today or datetime.now(BEIJING_TZ).strftime("%Y-%m-%d")
+        self._fingerprints: set[str] = set()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if data.get("date") == self.today:
+                    self._fingerprints = set(data.get("fingerprints", []))
+            except Exception as e:
+                logger.warning(f"读取已分析新闻指纹失败: {e}")
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def is_seen(self, item: NewsItem) -> bool:
+        return fingerprint(item) in self._fingerprints
+
+    def tag(self, items: Iterable[NewsItem]) -> int:
+        """设置每条新闻的 is_new，返回新条目数"""
+        new_count = 0
+        for item in items:
+            item.is_new = not self.is_seen(item)
+            new_count += item.is_new
+        return new_count
+
+    def add(self, items: Iterable[NewsItem]):
+        self._fingerprints.update(fingerprint(item) for item in items)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(
+            {"date": self.today, "fingerprints": sorted(self._fingerprints)},
+            separators=(",", ":"),
+        ))
+        tmp.replace(self.path)
+
+
+def build_seen_digest(items: list[NewsItem], limit: int = 30, width: int = 40) -> str:
+    """已分析新闻的压缩摘要：按来源数优先取前 limit 条，标题截断到 width 字"""
+    if not items:
+        return ""
+    ranked = sorted(items, key=lambda x: -x.dup_count)[:limit]
+    lines = [f"- {item.title[:width]}" for item in ranked]
+    more = len(items) - len(ranked)
+    if more > 0:
+        lines.append(f"- ……另有 {more} 条")
+    return "\n".join(lines)
@@ -13,11 +13,10 @@ class SinaFinanceCollector(BaseCollector):
     """新浪财经新闻采集器"""
 
     API_URL = "https://feed.mix.sina.com.cn/api/roll/get"
+    hedge = True
 
     async def collect(self) -> list[NewsItem]:
         """采集新浪财经新闻"""
-        client = await self.get_client()
-
         params = {
             "pageid": "153",
             "lid": "2516",
@@ -26,7 +25,7 @@ class SinaFinanceCollector(BaseCollector):
             "page": 1,
         }
 
-        response = await client.get(self.API_URL, params=params)
+        response = await self.hedged_get(self.API_URL, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -2,25 +2,28 @@
 
 import re
 from datetime import datetime, timezone, timedelta
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, SourceType
+from .html_parser import parse_html
 from .playwright_base import PlaywrightCollector
 
 
 class SinaPlaywrightCollector(PlaywrightCollector):
     """新浪财经7x24快讯采集器（Playwright 版本）"""
 
+    ready_selector = ".bd_i"
+    ready_min_items = 5
+
     async def get_urls(self) -> list[str]:
         return ["https://finance.sina.com.cn/7x24/"]
 
     async def parse_page(self, url: str, content: str) -> list[NewsItem]:
         """解析新浪7x24页面"""
-        soup = BeautifulSoup(content, "html.parser")
+        doc = parse_html(content)
         items = []
 
-        news_items = soup.select(".bd_i")
+        news_items = doc.select(".bd_i")
 
         for item in news_items[:30]:
             try:
@@ -28,17 +31,17 @@ class SinaPlaywrightCollector(PlaywrightCollector):
                 time_el = item.select_one(".bd_i_time_c")
                 pub_time = None
                 if time_el:
-                    time_text = time_el.get_text(strip=True)
+                    time_text = time_el.text()
                     pub_time = self._parse_time(time_text)
 
                 # 提取标题/内容
                 content_el = item.select_one(".bd_i_txt_c a")
-                title = content_el.get_text(strip=True) if content_el else ""
+                title = content_el.text() if content_el else ""
 
                 # 提取链接
                 news_url = url
-                if content_el and content_el.get("href"):
-                    news_url = content_el["href"]
+                if content_el and content_el.attr("href"):
+                    news_url = content_el.attr("href")
 
                 if not title or len(title) < 10:
                     continue
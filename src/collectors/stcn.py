@@ -3,18 +3,20 @@
 import re
 from datetime import datetime, date, timezone, timedelta
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, NewsCategory
 from .base import BaseCollector
+from .html_parser import parse_html
+
+ARTICLE_HREF = re.compile(r"/article/detail/\d+\.html")
 
 
 class StcnCollector(BaseCollector):
     """证券时报滚动新闻采集器
 
     抓取 stcn.com 滚动新闻页（服务端渲染 HTML），
-    用 BeautifulSoup 解析标题、链接、时间。
+    用共享的 HTML 解析后端解析标题、链接、时间。
     """
 
     PAGE_URL = "https://www.stcn.com/article/list/gd.html"
@@ -22,16 +24,17 @@ class StcnCollector(BaseCollector):
 
     async def collect(self) -> list[NewsItem]:
         """采集证券时报滚动新闻"""
-        client = await self.get_client()
-
-        response = await client.get(self.PAGE_URL)
+        response = await self.hedged_get(self.PAGE_URL)
         response.raise_for_status()
+        return self.parse_page(response.text)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    def parse_page(self, content: str) -> list[NewsItem]:
+        """解析滚动新闻页 HTML"""
+        doc = parse_html(content)
         items: list[NewsItem] = []
 
         # 遍历每个 <li>，从 div.tt 中提取标题链接（避免匹配摘要和缩略图的重复链接）
-        for li in soup.select("ul.list > li"):
+        for li in doc.select("ul.list > li"):
             news = self._parse_li(li)
             if news:
                 items.append(news)
@@ -55,21 +58,24 @@ class StcnCollector(BaseCollector):
             tt_div = li.select_one("div.tt")
             if not tt_div:
                 return None
-            a_tag = tt_div.find("a", href=re.compile(r"/article/detail/\d+\.html"))
+            a_tag = next(
+                (a for a in tt_div.select("a[href]") if ARTICLE_HREF.search(a.attr("href", ""))),
+                None,
+            )
             if not a_tag:
                 return None
 
-            title = a_tag.get_text(strip=True)
+            title = a_tag.text()
             if not title or len(title) < 4:
                 return None
 
             # 构建完整 URL
-            href = a_tag.get("href", "")
+            href = a_tag.attr("href", "")
             url = href if href.startswith("http") else self.BASE_URL + href
 
             # 从 div.text 提取摘要作为 content
             text_div = li.select_one("div.text")
-            content = text_div.get_text(strip=True) if text_div else title
+            content = text_div.text() if text_div else title
 
             # 从 div.info 最后一个 <span> 提取时间
             published_at = self._extract_time(li)
@@ -94,13 +100,13 @@ class StcnCollector(BaseCollector):
         if not info_div:
             return None
 
-        spans = info_div.find_all("span")
+        spans = info_div.select("span")
         if not spans:
             return None
 
         # 时间通常在最后一个 span
         for span in reversed(spans):
-            text = span.get_text(strip=True)
+            text = span.text()
             match = re.search(r"(\d{1,2}):(\d{2})", text)
             if match:
                 hour, minute = int(match.group(1)), int(match.group(2))
@@ -2,72 +2,81 @@
 
 import re
 from datetime import datetime, timezone, timedelta
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from src.models import NewsItem, SourceType
+from .html_parser import parse_html
 from .playwright_base import PlaywrightCollector
 
 
 class WallStreetCNCollector(PlaywrightCollector):
     """华尔街见闻快讯采集器"""
 
+    wait_time = 5000  # 等待动态内容加载的上限
+    ready_selector = "time"
+    ready_min_items = 5
+    capture_patterns = ("apiv1/content/lives",)
+
     def __init__(self):
         super().__init__(timeout=30000)
-        self.wait_time = 5000  # 需要等待动态内容加载
 
     async def get_urls(self) -> list[str]:
         return ["https://wallstreetcn.com/live/global"]
 
-    async def fetch_page(self, url: str):
-        """重写 fetch_page 增加等待时间"""
-        try:
-            from .playwright_base import get_browser
-            browser = await get_browser()
-            page = await browser.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
-                await page.wait_for_timeout(self.wait_time)
-                content = await page.content()
-                return content
-            finally:
-                await page.close()
-        except Exception as e:
-            logger.warning(f"{self.name} 获取页面失败 {url}: {e}")
-            return None
+    def parse_captured(self, url: str, payloads: list) -> list[NewsItem]:
+        """解析快讯接口：{"data": {"items": [{"content_text", "display_time", "uri"}]}}"""
+        beijing_tz = timezone(timedelta(hours=8))
+        items = []
+        seen = set()
+        for payload in payloads:
+            for live in ((payload or {}).get("data") or {}).get("items") or []:
+                text = (live.get("content_text") or live.get("title") or "").strip()
+                if len(text) < 10 or text in seen:
+                    continue
+                seen.add(text)
+                ts = live.get("display_time")
+                items.append(NewsItem(
+                    title=text[:500],
+                    content=text,
+                    source="华尔街见闻",
+                    source_type=SourceType.INTERNATIONAL,
+                    url=live.get("uri") or url,
+                    published_at=datetime.fromtimestamp(ts, tz=beijing_tz) if ts else None,
+                ))
+        return items[:30]
 
     async def parse_page(self, url: str, content: str) -> list[NewsItem]:
-        soup = BeautifulSoup(content, "html.parser")
+        doc = parse_html(content)
         items = []
         beijing_tz = timezone(timedelta(hours=8))
 
         # 新版页面结构：查找所有 time 元素
         time_pattern = re.compile(r'^\d{1,2}:\d{2}$')
 
-        for time_el in soup.find_all('time'):
+        for time_el in doc.select("time"):
             try:
-                time_text = time_el.get_text(strip=True)
+                time_text = time_el.text()
                 # 只匹配 HH:MM 格式的时间（快讯时间）
                 if not time_pattern.match(time_text):
                     continue
 
                 # 获取父容器
-                container = time_el.find_parent()
+                container = time_el.parent
                 if not container:
                     continue
                 # 再往上一层获取整个快讯块
-                news_block = container.find_parent()
+                news_block = container.parent
                 if not news_block:
                     continue
 
                 # 获取所有段落文本
-                paragraphs = news_block.find_all('p')
+                paragraphs = news_block.select("p")
                 if paragraphs:
-                    texts = [p.get_text(strip=True) for p in paragraphs]
+                    texts = [p.text() for p in paragraphs]
                     title = ' '.join(texts)
                 else:
                     # 获取整个块的文本，移除时间部分
-                    title = news_block.get_text(strip=True)
+                    title = news_block.text()
                     title = title.replace(time_text, '').strip()
 
                 # 过滤太短或无效的内容
@@ -7,8 +7,8 @@ from pydantic import Field
 class Settings(BaseSettings):
     """应用配置"""
 
-    # Claude API 配置
-    claude_api_key: str = Field(..., alias="CLAUDE_API_KEY")
+    # Claude API 配置（采集作业不调用 AI，可以不设置；AIClient 创建时检查）
+    claude_api_key: str = Field(default="", alias="CLAUDE_API_KEY")
     claude_base_url: str = Field(
         default="https://api.anthropic.com", alias="CLAUDE_BASE_URL"
     )
@@ -21,6 +21,43 @@ class Settings(BaseSettings):
         default="", alias="WECHAT_WEBHOOK_URL"
     )
 
+    # 分析模式：full 每次分析全部新闻；incremental 只送当天新出现的新闻，
+    # 已分析过的以摘要形式作为背景
+    analysis_mode: str = Field(default="full", alias="ANALYSIS_MODE")
+
+    # 行情接口限速覆盖，格式：key=rate:burst[:concurrency],...
+    # key 见 src/services/rate_limiter.py 的 DEFAULT_POLICIES
+    rate_limits: str = Field(default="", alias="RATE_LIMITS")
+
+    # AI 响应缓存（data/archive/ai_cache）：条目有效期、条目数上限、是否整体跳过
+    # 有效期须长于 ETF Master 的重建间隔（每月一次），否则 etf_enrich 条目到下次重建时都已过期
+    ai_cache_ttl_hours: float = Field(default=960, alias="AI_CACHE_TTL_HOURS")
+    ai_cache_max_entries: int = Field(default=500, alias="AI_CACHE_MAX_ENTRIES")
+    ai_cache_bypass: bool = Field(default=False, alias="AI_CACHE_BYPASS")
+
+    # AI 请求的并发上限和速率（每秒请求数），所有 AIClient 共用
+    ai_concurrency: int = Field(default=4, alias="AI_CONCURRENCY")
+    ai_rate: float = Field(default=2.0, alias="AI_RATE")
+
+    # 分析提示词的输入 token 预算（估算值），新闻超出时按时效、多源、来源多样性挑选
+    analysis_input_tokens: int = Field(default=12000, alias="ANALYSIS_INPUT_TOKENS")
+
+    # 分片汇总：新闻超过这个条数时先按类别分片并发提炼要点再汇总分析（0 为关闭），以及分片并发数
+    map_reduce_threshold: int = Field(default=0, alias="MAP_REDUCE_THRESHOLD")
+    map_reduce_concurrency: int = Field(default=3, alias="MAP_REDUCE_CONCURRENCY")
+
+    # 流式接收分析结果：板块一输出完就开始映射并预取 ETF 行情
+    ai_streaming: bool = Field(default=False, alias="AI_STREAMING")
+
+    # 新闻近似去重的 SimHash 汉明距离阈值（同 dedup.DEFAULT_MAX_DISTANCE）
+    news_dedup_distance: int = Field(default=3, alias="NEWS_DEDUP_DISTANCE")
+
+    # 指定网页解析后端（selectolax / lxml / html.parser），留空时用已安装的最快后端
+    html_parser: str = Field(default="", alias="HTML_PARSER")
+
+    # 另写 Prometheus 文本格式的 metrics.prom
+    metrics_prometheus: bool = Field(default=False, alias="METRICS_PROMETHEUS")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
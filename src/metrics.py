@@ -0,0 +1,185 @@
+"""运行指标 - 轻量的计时器和计数器，按名称 + 标签聚合
+
+用法：
+    with metrics.timer("stage_seconds", stage="ai_analyze"):
+        ...
+    metrics.inc("http_bytes", len(resp.content), host=host)
+
+每次运行结束写 data/metrics.json（与 latest.json 同目录），并在 data/archive/metrics_history.jsonl
+追加一行摘要（保留最近 HISTORY_LIMIT 次），便于跨运行对比。
+设置环境变量 METRICS_PROMETHEUS=1 时另写 Prometheus 文本格式的 metrics.prom。
+"""
+
+import json
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from src.config import settings
+
+DATA_DIR = Path(__file__).parent / "data"
+HISTORY_FILE = DATA_DIR / "archive" / "metrics_history.jsonl"
+HISTORY_LIMIT = 500
+
+PROM_PREFIX = "etfwind_"
+
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+@dataclass
+class TimerStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+class Metrics:
+    """一次运行的指标集合"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._timers: dict[LabelKey, TimerStats] = {}
+        self._counters: dict[LabelKey, float] = {}
+
+    def observe(self, name: str, seconds: float, **labels):
+        self._timers.setdefault(_key(name, labels), TimerStats()).observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """计时代码块（异常退出也会记录）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def record_response(self, host: str, status: int, nbytes: int, seconds: float):
+        """记录一次出站 HTTP 请求的耗时、状态码和响应字节数"""
+        self.observe("http_request_seconds", seconds, host=host)
+        self.inc("http_requests", host=host, status=status)
+        self.inc("http_bytes", nbytes, host=host)
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(_key(name, labels), 0)
+
+    def timer_stats(self, name: str, **labels) -> Optional[TimerStats]:
+        return self._timers.get(_key(name, labels))
+
+    def reset(self):
+        self.started_at = time.time()
+        self._timers.clear()
+        self._counters.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            "started_at": round(self.started_at, 3),
+            "duration": round(time.time() - self.started_at, 3),
+            "timers": [
+                {"name": name, "labels": dict(labels), "count": t.count, "total": round(t.total, 4), "max": round(t.max, 4)}
+                for (name, labels), t in sorted(self._timers.items())
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ],
+        }
+
+    def to_prometheus(self, extra: Optional[dict] = None) -> str:
+        """Prometheus 文本格式：计时器输出 _count/_sum 和 _max，计数器输出 _total
+
+        extra 是额外附加的 snapshot（如采集阶段的指标），按 phase 标签区分。
+        同一指标的各 phase 样本归到一起输出（文本格式要求同名样本连续）。
+        """
+        snapshots = [("", self.snapshot())]
+        snapshots += [(phase, snap) for phase, snap in (extra or {}).items() if snap]
+        families: dict[str, tuple[str, list[str]]] = {}  # 指标名 -> (类型, 样本行)，按首次出现排序
+
+        def emit(metric: str, kind: str, labels: dict, value: float):
+            body = ",".join(f'{_prom_name(k)}="{_prom_escape(v)}"' for k, v in labels.items())
+            families.setdefault(metric, (kind, []))[1].append(
+                f"{metric}{{{body}}} {value:g}" if body else f"{metric} {value:g}"
+            )
+
+        for phase, snap in snapshots:
+            for t in snap.get("timers", []):
+                labels = {**t["labels"], **({"phase": phase} if phase else {})}
+                base = PROM_PREFIX + _prom_name(t["name"])
+                emit(f"{base}_count", "counter", labels, t["count"])
+                emit(f"{base}_sum", "counter", labels, t["total"])
+                emit(f"{base}_max", "gauge", labels, t["max"])
+            for c in snap.get("counters", []):
+                labels = {**c["labels"], **({"phase": phase} if phase else {})}
+                emit(f"{PROM_PREFIX}{_prom_name(c['name'])}_total", "counter", labels, c["value"])
+        lines: list[str] = []
+        for metric, (kind, samples) in families.items():
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, extra: Optional[dict] = None, history: Optional[Path] = HISTORY_FILE) -> dict:
+        """写 metrics.json（extra 合并进顶层，如采集阶段的指标），返回写入的内容"""
+        data = {**self.snapshot(), **(extra or {})}
+        _atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2))
+        if settings.metrics_prometheus:
+            _atomic_write(path.with_suffix(".prom"), self.to_prometheus(extra))
+        if history is not None:
+            _append_history(history, data)
+        return data
+
+
+def _prom_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _prom_escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text)
+    tmp.replace(path)
+
+
+def _summary(data: dict) -> dict:
+    """历史摘要：每个计时器只留总耗时，每个计数器只留值"""
+    def flat(entry: dict) -> str:
+        labels = ",".join(f"{k}={v}" for k, v in entry["labels"].items())
+        return f"{entry['name']}{{{labels}}}" if labels else entry["name"]
+
+    summary = {
+        "started_at": data.get("started_at"),
+        "duration": data.get("duration"),
+        "timers": {flat(t): t["total"] for t in data.get("timers", [])},
+        "counters": {flat(c): c["value"] for c in data.get("counters", [])},
+    }
+    for phase, snap in data.items():
+        if isinstance(snap, dict) and "timers" in snap:
+            summary[phase] = _summary(snap)
+    return summary
+
+
+def _append_history(path: Path, data: dict):
+    lines = path.read_text().splitlines() if path.exists() else []
+    lines.append(json.dumps(_summary(data), ensure_ascii=False, separators=(",", ":")))
+    _atomic_write(path, "\n".join(lines[-HISTORY_LIMIT:]) + "\n")
+
+
+metrics = Metrics()
@@ -30,6 +30,8 @@ class NewsItem(BaseModel):
     category: NewsCategory = NewsCategory.OTHER
     language: str = "zh"
     summary_zh: Optional[str] = None
+    dup_count: int = 1  # 报道同一新闻的来源数（近似去重后合并）
+    is_new: bool = True  # 当天此前的分析中未出现过
 
 
 class NewsCollection(BaseModel):
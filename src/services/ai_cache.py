@@ -0,0 +1,110 @@
+"""AI 响应缓存 - 按请求内容寻址的磁盘缓存，输入不变时直接复用上次的回答
+
+存储在 data/archive/ai_cache/（随归档同步到 R2），每个请求一个文件：
+    <sha256(模型, 消息, 参数)>.json  {"created": 时间戳, "purpose": ..., "response": 文本}
+
+- TTL：创建超过 ttl 秒的条目视为未命中并删除
+- LRU：文件 mtime 记录最近一次命中，条目数或总大小超限时先淘汰最久未用的
+- 旁路：AIRequest(cache=False) 跳过单个请求，环境变量 AI_CACHE_BYPASS=1 跳过全部
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+CACHE_DIR = Path(__file__).parent.parent / "data" / "archive" / "ai_cache"
+
+
+def cache_key(payload: dict[str, Any]) -> str:
+    """请求内容的哈希：模型、消息和影响输出的参数（不含 stream 等传输参数）"""
+    material = {k: v for k, v in payload.items() if k not in ("stream", "stream_options")}
+    return hashlib.sha256(json.dumps(material, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+class AICache:
+    """按内容寻址的 AI 响应缓存"""
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        ttl: float = 40 * 86400,
+        max_entries: int = 500,
+        max_bytes: int = 20 * 1024 * 1024,
+        enabled: bool = True,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._index: Optional[dict[str, tuple[float, int]]] = None  # key -> (最近使用时间, 字节数)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _entries(self) -> dict[str, tuple[float, int]]:
+        if self._index is None:
+            self._index = {}
+            if self.directory.exists():
+                for path in self.directory.glob("*.json"):
+                    stat = path.stat()
+                    self._index[path.stem] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled or key not in self._entries():
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except Exception as e:
+            logger.debug(f"读取 AI 缓存失败 {key[:12]}: {e}")
+            self._drop(key)
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            self._drop(key)
+            return None
+        now = time.time()
+        os.utime(path, (now, now))
+        self._entries()[key] = (now, self._entries()[key][1])
+        return entry.get("response")
+
+    def put(self, key: str, response: str, purpose: str = ""):
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        data = json.dumps(
+            {"created": time.time(), "purpose": purpose, "response": response},
+            ensure_ascii=False,
+        )
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(data)
+        tmp.replace(path)
+        self._entries()[key] = (time.time(), path.stat().st_size)
+        self._evict()
+
+    def _drop(self, key: str):
+        self._entries().pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size in entries.values())
+        if len(entries) <= self.max_entries and total <= self.max_bytes:
+            return
+        for key, (_, size) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+            if len(entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= size
+            self._drop(key)
+            logger.debug(f"淘汰 AI 缓存 {key[:12]}")
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
@@ -9,13 +9,33 @@ import asyncio
 import json
 import random
 import re
-from dataclasses import dataclass
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
 
 import httpx
 from loguru import logger
 
 from src.config import settings
+from src.metrics import metrics
+from src.services.ai_cache import AICache, cache_key
+from src.services.rate_limiter import HostPolicy, TokenBucket
+
+
+ai_cache = AICache(
+    ttl=settings.ai_cache_ttl_hours * 3600,
+    max_entries=settings.ai_cache_max_entries,
+    enabled=not settings.ai_cache_bypass,
+)
+
+
+_CJK = re.compile(r"[\u3000-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中日文字符和全角标点按 1 个，其余按 4 个字符 1 个（偏保守）"""
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
 
 
 @dataclass
@@ -24,12 +44,63 @@ class AIRequest:
     max_tokens: int = 2048  # DeepSeek 支持较长文本，稍微调大点
     timeout: float = 120
     model: str | None = None
+    purpose: str = "other"  # 指标标签：区分各处 AI 调用
+    cache: bool = True  # False 时跳过响应缓存（既不读也不写）
+    # 设置后以 SSE 流式接收，每收到一段文本用「目前为止的全部文本」回调一次；
+    # 重试时文本从头开始，缓存命中时回调一次完整文本
+    on_text: Callable[[str], None] | None = None
+
+
+@dataclass
+class _Shared:
+    """同一事件循环内所有 AIClient 共用的连接、限速桶和在途请求表"""
+    loop: asyncio.AbstractEventLoop
+    client: httpx.AsyncClient
+    bucket: TokenBucket
+    inflight: dict[str, asyncio.Future] = field(default_factory=dict)
+
+
+_shared: _Shared | None = None
+
+
+def _get_shared() -> _Shared:
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared.loop is not loop or _shared.client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=settings.ai_concurrency, max_keepalive_connections=settings.ai_concurrency),
+        )
+        bucket = TokenBucket(HostPolicy(
+            rate=settings.ai_rate,
+            burst=settings.ai_concurrency,
+            concurrency=settings.ai_concurrency,
+            min_rate=min(0.2, settings.ai_rate),
+        ))
+        _shared = _Shared(loop, client, bucket)
+    return _shared
+
+
+async def close_ai_client():
+    """关闭共享连接（run 结束时调用，之后再请求会重新建立）"""
+    global _shared
+    shared, _shared = _shared, None
+    if shared and not shared.client.is_closed and shared.loop is asyncio.get_running_loop():
+        stats = shared.bucket.stats
+        if stats.requests:
+            logger.info(f"AI 请求调度: {stats.requests} 次，排队 {stats.throttled} 次，限速等待 {stats.wait_seconds:.1f}s")
+        await shared.client.aclose()
 
 
 class AIClient:
-    """Lightweight OpenAI-compatible (DeepSeek) API client with retries."""
+    """Lightweight OpenAI-compatible (DeepSeek) API client with retries.
+
+    所有实例共用一个长连接客户端，按 AI_CONCURRENCY / AI_RATE 限制并发和速率；
+    内容相同的非流式请求同时在途时只发一次，其余等待同一结果。
+    """
 
     def __init__(self):
+        if not settings.claude_api_key:
+            raise RuntimeError("未设置 CLAUDE_API_KEY")
         self.base_url = settings.claude_base_url.rstrip("/")
         self.api_key = settings.claude_api_key
         self.model = settings.claude_model
@@ -41,9 +112,38 @@ class AIClient:
             "max_tokens": req.max_tokens,
             "messages": req.messages,
             "temperature": 0.7,
-            "stream": False
+            "stream": req.on_text is not None,
         }
+        if req.on_text:
+            payload["stream_options"] = {"include_usage": True}
+
+        key = cache_key(payload)
+        if req.cache and ai_cache.enabled:
+            cached = ai_cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI 缓存命中 ({req.purpose})")
+                metrics.inc("cache_hits", cache="ai", purpose=req.purpose)
+                if req.on_text:
+                    req.on_text(cached)
+                return cached
+            metrics.inc("cache_misses", cache="ai", purpose=req.purpose)
+
+        # 流式请求有各自的回调，不合并
+        if req.on_text:
+            return await self._send(req, payload, key)
+
+        shared = _get_shared()
+        task = shared.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(req, payload, key))
+            shared.inflight[key] = task
+            task.add_done_callback(lambda _: shared.inflight.pop(key, None))
+        else:
+            logger.debug(f"合并相同的在途 AI 请求 ({req.purpose})")
+            metrics.inc("ai_coalesced", purpose=req.purpose)
+        return await asyncio.shield(task)
 
+    async def _send(self, req: AIRequest, payload: dict, key: str) -> str:
         backoffs = [1, 2, 4]
         last_err: Exception | None = None
 
@@ -52,36 +152,156 @@ class AIClient:
         if "/v1" not in self.base_url and "/chat/completions" not in self.base_url:
              url = f"{self.base_url}/chat/completions"
 
+        model = payload["model"]
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        shared = _get_shared()
+
         for attempt, backoff in enumerate(backoffs, start=1):
             try:
-                async with httpx.AsyncClient(timeout=req.timeout) as client:
-                    resp = await client.post(
-                        url,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Authorization": f"Bearer {self.api_key}",
-                        },
-                        json=payload,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    
-                    return data["choices"][0]["message"]["content"].strip()
-                    
+                async with shared.bucket.slot():
+                    start = time.perf_counter()
+                    try:
+                        if req.on_text:
+                            content, nbytes, usage = await self._stream(shared.client, url, headers, payload, req, start)
+                        else:
+                            resp = await shared.client.post(url, headers=headers, json=payload, timeout=req.timeout)
+                            resp.raise_for_status()
+                            data = resp.json()
+                            content = data["choices"][0]["message"]["content"].strip()
+                            nbytes, usage = len(resp.content), data.get("usage") or {}
+                    finally:
+                        metrics.observe("ai_request_seconds", time.perf_counter() - start, model=model, purpose=req.purpose)
+
+                shared.bucket.reward()
+                metrics.inc("ai_requests", model=model, purpose=req.purpose, status="ok")
+                metrics.inc("ai_bytes", nbytes, model=model)
+                for kind in ("prompt_tokens", "completion_tokens"):
+                    if usage.get(kind):
+                        metrics.inc("ai_tokens", usage[kind], model=model, purpose=req.purpose, kind=kind.split("_")[0])
+                if req.cache and ai_cache.enabled and content:
+                    ai_cache.put(key, content, req.purpose)
+                return content
+
             except Exception as e:
                 last_err = e
+                metrics.inc("ai_requests", model=model, purpose=req.purpose, status="error")
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429:
+                    shared.bucket.penalize()
                 if "Insufficient Balance" in str(e):
                     break
                     
                 if attempt < len(backoffs):
                     sleep_for = backoff + random.uniform(0, 0.3)
                     logger.warning(f"AI API error (attempt {attempt}): {e}. retrying...")
+                    metrics.inc("ai_retries", model=model, purpose=req.purpose)
                     await asyncio.sleep(sleep_for)
                 else:
                     break
 
         raise last_err or RuntimeError("AI API error")
 
+    async def _stream(
+        self, client: httpx.AsyncClient, url: str, headers: dict, payload: dict, req: AIRequest, start: float
+    ) -> tuple[str, int, dict]:
+        """读取 SSE 流（data: {...} 每行一个增量，data: [DONE] 结束），返回 (全文, 字节数, usage)"""
+        text, nbytes, usage = "", 0, {}
+        async with client.stream("POST", url, headers=headers, json=payload, timeout=req.timeout) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                nbytes += len(line) + 1
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices") or []
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if not delta:
+                    continue
+                if not text:
+                    metrics.observe("ai_first_token_seconds", time.perf_counter() - start, model=payload["model"], purpose=req.purpose)
+                text += delta
+                req.on_text(text)
+        return text.strip(), nbytes, usage
+
+
+class JsonArrayStream:
+    """增量解析流式 JSON：顶层对象中 key 对应数组的元素一闭合就产出
+
+    feed() 传入目前为止的全部文本，只扫描新增部分；文本不再以上次的内容开头（请求重试）时从头开始。
+    元素解析失败（如模型写坏了）时跳过，由最终的 parse_json_with_repair 兜底。
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._reset()
+
+    def _reset(self):
+        self._text = ""
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self._str_start = 0
+        self._last_str = ""  # 顶层最近一个字符串（即当前键名）
+        self._array_depth = 0  # 目标数组内部的深度，0 表示不在数组中
+        self._elem_start = -1
+        self.done = False
+
+    def feed(self, text: str) -> list[Any]:
+        if not text.startswith(self._text):
+            self._reset()
+        start, self._text = len(self._text), text
+        items = []
+        for i in range(start, len(text)):
+            if self.done:
+                break
+            ch = text[i]
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+                    if self._depth == 1:
+                        self._last_str = text[self._str_start + 1:i]
+                continue
+            if ch == '"':
+                self._in_str = True
+                self._str_start = i
+            elif ch in "{[":
+                if self._array_depth and self._depth == self._array_depth and self._elem_start < 0:
+                    self._elem_start = i
+                elif not self._array_depth and self._depth == 1 and ch == "[" and self._last_str == self.key:
+                    self._array_depth = 2
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._array_depth and self._depth == self._array_depth and self._elem_start >= 0:
+                    item = _loads_fragment(text[self._elem_start:i + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._elem_start = -1
+                elif self._array_depth and self._depth < self._array_depth:
+                    self.done = True
+        return items
+
+
+def _loads_fragment(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        try:
+            return json.loads(re.sub(r",(\s*[}\]])", r"\1", raw.replace("\n", " ")))
+        except json.JSONDecodeError as e:
+            logger.debug(f"流式 JSON 元素解析失败: {e}")
+            return None
+
 
 # --- 下面的 JSON 辅助函数保持原样即可 ---
 
@@ -4,11 +4,17 @@ import asyncio
 import json
 import re
 import time
-import httpx
+from datetime import datetime
 from loguru import logger
 from typing import Optional
 
-from src.services.ai_client import AIClient, AIRequest, parse_json_with_repair
+from src.config import settings
+from src.metrics import metrics
+from src.services.ai_client import AIClient, AIRequest, estimate_tokens, parse_json_with_repair
+from src.services.http_pool import HostPool
+from src.services.kline_store import KlineStore
+from src.services.rate_limiter import HostScheduler, parse_policies
+from src.services.trading_calendar import TradingCalendar
 
 # 排除的 ETF 类型（宽基指数、债券、货币、跨境等）
 EXCLUDE_KEYWORDS = [
@@ -20,6 +26,51 @@ EXCLUDE_KEYWORDS = [
 ]
 
 
+# ETF 详情页（fundf10）较慢，沿用构建 ETF Master 时原先的 30s 客户端超时，而不是连接池默认的 15s
+DETAIL_TIMEOUT = 30.0
+
+# ETF 批量富化的分批上限：输入按估算 token 控制，条数另受输出长度（max_tokens）限制
+ENRICH_INPUT_TOKENS = 4000
+ENRICH_MAX_BATCH = 40
+
+
+OPEN_CLASSIFY_RULES = """1. 只分类到A股行业板块，如：黄金、有色、芯片、AI、医药、证券、银行、军工、光伏、新能源车、锂电池、白酒、消费、农业、煤炭、钢铁、石油、化工、电力、机器人、通信、游戏、传媒、房地产、家电、环保、港股、互联网
+2. 相似板块统一名称：券商→证券，医疗→医药，贵金属→黄金，半导体→芯片，人工智能→AI，恒生科技→港股
+3. 以下类型标记为"排除"，不归入任何行业板块：
+   - 宽基指数：沪深300、中证500、中证1000、上证50、创业板、科创板、A500
+   - 债券类：国债、信用债、科创债、城投债、地方债、可转债
+   - 货币/策略：货币基金、红利、策略、期货
+   - 跨境：纳斯达克、标普、日经、巴西、沙特、海外、中概"""
+
+
+def _etf_prompt_line(info: dict) -> str:
+    return (
+        f"- {info['code']} {info.get('name','')}: "
+        f"全称={info.get('full_name','')}, "
+        f"投资范围={(info.get('scope') or '')[:200]}, "
+        f"风险特征={(info.get('risk') or '')[:100]}"
+    )
+
+
+def plan_batches(
+    etf_infos: list[dict], budget: int = ENRICH_INPUT_TOKENS, max_items: int = ENRICH_MAX_BATCH
+) -> list[list[dict]]:
+    """按提示词长度分批：每批估算 token 不超过 budget（单条超出时独占一批），条数不超过 max_items"""
+    batches: list[list[dict]] = []
+    current: list[dict] = []
+    used = 0
+    for info in etf_infos:
+        cost = estimate_tokens(_etf_prompt_line(info))
+        if current and (used + cost > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(info)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
 class FundService:
     """基金数据服务"""
 
@@ -31,16 +82,31 @@ class FundService:
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         }
-        # K线缓存: {secid: (timestamp, data)}
-        self._kline_cache: dict[str, tuple[float, dict]] = {}
-        self._cache_ttl = 300  # 5分钟
-        # K线(含日期)缓存: {secid: (timestamp, data)}
-        self._kline_date_cache: dict[str, tuple[float, list[tuple[str, float]]]] = {}
+        # K线(含日期)缓存: {secid: (timestamp, limit, data)}
+        self._kline_date_cache: dict[str, tuple[float, int, list[tuple[str, float]]]] = {}
         self._kline_date_cache_ttl = 3600  # 1小时
+        # 本地K线库（持久化，跨运行增量更新）
+        self.kline_store = KlineStore()
         # ETF列表缓存: {sector: [(code, name, amount), ...]}
         self._etf_list_cache: dict[str, list] = {}
         self._etf_cache_time: float = 0
         self._etf_cache_ttl = 86400  # 24小时
+        # 实时行情缓存: {code: (timestamp, data)}，流式分析时预取的行情在匹配 ETF 时直接复用
+        self._quote_cache: dict[str, tuple[float, dict]] = {}
+        self._quote_cache_ttl = 60
+        # 按主机复用的长连接池（进程内共享，run 结束时 aclose）
+        self.http = HostPool(
+            headers=self.headers,
+            timeout=self.timeout,
+            scheduler=HostScheduler(parse_policies(settings.rate_limits)),
+        )
+
+    async def aclose(self):
+        """释放连接池（顺带输出各主机的调度统计）"""
+        stats = self.http.scheduler.stats()
+        if stats:
+            logger.info(f"行情请求调度统计: {stats}")
+        await self.http.aclose()
 
     async def _fetch_all_etfs(self) -> list[dict]:
         """获取所有 ETF 列表（新浪为主，东方财富为备）"""
@@ -56,32 +122,31 @@ class FundService:
         """从新浪财经获取 ETF 列表"""
         all_etfs = []
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                for page in range(1, 16):
-                    resp = await client.get(
-                        "https://vip.stock.finance.sina.com.cn/quotes_service/api/json_v2.php/Market_Center.getHQNodeData",
-                        params={
-                            "page": page,
-                            "num": 100,
-                            "sort": "amount",
-                            "asc": 0,
-                            "node": "etf_hq_fund",
-                        },
-                        headers={"Referer": "https://finance.sina.com.cn"},
-                    )
-                    data = resp.json()
-                    if not data:
-                        break
-                    for item in data:
-                        code = item.get("code", "")
-                        if code:
-                            all_etfs.append({
-                                "code": code,
-                                "name": item.get("name", ""),
-                                "amount": item.get("amount", 0),
-                            })
-                    if len(data) < 100:
-                        break
+            for page in range(1, 16):
+                resp = await self.http.get(
+                    "https://vip.stock.finance.sina.com.cn/quotes_service/api/json_v2.php/Market_Center.getHQNodeData",
+                    params={
+                        "page": page,
+                        "num": 100,
+                        "sort": "amount",
+                        "asc": 0,
+                        "node": "etf_hq_fund",
+                    },
+                    headers={"Referer": "https://finance.sina.com.cn"},
+                )
+                data = resp.json()
+                if not data:
+                    break
+                for item in data:
+                    code = item.get("code", "")
+                    if code:
+                        all_etfs.append({
+                            "code": code,
+                            "name": item.get("name", ""),
+                            "amount": item.get("amount", 0),
+                        })
+                if len(data) < 100:
+                    break
             logger.info(f"新浪API获取到 {len(all_etfs)} 个ETF")
             return all_etfs
         except Exception as e:
@@ -94,45 +159,43 @@ class FundService:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                    for page in range(1, 15):
-                        resp = await client.get(
-                            "https://push2.eastmoney.com/api/qt/clist/get",
-                            params={
-                                "pn": page,
-                                "pz": 100,
-                                "fs": "b:MK0021,b:MK0023,b:MK0024",
-                                "fid": "f6",
-                                "po": 1,
-                                "fields": "f12,f14,f6",
-                            },
-                        )
-                        data = resp.json().get("data", {})
-                        diff = data.get("diff", {})
-                        if not diff:
-                            break
-                        items = diff.values() if isinstance(diff, dict) else diff
-                        for item in items:
-                            if item.get("f12"):
-                                all_etfs.append({
-                                    "code": item.get("f12", ""),
-                                    "name": item.get("f14", ""),
-                                    "amount": item.get("f6", 0),
-                                })
-                    logger.info(f"东方财富API获取到 {len(all_etfs)} 个ETF")
-                    return all_etfs
+                for page in range(1, 15):
+                    resp = await self.http.get(
+                        "https://push2.eastmoney.com/api/qt/clist/get",
+                        params={
+                            "pn": page,
+                            "pz": 100,
+                            "fs": "b:MK0021,b:MK0023,b:MK0024",
+                            "fid": "f6",
+                            "po": 1,
+                            "fields": "f12,f14,f6",
+                        },
+                    )
+                    data = resp.json().get("data", {})
+                    diff = data.get("diff", {})
+                    if not diff:
+                        break
+                    items = diff.values() if isinstance(diff, dict) else diff
+                    for item in items:
+                        if item.get("f12"):
+                            all_etfs.append({
+                                "code": item.get("f12", ""),
+                                "name": item.get("f14", ""),
+                                "amount": item.get("f6", 0),
+                            })
+                logger.info(f"东方财富API获取到 {len(all_etfs)} 个ETF")
+                return all_etfs
             except Exception as e:
                 logger.warning(f"东方财富ETF列表失败(尝试{attempt+1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2)
+                self.http.penalize("https://push2.eastmoney.com/api/qt/clist/get")
                 all_etfs = []
         return all_etfs
 
-    async def _fetch_etf_raw_info(self, client: httpx.AsyncClient, code: str) -> dict:
+    async def _fetch_etf_raw_info(self, client: HostPool, code: str) -> dict:
         """获取 ETF 原始信息"""
         try:
             url = f"https://fundf10.eastmoney.com/jbgk_{code}.html"
-            resp = await client.get(url, timeout=10)
+            resp = await client.get(url, timeout=DETAIL_TIMEOUT)
             text = resp.text
 
             info = {}
@@ -161,38 +224,6 @@ class FundService:
             pass
         return {}
 
-    async def _summarize_etf_desc(self, client: httpx.AsyncClient, etf_infos: list[dict]) -> dict[str, str]:
-        """用 AI 批量精炼 ETF 描述"""
-        if not etf_infos:
-            return {}
-
-        etf_list = "\n".join([
-            f"- {info['code']}: 全称={info.get('full_name','')}, "
-            f"简称={info.get('short_name','')}, "
-            f"管理人={info.get('manager','')}, "
-            f"投资范围={info.get('scope','')[:200] if info.get('scope') else ''}, "
-            f"风险特征={info.get('risk','')[:150] if info.get('risk') else ''}"
-            for info in etf_infos
-        ])
-
-        prompt = f"""为以下ETF生成简洁描述（每个30-50字），突出投资标的和风险特征。
-
-{etf_list}
-
-        输出JSON格式：{{"代码": "描述", ...}}"""
-
-        try:
-            ai_client = AIClient()
-            text = await ai_client.send(AIRequest(
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2048,
-                timeout=60,
-            ))
-            return parse_json_with_repair(text)
-        except Exception as e:
-            logger.warning(f"AI精炼描述失败: {e}")
-            return {}
-
     def _should_exclude_etf(self, name: str) -> bool:
         """检查是否应排除该 ETF（宽基、债券、跨境等）"""
         for kw in EXCLUDE_KEYWORDS:
@@ -200,60 +231,103 @@ class FundService:
                 return True
         return False
 
-    async def _ai_classify_etfs(self, client: httpx.AsyncClient, etf_infos: list[dict]) -> dict[str, dict]:
-        """用 AI 批量分类 ETF 到板块"""
+    async def _ai_enrich_etfs(self, etf_infos: list[dict], sectors: Optional[list[str]] = None) -> dict[str, dict]:
+        """用 AI 批量富化 ETF：一次调用同时给出板块分类、相关板块、描述和别名"""
         if not etf_infos:
             return {}
 
-        # 构建 ETF 信息列表
-        etf_list = "\n".join([
-            f"- {info['code']} {info.get('name','')}: {info.get('scope','')[:150]}"
-            for info in etf_infos
-        ])
+        etf_list = "\n".join(_etf_prompt_line(info) for info in etf_infos)
+        if sectors:
+            rules = (
+                f"1. 只能从以下板块中选择（related 同样）：{'、'.join(sectors)}\n"
+                f"2. 无法归入以上板块的（含宽基、债券、货币、跨境）标记为\"其他\""
+            )
+            fallback = "其他"
+        else:
+            rules, fallback = OPEN_CLASSIFY_RULES, "排除"
 
-        prompt = f"""对以下ETF进行行业板块分类。
+        prompt = f"""对以下ETF进行行业板块分类，并生成描述和板块别名。
 
 ## ETF列表
 {etf_list}
 
 ## 分类规则
-1. 只分类到A股行业板块，如：黄金、有色、芯片、AI、医药、证券、银行、军工、光伏、新能源车、锂电池、白酒、消费、农业、煤炭、钢铁、石油、化工、电力、机器人、通信、游戏、传媒、房地产、家电、环保、港股、互联网
-2. 相似板块统一名称：券商→证券，医疗→医药，贵金属→黄金，半导体→芯片，人工智能→AI，恒生科技→港股
-3. 以下类型标记为"排除"，不归入任何行业板块：
-   - 宽基指数：沪深300、中证500、中证1000、上证50、创业板、科创板、A500
-   - 债券类：国债、信用债、科创债、城投债、地方债、可转债
-   - 货币/策略：货币基金、红利、策略、期货
-   - 跨境：纳斯达克、标普、日经、巴西、沙特、海外、中概
+{rules}
+
+## 描述和别名
+- desc: 20-30字，突出投资标的和风险特征，不要重复名称
+- tags: 3-5个板块别名（如芯片ETF: ["芯片", "半导体", "集成电路", "IC", "晶圆"]）
 
 ## 输出JSON
 ```json
 {{
-  "分类结果": {{
-    "ETF代码": {{"sector": "行业板块或排除", "related": ["相关板块"]}},
-    ...
-  }},
-  "板块列表": ["黄金", "有色", ...]
+  "ETF代码": {{"sector": "行业板块或{fallback}", "related": ["相关板块"], "desc": "描述", "tags": ["别名1", "别名2"]}},
+  ...
 }}
-```
+```"""
+
+        # 接口错误（鉴权、余额、网络）直接抛出，只有输出解析失败才返回空结果
+        ai_client = AIClient()
+        text = await ai_client.send(AIRequest(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=4096,
+            timeout=120,
+            purpose="etf_enrich",
+        ))
+        try:
+            data = parse_json_with_repair(text)
+            return {code: info for code, info in data.items() if isinstance(info, dict)}
+        except Exception as e:
+            logger.warning(f"AI富化ETF输出解析失败（{len(etf_infos)}个）: {e}")
+            return {}
+
+    async def enrich_etfs(self, etf_infos: list[dict], sectors: Optional[list[str]] = None) -> dict[str, dict]:
+        """按提示词长度分批并发富化 ETF，返回 {代码: {sector, related, desc, tags}}
+
+        sectors 给定时只能分类到这些板块（无法归类的为"其他"），否则按开放规则分类（不适合的为"排除"）。
+        """
+        batches = plan_batches(etf_infos)
+        logger.info(f"AI分类+精炼（{len(etf_infos)}个，{len(batches)}批）...")
+        result: dict[str, dict] = {}
+        for enriched in await asyncio.gather(*(self._enrich_etfs(b, sectors) for b in batches)):
+            result.update(enriched)
+        if len(result) < len(etf_infos):
+            logger.warning(f"{len(etf_infos) - len(result)} 个ETF未能分类")
+        return result
 
-注意：板块列表只包含有效的行业板块，不包含"排除"。"""
+    async def _enrich_etfs(self, etf_infos: list[dict], sectors: Optional[list[str]] = None) -> dict[str, dict]:
+        """富化一批 ETF；输出整批无法解析时对半拆开重试，漏掉的 ETF 单独成批重试，直到单个 ETF 为止
 
+        接口调用本身失败（鉴权、余额不足、网络）时拆批也无济于事，这一批直接放弃不再重试。
+        """
+        codes = {info["code"] for info in etf_infos}
         try:
-            ai_client = AIClient()
-            text = await ai_client.send(AIRequest(
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4096,
-                timeout=120,
-            ))
-            return parse_json_with_repair(text)
+            enriched = await self._ai_enrich_etfs(etf_infos, sectors)
         except Exception as e:
-            logger.warning(f"AI分类ETF失败: {e}")
+            logger.warning(f"AI富化ETF失败（{len(etf_infos)}个）: {e}")
+            metrics.inc("etf_enrich_errors")
             return {}
+        result = {c: v for c, v in enriched.items() if c in codes}
+        missing = [info for info in etf_infos if info["code"] not in result]
+        if not missing or len(etf_infos) == 1:
+            return result
+
+        if len(missing) == len(etf_infos):
+            mid = len(missing) // 2
+            parts = [missing[:mid], missing[mid:]]
+        else:
+            parts = [missing]
+        metrics.inc("etf_enrich_retries", len(parts))
+        logger.info(f"ETF富化缺失 {len(missing)}/{len(etf_infos)} 个，拆成 {[len(p) for p in parts]} 重试")
+        for retried in await asyncio.gather(*(self._enrich_etfs(p, sectors) for p in parts)):
+            result.update(retried)
+        return result
 
     async def get_sector_etf_map(self) -> dict[str, list[tuple[str, str]]]:
         """读取板块->ETF映射（从 etf_master.json）"""
         now = time.time()
         if self._etf_list_cache and now - self._etf_cache_time < self._etf_cache_ttl:
+            metrics.inc("cache_hits", cache="sector_etf_map")
             return self._etf_list_cache
 
         from pathlib import Path
@@ -343,60 +417,54 @@ class FundService:
                 "change_20d": 0,
                 "kline": [],
                 "desc": "",
+                "tags": [],  # AI 填充，板块别名索引用
             }
 
         # Step 3: 获取详细信息
         logger.info(f"获取 {len(result_etfs)} 个ETF详情...")
-        async with httpx.AsyncClient(headers=self.headers, timeout=30) as client:
-            sem = asyncio.Semaphore(5)
-
-            # 获取基金详情
-            async def fetch_info(code):
-                async with sem:
-                    info = await self._fetch_etf_raw_info(client, code)
-                    info["code"] = code
-                    info["name"] = result_etfs[code]["name"]
-                    return info
-
-            tasks = [fetch_info(code) for code in result_etfs.keys()]
-            raw_infos = await asyncio.gather(*tasks, return_exceptions=True)
-            raw_infos = [r for r in raw_infos if isinstance(r, dict) and r.get("code")]
-
-            # Step 4: AI 批量分类 + 精炼描述
-            logger.info(f"AI分类+精炼（{len(raw_infos)}个）...")
-            all_sectors = set()
-            for i in range(0, len(raw_infos), 30):
-                batch = raw_infos[i:i+30]
-                # AI 分类
-                classify_result = await self._ai_classify_etfs(client, batch)
-                classifications = classify_result.get("分类结果", {})
-                batch_sectors = classify_result.get("板块列表", [])
-                all_sectors.update(batch_sectors)
-
-                for code, info in classifications.items():
-                    if code in result_etfs:
-                        sector = info.get("sector", "其他")
-                        # "排除"类归入"其他"
-                        if sector == "排除":
-                            sector = "其他"
-                        result_etfs[code]["sector"] = sector
-                        result_etfs[code]["related"] = info.get("related", [])
-
-                # AI 精炼描述
-                descs = await self._summarize_etf_desc(client, batch)
-                for code, desc in descs.items():
-                    if code in result_etfs:
-                        result_etfs[code]["desc"] = desc
-
-            # Step 5: 获取K线数据
-            logger.info("获取K线数据...")
-            for code in result_etfs.keys():
-                secid = f"1.{code}" if code.startswith("5") else f"0.{code}"
-                kline_data = await self._get_kline_changes(client, secid)
-                if kline_data:
-                    result_etfs[code]["change_5d"] = kline_data.get("change_5d", 0)
-                    result_etfs[code]["change_20d"] = kline_data.get("change_20d", 0)
-                    result_etfs[code]["kline"] = kline_data.get("kline", [])
+        client = self.http
+
+        # 获取基金详情（并发和速率由 HostPool 按主机调度）
+        async def fetch_info(code):
+            info = await self._fetch_etf_raw_info(client, code)
+            info["code"] = code
+            info["name"] = result_etfs[code]["name"]
+            return info
+
+        tasks = [fetch_info(code) for code in result_etfs.keys()]
+        raw_infos = await asyncio.gather(*tasks, return_exceptions=True)
+        raw_infos = [r for r in raw_infos if isinstance(r, dict) and r.get("code")]
+
+        # Step 4: AI 批量富化（分类+描述+别名一次完成；按输入长度分批，各批并发，并发数和速率由 AIClient 统一控制）
+        enriched = await self.enrich_etfs(raw_infos)
+        for code, info in enriched.items():
+            if code not in result_etfs:
+                continue
+            sector = info.get("sector") or "其他"
+            # "排除"类归入"其他"
+            if sector == "排除":
+                sector = "其他"
+            etf = result_etfs[code]
+            etf["sector"] = sector
+            etf["related"] = [r for r in info.get("related") or [] if isinstance(r, str)]
+            etf["desc"] = info.get("desc", "")
+            etf["tags"] = [t for t in info.get("tags") or [] if isinstance(t, str)]
+
+        # Step 5: 获取K线数据（并发发出，速率和在途数由 HostScheduler 按主机控制）
+        logger.info("获取K线数据...")
+        codes = list(result_etfs.keys())
+        klines = await asyncio.gather(
+            *(self._get_kline_changes(f"1.{code}" if code.startswith("5") else f"0.{code}") for code in codes),
+            return_exceptions=True,
+        )
+        for code, kline_data in zip(codes, klines):
+            if isinstance(kline_data, BaseException):
+                logger.warning(f"获取K线失败 {code}: {kline_data}")
+                continue
+            if kline_data:
+                result_etfs[code]["change_5d"] = kline_data.get("change_5d", 0)
+                result_etfs[code]["change_20d"] = kline_data.get("change_20d", 0)
+                result_etfs[code]["kline"] = kline_data.get("kline", [])
 
         # Step 6: 构建板块索引
         result_sectors = {}
@@ -472,35 +540,35 @@ class FundService:
             else:
                 secid = f"0.{code}"
 
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                # 获取实时行情
-                resp = await client.get(
-                    "https://push2.eastmoney.com/api/qt/stock/get",
-                    params={
-                        "secid": secid,
-                        "fields": "f43,f44,f45,f46,f47,f48,f50,f57,f58,f60,f170,f171",
-                    },
-                )
-                data = resp.json().get("data", {})
-                if not data:
-                    return None
+            client = self.http
+            # 获取实时行情
+            resp = await client.get(
+                "https://push2.eastmoney.com/api/qt/stock/get",
+                params={
+                    "secid": secid,
+                    "fields": "f43,f44,f45,f46,f47,f48,f50,f57,f58,f60,f170,f171",
+                },
+            )
+            data = resp.json().get("data", {})
+            if not data:
+                return None
 
-                # 获取近5日K线计算涨跌幅
-                kline_resp = await client.get(
-                    "https://push2his.eastmoney.com/api/qt/stock/kline/get",
-                    params={
-                        "secid": secid,
-                        "fields1": "f1,f2,f3",
-                        "fields2": "f51,f52,f53,f54,f55,f56",
-                        "klt": "101",
-                        "fqt": "1",
-                        "end": "20500101",
-                        "lmt": "6",
-                    },
-                )
-                klines = kline_resp.json().get("data", {}).get("klines", [])
+            # 获取近5日K线计算涨跌幅
+            kline_resp = await client.get(
+                "https://push2his.eastmoney.com/api/qt/stock/kline/get",
+                params={
+                    "secid": secid,
+                    "fields1": "f1,f2,f3",
+                    "fields2": "f51,f52,f53,f54,f55,f56",
+                    "klt": "101",
+                    "fqt": "1",
+                    "end": "20500101",
+                    "lmt": "6",
+                },
+            )
+            klines = kline_resp.json().get("data", {}).get("klines", [])
 
-                return self._parse_fund_data(data, klines)
+            return self._parse_fund_data(data, klines)
 
         except Exception as e:
             logger.warning(f"获取基金 {code} 数据失败: {e}")
@@ -554,12 +622,12 @@ class FundService:
 
     async def _fetch_batch_with_retry(self, client, secids: list, max_retries: int = 3) -> list:
         """带重试的批量获取，失败时回退到单个查询"""
+        url = "https://push2.eastmoney.com/api/qt/ulist.np/get"
         for attempt in range(max_retries):
             try:
-                if attempt > 0:
-                    await asyncio.sleep(1 * attempt)  # 递增延迟
+                # 重试间隔由主机调度器决定：空响应/空数据会让该主机降速
                 resp = await client.get(
-                    "https://push2.eastmoney.com/api/qt/ulist.np/get",
+                    url,
                     params={
                         "secids": ",".join(secids),
                         "fields": "f12,f14,f2,f3,f6,f8,f62,f184",
@@ -568,14 +636,17 @@ class FundService:
                 text = resp.text
                 if not text or text.strip() == "":
                     logger.warning(f"批量API返回空响应，重试 {attempt + 1}/{max_retries}")
+                    client.penalize(url)
                     continue
                 data = resp.json().get("data", {})
                 diff = data.get("diff", [])
                 if diff:
                     return diff
                 logger.warning(f"批量API返回空数据，重试 {attempt + 1}/{max_retries}")
+                client.penalize(url)
             except Exception as e:
                 logger.warning(f"批量API请求失败: {e}，重试 {attempt + 1}/{max_retries}")
+                client.penalize(url)
 
         # 批量失败，回退到新浪API
         logger.info("东方财富API失败，回退到新浪财经API")
@@ -622,51 +693,10 @@ class FundService:
             logger.warning(f"新浪API也失败: {e}")
             return []
 
-    async def _get_kline_from_sina(self, client, code: str) -> dict:
-        """从新浪获取K线数据"""
-        try:
-            prefix = "sh" if code.startswith("5") else "sz"
-            sina_code = f"{prefix}{code}"
-            # 新浪日K线API
-            resp = await client.get(
-                f"https://money.finance.sina.com.cn/quotes_service/api/json_v2.php/CN_MarketData.getKLineData",
-                params={
-                    "symbol": sina_code,
-                    "scale": "240",  # 日K
-                    "ma": "no",
-                    "datalen": "25",
-                },
-                headers={"Referer": "https://finance.sina.com.cn"},
-            )
-            data = resp.json()
-            if not data or not isinstance(data, list):
-                return {}
-
-            closes = [float(item["close"]) for item in data]
-            if len(closes) < 2:
-                return {}
-
-            today_close = closes[-1]
-            change_5d = 0
-            change_20d = 0
-
-            if len(closes) >= 6:
-                change_5d = round((today_close - closes[-6]) / closes[-6] * 100, 2)
-            if len(closes) >= 21:
-                change_20d = round((today_close - closes[-21]) / closes[-21] * 100, 2)
-
-            kline_data = closes[-90:] if len(closes) >= 90 else closes
-            return {
-                "change_5d": change_5d,
-                "change_20d": change_20d,
-                "kline": kline_data,
-            }
-        except Exception as e:
-            logger.warning(f"新浪K线API失败 {code}: {e}")
-            return {}
-
-    async def _get_kline_dates_from_sina(self, client, code: str) -> list[tuple[str, float]]:
-        """从新浪获取带日期的K线数据"""
+    async def _get_kline_dates_from_sina(
+        self, client, code: str, datalen: int = 200
+    ) -> list[tuple[str, float]]:
+        """从新浪获取带日期的K线数据（最近 datalen 根）"""
         try:
             prefix = "sh" if code.startswith("5") else "sz"
             sina_code = f"{prefix}{code}"
@@ -676,7 +706,7 @@ class FundService:
                     "symbol": sina_code,
                     "scale": "240",
                     "ma": "no",
-                    "datalen": "200",
+                    "datalen": str(datalen),
                 },
                 headers={"Referer": "https://finance.sina.com.cn"},
             )
@@ -694,6 +724,49 @@ class FundService:
             logger.warning(f"新浪K线(含日期)失败 {code}: {e}")
             return []
 
+    async def _fetch_kline_dates(
+        self, secid: str, *, limit: int, beg: str | None = None
+    ) -> list[tuple[str, float]]:
+        """拉取K线 (date, close)：beg 非空时只拉取 beg 之后（含）的K线"""
+        client = self.http
+        params = {
+            "secid": secid,
+            "fields1": "f1,f2,f3",
+            "fields2": "f51,f52,f53",
+            "klt": "101",
+            "fqt": "1",
+            "end": "20500101",
+            "lmt": str(limit),
+        }
+        if beg:
+            params["beg"] = beg.replace("-", "")
+        try:
+            resp = await client.get(
+                "https://push2his.eastmoney.com/api/qt/stock/kline/get",
+                params=params,
+            )
+            klines = (resp.json().get("data") or {}).get("klines", [])
+            if klines:
+                out = []
+                for k in klines:
+                    parts = k.split(",")
+                    if len(parts) >= 3:
+                        out.append((parts[0], float(parts[2])))
+                return out
+        except Exception as e:
+            logger.warning(f"东方财富K线(含日期)失败 {secid}: {e}")
+
+        # 东方财富无数据，尝试新浪（新浪只能按根数取，增量时按自然日估算）
+        code = secid.split(".")[1]
+        datalen = limit
+        if beg:
+            gap = (datetime.now() - datetime.strptime(beg, "%Y-%m-%d")).days
+            datalen = min(limit, max(gap + 1, 5))
+        out = await self._get_kline_dates_from_sina(client, code, datalen)
+        if beg:
+            out = [(d, c) for d, c in out if d >= beg]
+        return out
+
     async def get_kline_date_map(
         self,
         *,
@@ -701,7 +774,11 @@ class FundService:
         secid: str | None = None,
         limit: int = 200,
     ) -> list[tuple[str, float]]:
-        """获取带日期的K线收盘价序列 (date, close)"""
+        """获取带日期的K线收盘价序列 (date, close)
+
+        以本地K线库为准，只拉取本地最新日期之后的增量K线；
+        网络失败时返回本地已有数据。
+        """
         if not secid:
             if not code:
                 return []
@@ -709,54 +786,52 @@ class FundService:
 
         now = time.time()
         if secid in self._kline_date_cache:
-            cached_time, cached_data = self._kline_date_cache[secid]
-            if now - cached_time < self._kline_date_cache_ttl:
-                return cached_data
-
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                resp = await client.get(
-                    "https://push2his.eastmoney.com/api/qt/stock/kline/get",
-                    params={
-                        "secid": secid,
-                        "fields1": "f1,f2,f3",
-                        "fields2": "f51,f52,f53",
-                        "klt": "101",
-                        "fqt": "1",
-                        "end": "20500101",
-                        "lmt": str(limit),
-                    },
-                )
-                klines = resp.json().get("data", {}).get("klines", [])
-                if klines:
-                    out = []
-                    for k in klines:
-                        parts = k.split(",")
-                        if len(parts) >= 3:
-                            out.append((parts[0], float(parts[2])))
-                    self._kline_date_cache[secid] = (now, out)
-                    return out
-
-                # 东方财富无数据，尝试新浪
-                if not code:
-                    code = secid.split(".")[1]
-                out = await self._get_kline_dates_from_sina(client, code)
-                if out:
-                    self._kline_date_cache[secid] = (now, out)
-                return out
-        except Exception as e:
-            logger.warning(f"东方财富K线(含日期)失败 {secid}: {e}")
-            return []
+            cached_time, cached_limit, cached_data = self._kline_date_cache[secid]
+            if now - cached_time < self._kline_date_cache_ttl and cached_limit >= limit:
+                metrics.inc("cache_hits", cache="kline_memory")
+                return cached_data[-limit:]
+
+        beg = self.kline_store.plan(secid, limit)
+        # 本地K线库命中：只需拉增量
+        metrics.inc("cache_hits" if beg else "cache_misses", cache="kline_store")
+        bars = await self._fetch_kline_dates(secid, limit=limit, beg=beg)
+        if beg and bars and not self.kline_store.update(secid, bars):
+            logger.info(f"K线历史价格变动（复权），全量重拉 {secid}")
+            beg = None
+            bars = await self._fetch_kline_dates(secid, limit=limit)
+        if not beg and bars:
+            self.kline_store.replace(secid, bars, depth=limit)
+
+        out = self.kline_store.load(secid)
+        if out:
+            self._kline_date_cache[secid] = (now, limit, out)
+        return out[-limit:]
+
+    async def get_trading_calendar(self) -> TradingCalendar:
+        """交易日历（以沪深300日K的日期为准）"""
+        return TradingCalendar.from_kline(await self.get_kline_date_map(secid="1.000300"))
 
     async def batch_get_funds(self, codes: list[str]) -> dict[str, dict]:
         """批量获取基金信息（实时行情+多周期涨跌幅）"""
         if not codes:
             return {}
 
+        now = time.time()
+        cached = {}
+        for code in codes:
+            hit = self._quote_cache.get(code)
+            if hit and now - hit[0] < self._quote_cache_ttl:
+                cached[code] = hit[1]
+        if cached:
+            metrics.inc("cache_hits", len(cached), cache="quote")
+        missing = [code for code in codes if code not in cached]
+        if not missing:
+            return cached
+
         # 构建 secids: 5开头上海(1.)，其他深圳(0.)
         secids = []
         code_to_secid = {}
-        for code in codes:
+        for code in missing:
             if code.startswith("5"):
                 secid = f"1.{code}"
             else:
@@ -765,90 +840,62 @@ class FundService:
             code_to_secid[code] = secid
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-                # 1. 批量获取实时行情（含资金流向），带重试
-                diff = await self._fetch_batch_with_retry(client, secids)
-
-                result = {}
-                for item in diff:
-                    code = item.get("f12", "")
-                    if code:
-                        # f62: 主力净流入（元），f184: 主力净占比（需/100）
-                        flow = item.get("f62", 0) or 0
-                        flow_yi = round(flow / 100000000, 2)
-                        flow_pct = round((item.get("f184", 0) or 0) / 100, 2)
-                        turnover = round((item.get("f8", 0) or 0) / 100, 2)
-                        result[code] = {
-                            "code": code,
-                            "name": item.get("f14", ""),
-                            "price": round(item.get("f2", 0) / 1000, 3),
-                            "change_pct": round(item.get("f3", 0) / 100, 2),
-                            "change_5d": 0,
-                            "change_20d": 0,
-                            "amount_yi": round(item.get("f6", 0) / 100000000, 2),
-                            "flow_yi": flow_yi,  # 主力净流入（亿）
-                            "flow_pct": flow_pct,  # 主力净占比%
-                            "turnover": turnover,  # 换手率%
-                        }
-
-                return result
+            client = self.http
+            # 1. 批量获取实时行情（含资金流向），带重试
+            diff = await self._fetch_batch_with_retry(client, secids)
+
+            result = {}
+            for item in diff:
+                code = item.get("f12", "")
+                if code:
+                    # f62: 主力净流入（元），f184: 主力净占比（需/100）
+                    flow = item.get("f62", 0) or 0
+                    flow_yi = round(flow / 100000000, 2)
+                    flow_pct = round((item.get("f184", 0) or 0) / 100, 2)
+                    turnover = round((item.get("f8", 0) or 0) / 100, 2)
+                    result[code] = {
+                        "code": code,
+                        "name": item.get("f14", ""),
+                        "price": round(item.get("f2", 0) / 1000, 3),
+                        "change_pct": round(item.get("f3", 0) / 100, 2),
+                        "change_5d": 0,
+                        "change_20d": 0,
+                        "amount_yi": round(item.get("f6", 0) / 100000000, 2),
+                        "flow_yi": flow_yi,  # 主力净流入（亿）
+                        "flow_pct": flow_pct,  # 主力净占比%
+                        "turnover": turnover,  # 换手率%
+                    }
+                    self._quote_cache[code] = (now, result[code])
+
+            return {**cached, **result}
         except Exception as e:
             logger.warning(f"批量获取基金数据失败: {e}")
-            return {}
+            return cached
 
-    async def _get_kline_changes(self, client, secid: str) -> dict:
-        """获取K线计算5日和20日涨跌幅，返回近20日收盘价（带缓存）"""
+    async def _get_kline_changes(self, secid: str) -> dict:
+        """获取K线计算5日和20日涨跌幅，返回近90日收盘价（本地K线库增量更新）"""
         if not secid:
             return {}
-        # 检查缓存
-        now = time.time()
-        if secid in self._kline_cache:
-            cached_time, cached_data = self._kline_cache[secid]
-            if now - cached_time < self._cache_ttl:
-                return cached_data
-        try:
-            resp = await client.get(
-                "https://push2his.eastmoney.com/api/qt/stock/kline/get",
-                params={
-                    "secid": secid,
-                    "fields1": "f1,f2,f3",
-                    "fields2": "f51,f52,f53,f54,f55,f56",
-                    "klt": "101",
-                    "fqt": "1",
-                    "end": "20500101",
-                    "lmt": "95",
-                },
-            )
-            klines = resp.json().get("data", {}).get("klines", [])
-            if not klines:
-                # 东方财富无数据，尝试新浪 API
-                code = secid.split(".")[1]
-                return await self._get_kline_from_sina(client, code)
-
-            closes = [float(k.split(",")[2]) for k in klines]
-            today_close = closes[-1]
-            change_5d = 0
-            change_20d = 0
-
-            if len(closes) >= 6:
-                change_5d = round((today_close - closes[-6]) / closes[-6] * 100, 2)
-            if len(closes) >= 21:
-                change_20d = round((today_close - closes[-21]) / closes[-21] * 100, 2)
-
-            kline_data = closes[-90:] if len(closes) >= 90 else closes
-            result = {
-                "change_5d": change_5d,
-                "change_20d": change_20d,
-                "kline": kline_data,
-            }
-            self._kline_cache[secid] = (now, result)
-            return result
-        except Exception as e:
-            logger.warning(f"东方财富K线失败 {secid}: {e}")
-            # 尝试新浪 API 作为备用
-            code = secid.split(".")[1]
-            return await self._get_kline_from_sina(client, code)
+        kline = await self.get_kline_date_map(secid=secid, limit=95)
+        closes = [c for _, c in kline]
+        if len(closes) < 2:
+            return {}
+
+        today_close = closes[-1]
+        change_5d = 0
+        change_20d = 0
+
+        if len(closes) >= 6:
+            change_5d = round((today_close - closes[-6]) / closes[-6] * 100, 2)
+        if len(closes) >= 21:
+            change_20d = round((today_close - closes[-21]) / closes[-21] * 100, 2)
 
+        kline_data = closes[-90:] if len(closes) >= 90 else closes
+        return {
+            "change_5d": change_5d,
+            "change_20d": change_20d,
+            "kline": kline_data,
+        }
 
     async def get_hot_etfs(self, limit: int = 10) -> list[dict]:
         """获取热门 ETF（从动态映射中获取，按成交额排序）"""
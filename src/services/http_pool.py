@@ -0,0 +1,118 @@
+"""共享 HTTP 连接池 - 按主机复用长连接，避免每次请求重新握手"""
+
+import importlib.util
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.metrics import metrics
+from src.services.rate_limiter import HostScheduler
+
+# 安装了 h2 时启用 HTTP/2（由 ALPN 协商，服务端不支持时自动回退 HTTP/1.1）
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HostLimits:
+    """单个主机的连接池参数"""
+    max_connections: int = 5  # 连接数上限（在途请求数由 HostScheduler 控制）
+    max_keepalive: int = 5  # 空闲长连接保留数
+    keepalive_expiry: float = 30.0  # 空闲长连接保留秒数
+
+
+# 各行情主机的连接池参数（未列出的主机使用默认值）
+HOST_LIMITS: dict[str, HostLimits] = {
+    "push2.eastmoney.com": HostLimits(max_connections=5),
+    "push2his.eastmoney.com": HostLimits(max_connections=5),
+    "fundf10.eastmoney.com": HostLimits(max_connections=5),
+    "hq.sinajs.cn": HostLimits(max_connections=3),
+    "money.finance.sina.com.cn": HostLimits(max_connections=3),
+    "vip.stock.finance.sina.com.cn": HostLimits(max_connections=2),
+}
+
+
+class HostPool:
+    """按主机划分的长连接池
+
+    每个主机一个 httpx.AsyncClient（独立的连接上限和 keep-alive 设置），
+    对外提供与 AsyncClient 相同的 get/post 接口，调用方无需关心路由。
+    每个请求先经 HostScheduler 取令牌和并发位，429/5xx 和传输错误（超时、连接失败）自动降速。
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict] = None,
+        timeout: float = 15.0,
+        host_limits: Optional[dict[str, HostLimits]] = None,
+        scheduler: Optional[HostScheduler] = None,
+    ):
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.host_limits = host_limits if host_limits is not None else HOST_LIMITS
+        self.scheduler = scheduler or HostScheduler()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _limits_for(self, host: str) -> HostLimits:
+        return self.host_limits.get(host, HostLimits())
+
+    def client_for(self, host: str) -> httpx.AsyncClient:
+        """获取（或创建）主机对应的客户端"""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            limits = self._limits_for(host)
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=limits.max_connections,
+                    max_keepalive_connections=limits.max_keepalive,
+                    keepalive_expiry=limits.keepalive_expiry,
+                ),
+            )
+            self._clients[host] = client
+        return client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求（按主机限速、限制并发）"""
+        host = urlsplit(url).hostname or ""
+        client = self.client_for(host)
+        async with self.scheduler.slot(host):
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                # 超时、连接被拒、连接被重置也是被限流时的常见表现
+                metrics.inc("http_throttled", host=host)
+                self.scheduler.penalize(host)
+                raise
+            metrics.record_response(host, resp.status_code, len(resp.content), time.perf_counter() - start)
+        if resp.status_code == 429 or resp.status_code >= 500:
+            metrics.inc("http_throttled", host=host)
+            self.scheduler.penalize(host)
+        else:
+            self.scheduler.reward(host)
+        return resp
+
+    def penalize(self, url: str):
+        """调用方判断响应无效（如返回空数据）时，对该主机降速"""
+        metrics.inc("http_throttled", host=urlsplit(url).hostname or "")
+        self.scheduler.penalize(urlsplit(url).hostname or "")
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """关闭所有连接（之后再次请求会重新建立）"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self.scheduler.reset()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
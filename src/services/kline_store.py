@@ -0,0 +1,113 @@
+"""本地 K 线库 - 按 secid 持久化日K收盘价，只增量拉取新K线
+
+存储在 data/archive/kline/ 下，每个 secid 一个列式 JSON 文件：
+    {"secid": "1.518880", "depth": 200, "dates": [...], "closes": [...]}
+
+随归档目录一起同步到 R2，跨 GitHub Actions 运行保留。
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+KLINE_DIR = Path(__file__).parent.parent / "data" / "archive" / "kline"
+
+# 单个 secid 最多保留的K线根数（约两年）
+MAX_BARS = 500
+
+
+class KlineStore:
+    """本地K线库
+
+    depth 记录最近一次全量拉取的根数：请求的 limit 不超过 depth 时，
+    只需从倒数第二根K线开始增量拉取。倒数第二根是已收盘的K线，用来校验
+    前复权价格是否整体变动（分红除权后历史价会被重算），变动则需全量重拉；
+    最后一根可能是盘中价，直接用新数据覆盖。
+    """
+
+    def __init__(self, root: Path = KLINE_DIR, max_bars: int = MAX_BARS):
+        self.root = root
+        self.max_bars = max_bars
+        self._mem: dict[str, dict] = {}
+
+    def _path(self, secid: str) -> Path:
+        return self.root / f"{secid}.json"
+
+    def _read(self, secid: str) -> Optional[dict]:
+        if secid in self._mem:
+            return self._mem[secid]
+        path = self._path(secid)
+        data = None
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if len(data.get("dates", [])) != len(data.get("closes", [])):
+                    data = None
+            except Exception as e:
+                logger.warning(f"读取本地K线失败 {secid}: {e}")
+                data = None
+        self._mem[secid] = data
+        return data
+
+    def _write(self, secid: str, data: dict):
+        data["dates"] = data["dates"][-self.max_bars:]
+        data["closes"] = data["closes"][-self.max_bars:]
+        self._mem[secid] = data
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(secid)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        tmp.replace(path)
+
+    def load(self, secid: str) -> list[tuple[str, float]]:
+        """读取本地K线 [(date, close), ...]"""
+        data = self._read(secid)
+        if not data:
+            return []
+        return list(zip(data["dates"], data["closes"]))
+
+    def plan(self, secid: str, limit: int) -> Optional[str]:
+        """返回增量拉取的起始日期；None 表示需要全量拉取"""
+        data = self._read(secid)
+        if not data or data.get("depth", 0) < limit or len(data["dates"]) < 2:
+            return None
+        return data["dates"][-2]
+
+    def replace(self, secid: str, bars: list[tuple[str, float]], depth: int):
+        """全量写入"""
+        if not bars:
+            return
+        self._write(secid, {
+            "secid": secid,
+            "depth": depth,
+            "dates": [d for d, _ in bars],
+            "closes": [c for _, c in bars],
+        })
+
+    def update(self, secid: str, bars: list[tuple[str, float]]) -> bool:
+        """增量写入，复权导致历史价格变动时返回 False（调用方应全量重拉）"""
+        data = self._read(secid)
+        if not data:
+            return False
+        if not bars:
+            return True
+
+        dates, closes = data["dates"], data["closes"]
+        first_date, first_close = bars[0]
+        if first_date in dates[:-1]:
+            stored = closes[dates.index(first_date)]
+            if abs(stored - first_close) > max(abs(stored), 1.0) * 1e-6:
+                return False
+        elif first_date < dates[-1]:
+            # 增量数据与本地对不上（本地缺这一天），不做拼接
+            return False
+
+        keep = 0
+        while keep < len(dates) and dates[keep] < first_date:
+            keep += 1
+        data["dates"] = dates[:keep] + [d for d, _ in bars]
+        data["closes"] = closes[:keep] + [c for _, c in bars]
+        self._write(secid, data)
+        return True
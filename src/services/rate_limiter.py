@@ -0,0 +1,199 @@
+"""按主机的令牌桶调度器 - 统一控制各行情接口的请求速率、突发和并发
+
+每个主机（按 HOST_KEYS 归类）一个令牌桶：
+- rate/burst 控制平均速率和突发量，concurrency 控制在途请求数
+- 返回 429/5xx 或空数据时调用 penalize() 降速（乘性减），成功时 reward() 缓慢恢复（加性增）
+- stats() 给出各主机的排队深度、在途数、限速次数，便于对比不同配置的吞吐
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """单个主机的限速策略"""
+    rate: float = 5.0  # 每秒请求数
+    burst: int = 5  # 令牌桶容量
+    concurrency: int = 5  # 在途请求上限
+    min_rate: float = 0.5  # 降速下限
+
+
+# 主机 → 调度键（同一服务商的多个域名可共用一个桶）
+HOST_KEYS: dict[str, str] = {
+    "push2.eastmoney.com": "eastmoney_push2",
+    "push2his.eastmoney.com": "eastmoney_push2his",
+    "fundf10.eastmoney.com": "eastmoney_fundf10",
+    "hq.sinajs.cn": "sina_hq",
+    "money.finance.sina.com.cn": "sina_kline",
+    "vip.stock.finance.sina.com.cn": "sina_list",
+}
+
+DEFAULT_POLICIES: dict[str, HostPolicy] = {
+    "eastmoney_push2": HostPolicy(rate=10, burst=10, concurrency=5),
+    "eastmoney_push2his": HostPolicy(rate=8, burst=8, concurrency=5),
+    "eastmoney_fundf10": HostPolicy(rate=5, burst=5, concurrency=5),
+    "sina_hq": HostPolicy(rate=5, burst=5, concurrency=3),
+    "sina_kline": HostPolicy(rate=3, burst=5, concurrency=2),
+    "sina_list": HostPolicy(rate=2, burst=2, concurrency=1),
+    "default": HostPolicy(),
+}
+
+
+def parse_policies(spec: str) -> dict[str, HostPolicy]:
+    """解析限速配置覆盖，格式：key=rate:burst[:concurrency],...
+
+    例如 "sina_kline=2:4:1,eastmoney_push2his=12:12"
+    """
+    policies: dict[str, HostPolicy] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        key, values = part.split("=", 1)
+        try:
+            nums = [float(v) for v in values.split(":")]
+            base = DEFAULT_POLICIES.get(key.strip(), HostPolicy())
+            policies[key.strip()] = HostPolicy(
+                rate=nums[0],
+                burst=int(nums[1]) if len(nums) > 1 else base.burst,
+                concurrency=int(nums[2]) if len(nums) > 2 else base.concurrency,
+                min_rate=min(base.min_rate, nums[0]),
+            )
+        except (ValueError, IndexError):
+            logger.warning(f"忽略无效的限速配置: {part}")
+    return policies
+
+
+@dataclass
+class BucketStats:
+    requests: int = 0  # 已放行请求数
+    throttled: int = 0  # 需要等待令牌的次数
+    backoffs: int = 0  # 降速次数
+    wait_seconds: float = 0.0  # 累计等待令牌时间
+    max_queue_depth: int = 0
+
+
+class TokenBucket:
+    """令牌桶 + 并发上限 + 自适应降速"""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.rate = policy.rate
+        self.tokens = float(policy.burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.in_flight = 0
+        self.stats = BucketStats()
+        self._lock = asyncio.Lock()
+        self._sem = asyncio.Semaphore(policy.concurrency)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.policy.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def _take_token(self):
+        async with self._lock:  # 排队按先后取令牌
+            self._refill()
+            if self.tokens < 1:
+                self.stats.throttled += 1
+            while self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                self.stats.wait_seconds += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            self.stats.requests += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """取得一个令牌和一个并发位"""
+        self.waiting += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.waiting)
+        try:
+            await self._sem.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._sem.release()
+                raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield self
+        finally:
+            self.in_flight -= 1
+            self._sem.release()
+
+    def penalize(self):
+        """被限流/返回空数据：速率减半并清空令牌"""
+        self.rate = max(self.policy.min_rate, self.rate * 0.5)
+        self.tokens = min(self.tokens, 0.0)
+        self.stats.backoffs += 1
+
+    def reward(self):
+        """请求成功：逐步恢复到配置速率"""
+        if self.rate < self.policy.rate:
+            self.rate = min(self.policy.rate, self.rate + self.policy.rate * 0.1)
+
+
+class HostScheduler:
+    """按主机分桶的请求调度器"""
+
+    def __init__(
+        self,
+        policies: Optional[dict[str, HostPolicy]] = None,
+        host_keys: Optional[dict[str, str]] = None,
+    ):
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.host_keys = host_keys if host_keys is not None else HOST_KEYS
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def key_for(self, host: str) -> str:
+        return self.host_keys.get(host, host)
+
+    def bucket(self, host: str) -> TokenBucket:
+        key = self.key_for(host)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            policy = self.policies.get(key, self.policies["default"])
+            bucket = self._buckets[key] = TokenBucket(policy)
+        return bucket
+
+    def slot(self, host: str):
+        return self.bucket(host).slot()
+
+    def penalize(self, host: str):
+        bucket = self.bucket(host)
+        bucket.penalize()
+        logger.debug(f"{self.key_for(host)} 降速至 {bucket.rate:.2f} req/s")
+
+    def reward(self, host: str):
+        self.bucket(host).reward()
+
+    def stats(self) -> dict[str, dict]:
+        """各主机的速率与排队指标"""
+        return {
+            key: {
+                "rate": round(b.rate, 2),
+                "queue_depth": b.waiting,
+                "in_flight": b.in_flight,
+                "max_queue_depth": b.stats.max_queue_depth,
+                "requests": b.stats.requests,
+                "throttled": b.stats.throttled,
+                "backoffs": b.stats.backoffs,
+                "wait_seconds": round(b.stats.wait_seconds, 2),
+            }
+            for key, b in self._buckets.items()
+        }
+
+    def reset(self):
+        """丢弃所有桶（事件循环结束后调用，下次按配置重新创建）"""
+        self._buckets.clear()
@@ -0,0 +1,112 @@
+"""信号复盘计算 - 用 NumPy 一次性对齐所有信号并计算各周期收益"""
+
+import numpy as np
+
+from src.services.trading_calendar import TradingCalendar, to_ordinal, to_ordinals
+
+# 复合键步长：code 序号 * 步长 + 日期序数，保证各 code 的区段互不重叠
+_KEY_STRIDE = 1 << 20
+
+
+def _empty_stats() -> dict:
+    return {"count": 0, "win_rate": 0, "avg_return": 0, "avg_excess": 0}
+
+
+def compute_review(
+    signals: list[dict],
+    code_to_kline: dict[str, list[tuple[str, float]]],
+    benchmark_kline: list[tuple[str, float]],
+    horizons: list[int],
+    calendar: TradingCalendar | None = None,
+) -> dict[str, dict]:
+    """计算各持有周期的胜率/平均收益/平均超额
+
+    入场日取不早于信号日期的第一个交易日，持有 h 个交易日后退出。
+    所有 ETF 的K线拼成一条按 (code, 日期) 排序的序列，信号入场日只需
+    一次 searchsorted 即可定位，收益在 (信号 × 周期) 矩阵上整体计算。
+    基准按交易日历对齐（calendar 须由 benchmark_kline 构建，缺省时现场构建）。
+
+    Returns:
+        {"1": {"count", "win_rate", "avg_return", "avg_excess"}, ...}
+    """
+    summary = {str(h): _empty_stats() for h in horizons}
+
+    # 1. 拼接所有 ETF 的K线
+    code_index: dict[str, int] = {}
+    key_parts, close_parts, seg_ends = [], [], []
+    offset = 0
+    for code, kline in code_to_kline.items():
+        if not kline:
+            continue
+        idx = len(code_index)
+        code_index[code] = idx
+        key_parts.append(idx * _KEY_STRIDE + to_ordinals([d for d, _ in kline]))
+        close_parts.append(np.array([c for _, c in kline], dtype=np.float64))
+        offset += len(kline)
+        seg_ends.append(offset)
+    if not code_index:
+        return summary
+    keys = np.concatenate(key_parts)
+    closes = np.concatenate(close_parts)
+    seg_end = np.array(seg_ends, dtype=np.int64)
+
+    # 2. 有对应K线的信号（日期无法解析的跳过）
+    sig_codes, sig_days = [], []
+    for s in signals:
+        code = s.get("etf_code")
+        date = s.get("date")
+        day = to_ordinal(date) if isinstance(date, str) else None
+        if code in code_index and day is not None:
+            sig_codes.append(code_index[code])
+            sig_days.append(day)
+    if not sig_codes:
+        return summary
+    sig_code = np.array(sig_codes, dtype=np.int64)
+    sig_day = np.array(sig_days, dtype=np.int64)
+
+    # 3. 一次 searchsorted 定位入场K线，广播出各周期的退出K线
+    h = np.array(horizons, dtype=np.int64)
+    end = seg_end[sig_code]
+    entry_pos = np.searchsorted(keys, sig_code * _KEY_STRIDE + sig_day, side="left")
+    exit_pos = entry_pos[:, None] + h[None, :]
+    valid = (entry_pos < end)[:, None] & (exit_pos < end[:, None])
+
+    last = len(closes) - 1
+    entry = closes[np.minimum(entry_pos, last)][:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = (closes[np.minimum(exit_pos, last)] - entry) / entry * 100
+
+    # 4. 基准（沪深300）同样对齐
+    bench_valid = np.zeros_like(valid)
+    bench_ret = np.zeros_like(ret)
+    if benchmark_kline:
+        if calendar is None:
+            calendar = TradingCalendar.from_kline(benchmark_kline)
+        bench_closes = np.array([c for _, c in sorted(dict(benchmark_kline).items())], dtype=np.float64)
+        n = len(bench_closes)
+        b_entry = calendar.positions(sig_day)
+        b_exit = b_entry[:, None] + h[None, :]
+        bench_valid = (b_entry < n)[:, None] & (b_exit < n)
+        b_base = bench_closes[np.minimum(b_entry, n - 1)][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bench_ret = (bench_closes[np.minimum(b_exit, n - 1)] - b_base) / b_base * 100
+    excess_valid = valid & bench_valid
+
+    # 5. 按周期汇总
+    counts = valid.sum(axis=0)
+    wins = (valid & (ret > 0)).sum(axis=0)
+    ret_sum = np.where(valid, ret, 0.0).sum(axis=0)
+    excess_counts = excess_valid.sum(axis=0)
+    excess_sum = np.where(excess_valid, ret - bench_ret, 0.0).sum(axis=0)
+
+    for j, hz in enumerate(horizons):
+        count = int(counts[j])
+        if not count:
+            continue
+        summary[str(hz)] = {
+            "count": count,
+            "win_rate": round(float(wins[j]) / count * 100, 1),
+            "avg_return": round(float(ret_sum[j]) / count, 2),
+            "avg_excess": round(float(excess_sum[j]) / int(excess_counts[j]), 2) if excess_counts[j] else 0,
+        }
+    return summary
@@ -0,0 +1,149 @@
+"""板块别名索引 - 在本地把分析出的板块名解析为 etf_master 的标准板块
+
+别名来源（etf_master.json + 学习到的映射）：
+- 标准板块名本身
+- 每个 ETF 的 tags（如 芯片ETF 的 半导体/集成电路）和 related，按所属 sector 投票
+- 以往 AI 映射的结果（data/archive/sector_aliases.json，随归档同步到 R2）
+
+解析顺序：标准板块 → 学习到的映射 → 别名精确匹配 → 子串匹配 → 字符二元组相似度。
+都解析不了的名字才交给 AI，AI 的结果写回学习表，下次直接命中。
+"""
+
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+LEARNED_FILE = Path(__file__).parent.parent / "data" / "archive" / "sector_aliases.json"
+
+# 板块名常见后缀，匹配前去掉
+_SUFFIXES = ("概念股", "产业链", "板块", "概念", "行业", "ETF", "指数")
+
+MAX_SECTORS = 3  # 每个名字最多映射的标准板块数
+KEEP_RATIO = 0.5  # 得分不低于最高分这个比例的板块一并保留
+RELATED_WEIGHT = 0.5  # related 的投票权重（tags 为 1）
+MIN_SIMILARITY = 0.5  # 二元组 Dice 相似度阈值
+
+
+def normalize(name: str) -> str:
+    name = name.strip().replace(" ", "").upper()
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix) + 1:
+            name = name[: -len(suffix)]
+            break
+    return name
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)} if len(text) > 1 else {text}
+
+
+class SectorIndex:
+    """板块名 → 标准板块 的本地索引"""
+
+    def __init__(self, master: dict, learned: Optional[dict[str, list[str]]] = None, learned_file: Optional[Path] = None):
+        self.sectors: list[str] = master.get("sector_list") or list(master.get("sectors", {}))
+        self._sector_set = set(self.sectors)
+        self._by_norm = {normalize(s): s for s in self.sectors}
+        self.learned_file = learned_file
+        self.learned: dict[str, list[str]] = {}
+        for name, targets in (learned or {}).items():
+            valid = [t for t in targets if t in self._sector_set]
+            if valid:
+                self.learned[normalize(name)] = valid
+
+        # 别名 → {标准板块: 票数}
+        votes: dict[str, Counter] = defaultdict(Counter)
+        for sector in self.sectors:
+            votes[normalize(sector)][sector] += 1000  # 标准板块名本身压倒性优先
+        for etf in master.get("etfs", {}).values():
+            sector = etf.get("sector")
+            if sector not in self._sector_set:
+                continue
+            for tag in etf.get("tags") or []:
+                votes[normalize(tag)][sector] += 1
+            for rel in etf.get("related") or []:
+                if rel in self._sector_set:
+                    votes[normalize(rel)][rel] += RELATED_WEIGHT
+        self._votes = dict(votes)
+
+        # 二元组倒排：只对共享二元组的别名计算相似度
+        self._gram_index: dict[str, set[str]] = defaultdict(set)
+        for alias in self._votes:
+            for gram in _bigrams(alias):
+                self._gram_index[gram].add(alias)
+
+    @classmethod
+    def load(cls, master: dict, learned_file: Path = LEARNED_FILE) -> "SectorIndex":
+        learned = {}
+        if learned_file.exists():
+            try:
+                learned = json.loads(learned_file.read_text())
+            except Exception as e:
+                logger.warning(f"读取板块映射学习表失败: {e}")
+        return cls(master, learned, learned_file)
+
+    @staticmethod
+    def _pick(scores: Counter) -> list[str]:
+        if not scores:
+            return []
+        ranked = scores.most_common()
+        top = ranked[0][1]
+        return [s for s, score in ranked if score >= top * KEEP_RATIO][:MAX_SECTORS]
+
+    def _alias_scores(self, alias: str, weight: float = 1.0) -> Counter:
+        votes = self._votes[alias]
+        total = sum(votes.values())
+        return Counter({s: weight * v / total for s, v in votes.items()})
+
+    def resolve(self, name: str) -> tuple[list[str], str]:
+        """返回 (标准板块列表, 命中方式)；解析不了时列表为空、方式为 "none" """
+        key = normalize(name)
+        if key in self._by_norm:
+            return [self._by_norm[key]], "exact"
+        if key in self.learned:
+            return list(self.learned[key]), "learned"
+        if key in self._votes:
+            return self._pick(self._alias_scores(key)), "alias"
+
+        # 子串：名字包含别名或别名包含名字，按重合长度加权
+        scores: Counter = Counter()
+        if len(key) >= 2:
+            for alias in self._votes:
+                if len(alias) >= 2 and (alias in key or key in alias):
+                    overlap = min(len(alias), len(key)) / max(len(alias), len(key))
+                    scores.update(self._alias_scores(alias, overlap))
+        if scores:
+            return self._pick(scores), "substring"
+
+        # 字符二元组 Dice 相似度
+        grams = _bigrams(key)
+        candidates = set().union(*(self._gram_index.get(g, set()) for g in grams))
+        for alias in candidates:
+            other = _bigrams(alias)
+            similarity = 2 * len(grams & other) / (len(grams) + len(other))
+            if similarity >= MIN_SIMILARITY:
+                scores.update(self._alias_scores(alias, similarity))
+        if scores:
+            return self._pick(scores), "ngram"
+        return [], "none"
+
+    def learn(self, mapping: dict[str, list[str]]) -> dict[str, list[str]]:
+        """记录 AI 给出的映射（只保留有效的标准板块），返回过滤后的映射"""
+        accepted = {}
+        for name, targets in mapping.items():
+            valid = [t for t in (targets or []) if t in self._sector_set][:MAX_SECTORS]
+            if valid:
+                self.learned[normalize(name)] = valid
+                accepted[name] = valid
+        return accepted
+
+    def save(self):
+        if self.learned_file is None:
+            return
+        self.learned_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.learned_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.learned, ensure_ascii=False, indent=2, sort_keys=True))
+        tmp.replace(self.learned_file)
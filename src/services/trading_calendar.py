@@ -0,0 +1,62 @@
+"""交易日历 - 以基准指数日K的日期为交易日，日期统一用整数序数，二分查找"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+# date.toordinal() 与 numpy datetime64[D]（1970 年起天数）之间的偏移
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Union[str, date, int]
+
+
+@lru_cache(maxsize=4096)
+def to_ordinal(date_str: str) -> Optional[int]:
+    """'YYYY-MM-DD' → 日期序数（解析失败返回 None，结果缓存）"""
+    try:
+        return date.fromisoformat(date_str[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def to_ordinals(dates: list[str]) -> np.ndarray:
+    """批量转换 'YYYY-MM-DD' → 日期序数（int64 数组）"""
+    return np.array(dates, dtype="datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+def _ord(d: DateLike) -> int:
+    if isinstance(d, int):
+        return d
+    if isinstance(d, date):
+        return d.toordinal()
+    o = to_ordinal(d)
+    if o is None:
+        raise ValueError(f"无效日期: {d}")
+    return o
+
+
+class TradingCalendar:
+    """交易日历
+
+    用基准（沪深300）K线日期构建一次，供信号复盘对齐基准：
+    positions() 对有序序数数组做一次 searchsorted，批量定位不早于各日期的第一个交易日。
+    """
+
+    def __init__(self, dates: Iterable[DateLike]):
+        self._days: list[int] = sorted({_ord(d) for d in dates})
+        self._array: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_kline(cls, kline: list[tuple[str, float]]) -> "TradingCalendar":
+        return cls(d for d, _ in kline)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def positions(self, ordinals: np.ndarray) -> np.ndarray:
+        """批量查询：每个序数对应的不早于它的第一个交易日位置（越界为 len）"""
+        if self._array is None:
+            self._array = np.array(self._days, dtype=np.int64)
+        return np.searchsorted(self._array, ordinals, side="left")
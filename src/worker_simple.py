@@ -2,15 +2,20 @@
 
 import asyncio
 import json
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
 from collections import Counter
 from loguru import logger
 
 from src.config import settings
 from src.collectors import NewsAggregator
+from src.metrics import metrics
 from src.analyzers.realtime import analyze
+from src.services.ai_client import close_ai_client
 from src.services.fund_service import fund_service
+from src.services.review_engine import compute_review
+from src.services.sector_index import SectorIndex
+from src.services.trading_calendar import TradingCalendar, to_ordinal
 
 # 输出目录
 DATA_DIR = Path(__file__).parent / "data"
@@ -25,28 +30,6 @@ ARCHIVE_DIR.mkdir(exist_ok=True)
 REVIEW_FILE = DATA_DIR / "review.json"
 
 
-def _parse_date(date_str: str) -> datetime | None:
-    try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except Exception:
-        return None
-
-
-def _days_between(now: datetime, date_str: str) -> int | None:
-    d = _parse_date(date_str)
-    if not d:
-        return None
-    return (now.replace(tzinfo=None) - d).days
-
-
-def _pick_trading_index(dates: list[str], entry_date: str) -> int | None:
-    """选择不早于 entry_date 的第一个交易日索引"""
-    for i, d in enumerate(dates):
-        if d >= entry_date:
-            return i
-    return None
-
-
 def load_review_data() -> dict:
     if REVIEW_FILE.exists():
         try:
@@ -60,7 +43,7 @@ def save_review_data(data: dict):
     REVIEW_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2))
 
 
-async def update_review(result: dict, beijing_tz) -> dict:
+async def update_review(result: dict, beijing_tz, calendar: TradingCalendar | None = None) -> dict:
     """更新信号复盘数据并返回汇总指标"""
     data = load_review_data()
     signals: list[dict] = data.get("signals", [])
@@ -111,59 +94,17 @@ async def update_review(result: dict, beijing_tz) -> dict:
     }
 
     benchmark_kline = await fund_service.get_kline_date_map(secid="1.000300")
-    bench_dates = [d for d, _ in benchmark_kline]
-    bench_closes = [c for _, c in benchmark_kline]
 
     codes = list({s.get("etf_code") for s in signals if s.get("etf_code")})
     code_to_kline: dict[str, list[tuple[str, float]]] = {}
     if codes:
-        sem = asyncio.Semaphore(5)
-
-        async def fetch_kline(c: str):
-            async with sem:
-                return await fund_service.get_kline_date_map(code=c)
-
-        results = await asyncio.gather(*(fetch_kline(c) for c in codes))
+        # 并发和速率由 fund_service 的主机调度器控制
+        results = await asyncio.gather(*(fund_service.get_kline_date_map(code=c) for c in codes))
         code_to_kline = dict(zip(codes, results))
 
-    for h in horizons:
-        returns = []
-        excess = []
-        for s in signals:
-            entry_date = s.get("date", "")
-            code = s.get("etf_code")
-            kline = code_to_kline.get(code, [])
-            if not kline:
-                continue
-            dates = [d for d, _ in kline]
-            closes = [c for _, c in kline]
-            idx = _pick_trading_index(dates, entry_date)
-            if idx is None:
-                continue
-            exit_idx = idx + h
-            if exit_idx >= len(closes):
-                continue
-            entry = closes[idx]
-            exit_price = closes[exit_idx]
-            ret = (exit_price - entry) / entry * 100
-            returns.append(ret)
-
-            if bench_dates and bench_closes:
-                bidx = _pick_trading_index(bench_dates, entry_date)
-                if bidx is not None and bidx + h < len(bench_closes):
-                    bret = (bench_closes[bidx + h] - bench_closes[bidx]) / bench_closes[bidx] * 100
-                    excess.append(ret - bret)
-        if returns:
-            win_rate = sum(1 for r in returns if r > 0) / len(returns) * 100
-            avg_ret = sum(returns) / len(returns)
-            summary["horizons"][str(h)] = {
-                "count": len(returns),
-                "win_rate": round(win_rate, 1),
-                "avg_return": round(avg_ret, 2),
-                "avg_excess": round(sum(excess) / len(excess), 2) if excess else 0,
-            }
-        else:
-            summary["horizons"][str(h)] = {"count": 0, "win_rate": 0, "avg_return": 0, "avg_excess": 0}
+    if calendar is None:
+        calendar = TradingCalendar.from_kline(benchmark_kline)
+    summary["horizons"] = compute_review(signals, code_to_kline, benchmark_kline, horizons, calendar)
 
     return summary
 
@@ -207,16 +148,15 @@ def cleanup_archives(now: datetime):
     archive_files = sorted(ARCHIVE_DIR.glob("latest_*.json"))
     logger.info(f"📁 归档目录共 {len(archive_files)} 个文件")
 
-    cleaned = 0
+    today = now.date().toordinal()
     for f in archive_files:
         # 解析日期
-        try:
-            date_str = f.stem.replace("latest_", "")
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
+        file_ord = to_ordinal(f.stem.replace("latest_", ""))
+        if file_ord is None:
             continue
+        file_date = date.fromordinal(file_ord)
 
-        days_ago = (now.replace(tzinfo=None) - file_date).days
+        days_ago = today - file_ord
 
         # 7天内：全部保留
         if days_ago <= 7:
@@ -449,6 +389,18 @@ async def save_news(news_items, beijing_tz):
 
 async def run():
     """运行采集和分析"""
+    try:
+        return await _run()
+    finally:
+        await fund_service.aclose()
+        await close_ai_client()
+        try:
+            metrics.write(DATA_DIR / "metrics.json")
+        except Exception as e:
+            logger.warning(f"写入运行指标失败: {e}")
+
+
+async def _run():
     logger.info("=" * 50)
     logger.info("🚀 ETF风向标 - 开始运行")
     logger.info("=" * 50)
@@ -457,7 +409,8 @@ async def run():
     logger.info("=== 第1步: 采集新闻 ===")
     agg = NewsAggregator(include_international=True, include_playwright=True)
     try:
-        news = await agg.collect_all()
+        with metrics.timer("stage_seconds", stage="collect"):
+            news = await agg.collect_all()
         source_stats = dict(Counter(item.source for item in news.items))
         logger.info(f"✅ 采集完成: {len(news.items)} 条新闻")
         for src, cnt in sorted(source_stats.items(), key=lambda x: -x[1]):
@@ -486,21 +439,30 @@ async def run():
         logger.warning("⚠️ etf_master.json 不存在，使用默认板块")
 
     # 读取历史数据用于综合分析
-    history = load_history(days=7)
-    history_context = format_history_context(history)
+    with metrics.timer("stage_seconds", stage="load_history"):
+        history = load_history(days=7)
+        history_context = format_history_context(history)
     if history_context:
         logger.info(f"📜 历史上下文:\n{history_context}")
 
     # AI 分析
     logger.info("=== 第3步: AI 分析 ===")
-    result = await analyze(news.items, sector_list=sector_list, history_context=history_context)
+    prefetcher = EtfPrefetcher(master_data) if sector_list is not None else None
+    with metrics.timer("stage_seconds", stage="ai_analyze"):
+        result = await analyze(
+            news.items,
+            sector_list=sector_list,
+            history_context=history_context,
+            on_sector=prefetcher.add if prefetcher else None,
+        )
 
     # 检查分析结果是否有效
     output_file = DATA_DIR / "latest.json"
     beijing_tz = timezone(timedelta(hours=8))
 
     # 先归档当前数据
-    archive_data(beijing_tz)
+    with metrics.timer("stage_seconds", stage="archive"):
+        archive_data(beijing_tz)
 
     # AI 分析结果无效时，不覆盖文件
     if not result or not result.get("sectors"):
@@ -524,7 +486,8 @@ async def run():
 
     # 为每个板块匹配 ETF
     logger.info("=== 第4步: 匹配 ETF ===")
-    await enrich_sectors_with_etfs(result)
+    with metrics.timer("stage_seconds", stage="enrich_etfs"):
+        await enrich_sectors_with_etfs(result, prefetcher)
 
     # 保存结果
     logger.info("=== 第5步: 保存结果 ===")
@@ -554,10 +517,11 @@ async def ai_map_to_master_sectors(
     """AI 将分析出的板块映射到 master 中的标准板块（可一对多）"""
     from src.services.ai_client import AIClient, AIRequest, parse_json_with_repair
 
+    # 排序后拼接，板块集合不变时提示词不变，可命中 AI 缓存
     prompt = f"""将左边的板块名映射到右边最相关的标准板块。
 
 ## 待映射板块
-{', '.join(ai_sectors)}
+{', '.join(sorted(ai_sectors))}
 
 ## 标准板块列表
 {', '.join(master_sectors)}
@@ -582,6 +546,7 @@ async def ai_map_to_master_sectors(
             messages=[{"role": "user", "content": prompt}],
             max_tokens=1024,
             timeout=60,
+            purpose="sector_map",
         ))
         return parse_json_with_repair(text)
     except Exception as e:
@@ -589,32 +554,85 @@ async def ai_map_to_master_sectors(
         return {}
 
 
-async def enrich_sectors_with_etfs(result: dict):
-    """为每个板块匹配ETF（AI映射板块 + 按成交量取Top3）"""
+class EtfPrefetcher:
+    """流式分析时，每个板块一输出完就用本地索引映射，并在后台预取其 ETF 行情
+
+    预取结果进入 fund_service 的行情缓存，enrich_sectors_with_etfs 等待预取完成后直接命中；
+    本地解析不了的板块留给 enrich 阶段交给 AI。
+    """
+
+    def __init__(self, etf_master: dict):
+        self.index = SectorIndex.load(etf_master)
+        self.sector_index = etf_master.get("sectors", {})
+        self._seen: set[str] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def add(self, sector: dict):
+        name = sector.get("name")
+        if not name or name in self._seen:
+            return
+        self._seen.add(name)
+        targets, _ = self.index.resolve(name)
+        codes = [code for t in targets for code in self.sector_index.get(t, [])]
+        if codes:
+            logger.info(f"⚡ 预取 {name} → {targets}: {len(codes)} 个ETF")
+            metrics.inc("etf_prefetch", len(codes))
+            self._tasks.append(asyncio.create_task(fund_service.batch_get_funds(codes)))
+
+    async def wait(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def load_etf_master() -> dict | None:
+    master_file = Path(__file__).parent.parent / "config" / "etf_master.json"
+    if not master_file.exists():
+        return None
+    return json.loads(master_file.read_text())
+
+
+async def enrich_sectors_with_etfs(result: dict, prefetcher: EtfPrefetcher | None = None):
+    """为每个板块匹配ETF（本地别名索引映射板块，解析不了的交给 AI；按成交量取Top3）"""
     sectors = result.get("sectors", [])
     if not sectors:
         logger.warning("⚠️ 无板块数据，跳过ETF匹配")
         return
 
     # 读取 ETF 主数据
-    master_file = Path(__file__).parent.parent / "config" / "etf_master.json"
-    if not master_file.exists():
+    etf_master = load_etf_master()
+    if etf_master is None:
         logger.warning("⚠️ etf_master.json 不存在")
         return
-    etf_master = json.loads(master_file.read_text())
     master_sectors = etf_master.get("sector_list", [])
     sector_index = etf_master.get("sectors", {})
     etfs_data = etf_master.get("etfs", {})
     logger.info(f"📊 ETF主数据: {len(etfs_data)} 个ETF, {len(master_sectors)} 个板块")
 
-    # AI 将分析板块映射到 master 标准板块
+    # 本地别名索引（tags / related / 以往 AI 映射）将分析板块映射到 master 标准板块
     ai_sector_names = [s["name"] for s in sectors]
-    logger.info(f"🤖 AI 映射板块: {ai_sector_names}")
-    sector_mapping = await ai_map_to_master_sectors(ai_sector_names, master_sectors)
-
-    if not sector_mapping:
-        logger.warning("⚠️ AI映射失败，使用直接匹配")
-        sector_mapping = {name: [name] if name in sector_index else [] for name in ai_sector_names}
+    index = SectorIndex.load(etf_master)
+    sector_mapping: dict[str, list[str]] = {}
+    unresolved = []
+    for name in ai_sector_names:
+        targets, how = index.resolve(name)
+        metrics.inc("sector_resolve", how=how)
+        if targets:
+            sector_mapping[name] = targets
+        else:
+            unresolved.append(name)
+
+    # 本地解析不了的交给 AI，结果写回学习表
+    if unresolved:
+        logger.info(f"🤖 AI 映射板块: {unresolved}")
+        learned = index.learn(await ai_map_to_master_sectors(unresolved, master_sectors))
+        if learned:
+            metrics.inc("sector_resolve", len(learned), how="ai")
+            index.save()
+            sector_mapping.update(learned)
+        else:
+            logger.warning("⚠️ AI映射失败，使用直接匹配")
+        for name in unresolved:
+            sector_mapping.setdefault(name, [name] if name in sector_index else [])
 
     # 根据映射收集 ETF 代码（合并多个板块）
     sector_etf_codes: dict[str, list[str]] = {}
@@ -637,6 +655,8 @@ async def enrich_sectors_with_etfs(result: dict):
         return
 
     # 批量获取ETF实时数据
+    if prefetcher:
+        await prefetcher.wait()
     logger.info(f"📈 获取 {len(codes_to_fetch)} 个ETF实时数据")
     fund_data = await fund_service.batch_get_funds(list(codes_to_fetch))
 
@@ -0,0 +1 @@
+var ajaxResult={"LivesList": [{"newsid": "20260300000", "title": "宁德时代午后走弱，计划于年内完成相关工作（3-0）", "digest": "宁德时代午后走弱，计划于年内完成相关工作（3-0）。宁德时代盘中快速拉升，同比增长5.2%，超出市场预期（4-0）。", "url_w": "http://finance.eastmoney.com/a/20260300000.html", "showtime": "2026-03-02 15:00:00"}, {"newsid": "20260300001", "title": "证监会盘中快速拉升，计划于年内完成相关工作（3-1）", "digest": "证监会盘中快速拉升，计划于年内完成相关工作（3-1）。证监会盘中快速拉升，成交额较上一交易日放大1200亿元（4-1）。", "url_w": "http://finance.eastmoney.com/a/20260300001.html", "showtime": "2026-03-02 14:56:00"}, {"newsid": "20260300002", "title": "北向资金盘中快速拉升，多只相关ETF涨超3%（3-2）", "digest": "北向资金盘中快速拉升，多只相关ETF涨超3%（3-2）。沪深两市盘中快速拉升，机构认为短期仍有支撑（4-2）。", "url_w": "http://finance.eastmoney.com/a/20260300002.html", "showtime": "2026-03-02 14:52:00"}, {"newsid": "20260300003", "title": "国际油价盘中快速拉升，市场情绪有所回暖（3-3）", "digest": "国际油价盘中快速拉升，市场情绪有所回暖（3-3）。宁德时代发布公告称，多只相关ETF涨超3%（4-3）。", "url_w": "http://finance.eastmoney.com/a/20260300003.html", "showtime": "2026-03-02 14:48:00"}, {"newsid": "20260300004", "title": "央行午后走弱，计划于年内完成相关工作（3-4）", "digest": "央行午后走弱，计划于年内完成相关工作（3-4）。中芯国际今日宣布，机构认为短期仍有支撑（4-4）。", "url_w": "http://finance.eastmoney.com/a/20260300004.html", "showtime": "2026-03-02 14:44:00"}, {"newsid": "20260300005", "title": "半导体板块今日宣布，同比增长5.2%，超出市场预期（3-5）", "digest": "半导体板块今日宣布，同比增长5.2%，超出市场预期（3-5）。北向资金今日宣布，市场情绪有所回暖（4-5）。", "url_w": "http://finance.eastmoney.com/a/20260300005.html", "showtime": "2026-03-02 14:40:00"}, {"newsid": "20260300006", "title": "工信部维持区间震荡，多只相关ETF涨超3%（3-6）", "digest": "工信部维持区间震荡，多只相关ETF涨超3%（3-6）。沪深两市今日宣布，多只相关ETF涨超3%（4-6）。", "url_w": "http://finance.eastmoney.com/a/20260300006.html", "showtime": "2026-03-02 14:36:00"}, {"newsid": "20260300007", "title": "黄金期货今日宣布，市场情绪有所回暖（3-7）", "digest": "黄金期货今日宣布，市场情绪有所回暖（3-7）。宁德时代发布公告称，同比增长5.2%，超出市场预期（4-7）。", "url_w": "http://finance.eastmoney.com/a/20260300007.html", "showtime": "2026-03-02 14:32:00"}, {"newsid": "20260300008", "title": "工信部维持区间震荡，机构认为短期仍有支撑（3-8）", "digest": "工信部维持区间震荡，机构认为短期仍有支撑（3-8）。光伏行业午后走弱，同比增长5.2%，超出市场预期（4-8）。", "url_w": "http://finance.eastmoney.com/a/20260300008.html", "showtime": "2026-03-02 14:28:00"}, {"newsid": "20260300009", "title": "半导体板块公布最新数据显示，市场情绪有所回暖（3-9）", "digest": "半导体板块公布最新数据显示，市场情绪有所回暖（3-9）。黄金期货公布最新数据显示，成交额较上一交易日放大1200亿元（4-9）。", "url_w": "http://finance.eastmoney.com/a/20260300009.html", "showtime": "2026-03-02 14:24:00"}, {"newsid": "20260300010", "title": "恒生科技指数今日宣布，市场情绪有所回暖（3-10）", "digest": "恒生科技指数今日宣布，市场情绪有所回暖（3-10）。宁德时代发布公告称，同比增长5.2%，超出市场预期（4-10）。", "url_w": "http://finance.eastmoney.com/a/20260300010.html", "showtime": "2026-03-02 14:20:00"}, {"newsid": "20260300011", "title": "北向资金发布公告称，同比增长5.2%，超出市场预期（3-11）", "digest": "北向资金发布公告称，同比增长5.2%，超出市场预期（3-11）。光伏行业盘中快速拉升，同比增长5.2%，超出市场预期（4-11）。", "url_w": "http://finance.eastmoney.com/a/20260300011.html", "showtime": "2026-03-02 14:16:00"}, {"newsid": "20260300012", "title": "宁德时代盘中快速拉升，成交额较上一交易日放大1200亿元（3-12）", "digest": "宁德时代盘中快速拉升，成交额较上一交易日放大1200亿元（3-12）。半导体板块维持区间震荡，市场情绪有所回暖（4-12）。", "url_w": "http://finance.eastmoney.com/a/20260300012.html", "showtime": "2026-03-02 14:12:00"}, {"newsid": "20260300013", "title": "北向资金发布公告称，机构认为短期仍有支撑（3-13）", "digest": "北向资金发布公告称，机构认为短期仍有支撑（3-13）。半导体板块公布最新数据显示，多只相关ETF涨超3%（4-13）。", "url_w": "http://finance.eastmoney.com/a/20260300013.html", "showtime": "2026-03-02 14:08:00"}, {"newsid": "20260300014", "title": "证监会盘中快速拉升，同比增长5.2%，超出市场预期（3-14）", "digest": "证监会盘中快速拉升，同比增长5.2%，超出市场预期（3-14）。宁德时代午后走弱，计划于年内完成相关工作（4-14）。", "url_w": "http://finance.eastmoney.com/a/20260300014.html", "showtime": "2026-03-02 14:04:00"}, {"newsid": "20260300015", "title": "宁德时代发布公告称，同比增长5.2%，超出市场预期（3-15）", "digest": "宁德时代发布公告称，同比增长5.2%，超出市场预期（3-15）。美联储盘中快速拉升，市场情绪有所回暖（4-15）。", "url_w": "http://finance.eastmoney.com/a/20260300015.html", "showtime": "2026-03-02 14:00:00"}, {"newsid": "20260300016", "title": "沪深两市今日宣布，机构认为短期仍有支撑（3-16）", "digest": "沪深两市今日宣布，机构认为短期仍有支撑（3-16）。光伏行业发布公告称，计划于年内完成相关工作（4-16）。", "url_w": "http://finance.eastmoney.com/a/20260300016.html", "showtime": "2026-03-02 13:56:00"}, {"newsid": "20260300017", "title": "国际油价公布最新数据显示，市场情绪有所回暖（3-17）", "digest": "国际油价公布最新数据显示，市场情绪有所回暖（3-17）。黄金期货维持区间震荡，成交额较上一交易日放大1200亿元（4-17）。", "url_w": "http://finance.eastmoney.com/a/20260300017.html", "showtime": "2026-03-02 13:52:00"}, {"newsid": "20260300018", "title": "恒生科技指数午后走弱，成交额较上一交易日放大1200亿元（3-18）", "digest": "恒生科技指数午后走弱，成交额较上一交易日放大1200亿元（3-18）。黄金期货盘中快速拉升，市场情绪有所回暖（4-18）。", "url_w": "http://finance.eastmoney.com/a/20260300018.html", "showtime": "2026-03-02 13:48:00"}, {"newsid": "20260300019", "title": "沪深两市发布公告称，计划于年内完成相关工作（3-19）", "digest": "沪深两市发布公告称，计划于年内完成相关工作（3-19）。国际油价盘中快速拉升，多只相关ETF涨超3%（4-19）。", "url_w": "http://finance.eastmoney.com/a/20260300019.html", "showtime": "2026-03-02 13:44:00"}, {"newsid": "20260300020", "title": "央行发布公告称，成交额较上一交易日放大1200亿元（3-20）", "digest": "央行发布公告称，成交额较上一交易日放大1200亿元（3-20）。宁德时代公布最新数据显示，成交额较上一交易日放大1200亿元（4-20）。", "url_w": "http://finance.eastmoney.com/a/20260300020.html", "showtime": "2026-03-02 13:40:00"}, {"newsid": "20260300021", "title": "半导体板块午后走弱，机构认为短期仍有支撑（3-21）", "digest": "半导体板块午后走弱，机构认为短期仍有支撑（3-21）。中芯国际公布最新数据显示，成交额较上一交易日放大1200亿元（4-21）。", "url_w": "http://finance.eastmoney.com/a/20260300021.html", "showtime": "2026-03-02 13:36:00"}, {"newsid": "20260300022", "title": "美联储公布最新数据显示，成交额较上一交易日放大1200亿元（3-22）", "digest": "美联储公布最新数据显示，成交额较上一交易日放大1200亿元（3-22）。证监会午后走弱，多只相关ETF涨超3%（4-22）。", "url_w": "http://finance.eastmoney.com/a/20260300022.html", "showtime": "2026-03-02 13:32:00"}, {"newsid": "20260300023", "title": "国家统计局发布公告称，市场情绪有所回暖（3-23）", "digest": "国家统计局发布公告称，市场情绪有所回暖（3-23）。宁德时代维持区间震荡，成交额较上一交易日放大1200亿元（4-23）。", "url_w": "http://finance.eastmoney.com/a/20260300023.html", "showtime": "2026-03-02 13:28:00"}, {"newsid": "20260300024", "title": "美联储维持区间震荡，同比增长5.2%，超出市场预期（3-24）", "digest": "美联储维持区间震荡，同比增长5.2%，超出市场预期（3-24）。沪深两市今日宣布，多只相关ETF涨超3%（4-24）。", "url_w": "http://finance.eastmoney.com/a/20260300024.html", "showtime": "2026-03-02 13:24:00"}, {"newsid": "20260300025", "title": "央行盘中快速拉升，成交额较上一交易日放大1200亿元（3-25）", "digest": "央行盘中快速拉升，成交额较上一交易日放大1200亿元（3-25）。恒生科技指数午后走弱，成交额较上一交易日放大1200亿元（4-25）。", "url_w": "http://finance.eastmoney.com/a/20260300025.html", "showtime": "2026-03-02 13:20:00"}, {"newsid": "20260300026", "title": "央行发布公告称，成交额较上一交易日放大1200亿元（3-26）", "digest": "央行发布公告称，成交额较上一交易日放大1200亿元（3-26）。黄金期货午后走弱，机构认为短期仍有支撑（4-26）。", "url_w": "http://finance.eastmoney.com/a/20260300026.html", "showtime": "2026-03-02 13:16:00"}, {"newsid": "20260300027", "title": "宁德时代发布公告称，机构认为短期仍有支撑（3-27）", "digest": "宁德时代发布公告称，机构认为短期仍有支撑（3-27）。恒生科技指数维持区间震荡，市场情绪有所回暖（4-27）。", "url_w": "http://finance.eastmoney.com/a/20260300027.html", "showtime": "2026-03-02 13:12:00"}, {"newsid": "20260300028", "title": "国际油价午后走弱，同比增长5.2%，超出市场预期（3-28）", "digest": "国际油价午后走弱，同比增长5.2%，超出市场预期（3-28）。证监会发布公告称，成交额较上一交易日放大1200亿元（4-28）。", "url_w": "http://finance.eastmoney.com/a/20260300028.html", "showtime": "2026-03-02 13:08:00"}, {"newsid": "20260300029", "title": "美联储维持区间震荡，市场情绪有所回暖（3-29）", "digest": "美联储维持区间震荡，市场情绪有所回暖（3-29）。央行维持区间震荡，市场情绪有所回暖（4-29）。", "url_w": "http://finance.eastmoney.com/a/20260300029.html", "showtime": "2026-03-02 13:04:00"}, {"newsid": "20260300030", "title": "证监会午后走弱，成交额较上一交易日放大1200亿元（3-30）", "digest": "证监会午后走弱，成交额较上一交易日放大1200亿元（3-30）。工信部今日宣布，同比增长5.2%，超出市场预期（4-30）。", "url_w": "http://finance.eastmoney.com/a/20260300030.html", "showtime": "2026-03-02 13:00:00"}, {"newsid": "20260300031", "title": "中芯国际午后走弱，机构认为短期仍有支撑（3-31）", "digest": "中芯国际午后走弱，机构认为短期仍有支撑（3-31）。宁德时代发布公告称，多只相关ETF涨超3%（4-31）。", "url_w": "http://finance.eastmoney.com/a/20260300031.html", "showtime": "2026-03-02 12:56:00"}, {"newsid": "20260300032", "title": "国家统计局盘中快速拉升，市场情绪有所回暖（3-32）", "digest": "国家统计局盘中快速拉升，市场情绪有所回暖（3-32）。工信部发布公告称，成交额较上一交易日放大1200亿元（4-32）。", "url_w": "http://finance.eastmoney.com/a/20260300032.html", "showtime": "2026-03-02 12:52:00"}, {"newsid": "20260300033", "title": "央行发布公告称，多只相关ETF涨超3%（3-33）", "digest": "央行发布公告称，多只相关ETF涨超3%（3-33）。央行公布最新数据显示，同比增长5.2%，超出市场预期（4-33）。", "url_w": "http://finance.eastmoney.com/a/20260300033.html", "showtime": "2026-03-02 12:48:00"}, {"newsid": "20260300034", "title": "中芯国际午后走弱，计划于年内完成相关工作（3-34）", "digest": "中芯国际午后走弱，计划于年内完成相关工作（3-34）。美联储午后走弱，成交额较上一交易日放大1200亿元（4-34）。", "url_w": "http://finance.eastmoney.com/a/20260300034.html", "showtime": "2026-03-02 12:44:00"}, {"newsid": "20260300035", "title": "证监会维持区间震荡，计划于年内完成相关工作（3-35）", "digest": "证监会维持区间震荡，计划于年内完成相关工作（3-35）。国际油价发布公告称，计划于年内完成相关工作（4-35）。", "url_w": "http://finance.eastmoney.com/a/20260300035.html", "showtime": "2026-03-02 12:40:00"}, {"newsid": "20260300036", "title": "央行午后走弱，计划于年内完成相关工作（3-36）", "digest": "央行午后走弱，计划于年内完成相关工作（3-36）。恒生科技指数维持区间震荡，同比增长5.2%，超出市场预期（4-36）。", "url_w": "http://finance.eastmoney.com/a/20260300036.html", "showtime": "2026-03-02 12:36:00"}, {"newsid": "20260300037", "title": "国家统计局发布公告称，计划于年内完成相关工作（3-37）", "digest": "国家统计局发布公告称，计划于年内完成相关工作（3-37）。国家统计局午后走弱，市场情绪有所回暖（4-37）。", "url_w": "http://finance.eastmoney.com/a/20260300037.html", "showtime": "2026-03-02 12:32:00"}, {"newsid": "20260300038", "title": "国际油价公布最新数据显示，多只相关ETF涨超3%（3-38）", "digest": "国际油价公布最新数据显示，多只相关ETF涨超3%（3-38）。半导体板块今日宣布，市场情绪有所回暖（4-38）。", "url_w": "http://finance.eastmoney.com/a/20260300038.html", "showtime": "2026-03-02 12:28:00"}, {"newsid": "20260300039", "title": "光伏行业盘中快速拉升，多只相关ETF涨超3%（3-39）", "digest": "光伏行业盘中快速拉升，多只相关ETF涨超3%（3-39）。证监会发布公告称，计划于年内完成相关工作（4-39）。", "url_w": "http://finance.eastmoney.com/a/20260300039.html", "showtime": "2026-03-02 12:24:00"}, {"newsid": "20260300040", "title": "黄金期货午后走弱，多只相关ETF涨超3%（3-40）", "digest": "黄金期货午后走弱，多只相关ETF涨超3%（3-40）。美联储午后走弱，计划于年内完成相关工作（4-40）。", "url_w": "http://finance.eastmoney.com/a/20260300040.html", "showtime": "2026-03-02 12:20:00"}, {"newsid": "20260300041", "title": "沪深两市维持区间震荡，多只相关ETF涨超3%（3-41）", "digest": "沪深两市维持区间震荡，多只相关ETF涨超3%（3-41）。半导体板块维持区间震荡，市场情绪有所回暖（4-41）。", "url_w": "http://finance.eastmoney.com/a/20260300041.html", "showtime": "2026-03-02 12:16:00"}, {"newsid": "20260300042", "title": "国家统计局发布公告称，机构认为短期仍有支撑（3-42）", "digest": "国家统计局发布公告称，机构认为短期仍有支撑（3-42）。光伏行业发布公告称，计划于年内完成相关工作（4-42）。", "url_w": "http://finance.eastmoney.com/a/20260300042.html", "showtime": "2026-03-02 12:12:00"}, {"newsid": "20260300043", "title": "证监会公布最新数据显示，多只相关ETF涨超3%（3-43）", "digest": "证监会公布最新数据显示，多只相关ETF涨超3%（3-43）。恒生科技指数午后走弱，市场情绪有所回暖（4-43）。", "url_w": "http://finance.eastmoney.com/a/20260300043.html", "showtime": "2026-03-02 12:08:00"}, {"newsid": "20260300044", "title": "北向资金午后走弱，同比增长5.2%，超出市场预期（3-44）", "digest": "北向资金午后走弱，同比增长5.2%，超出市场预期（3-44）。宁德时代今日宣布，计划于年内完成相关工作（4-44）。", "url_w": "http://finance.eastmoney.com/a/20260300044.html", "showtime": "2026-03-02 12:04:00"}, {"newsid": "20260300045", "title": "国际油价盘中快速拉升，多只相关ETF涨超3%（3-45）", "digest": "国际油价盘中快速拉升，多只相关ETF涨超3%（3-45）。证监会今日宣布，机构认为短期仍有支撑（4-45）。", "url_w": "http://finance.eastmoney.com/a/20260300045.html", "showtime": "2026-03-02 12:00:00"}, {"newsid": "20260300046", "title": "沪深两市午后走弱，成交额较上一交易日放大1200亿元（3-46）", "digest": "沪深两市午后走弱，成交额较上一交易日放大1200亿元（3-46）。中芯国际盘中快速拉升，市场情绪有所回暖（4-46）。", "url_w": "http://finance.eastmoney.com/a/20260300046.html", "showtime": "2026-03-02 11:56:00"}, {"newsid": "20260300047", "title": "半导体板块发布公告称，多只相关ETF涨超3%（3-47）", "digest": "半导体板块发布公告称，多只相关ETF涨超3%（3-47）。央行维持区间震荡，同比增长5.2%，超出市场预期（4-47）。", "url_w": "http://finance.eastmoney.com/a/20260300047.html", "showtime": "2026-03-02 11:52:00"}, {"newsid": "20260300048", "title": "宁德时代公布最新数据显示，计划于年内完成相关工作（3-48）", "digest": "宁德时代公布最新数据显示，计划于年内完成相关工作（3-48）。恒生科技指数今日宣布，机构认为短期仍有支撑（4-48）。", "url_w": "http://finance.eastmoney.com/a/20260300048.html", "showtime": "2026-03-02 11:48:00"}, {"newsid": "20260300049", "title": "恒生科技指数今日宣布，计划于年内完成相关工作（3-49）", "digest": "恒生科技指数今日宣布，计划于年内完成相关工作（3-49）。国家统计局发布公告称，市场情绪有所回暖（4-49）。", "url_w": "http://finance.eastmoney.com/a/20260300049.html", "showtime": "2026-03-02 11:44:00"}]}
\ No newline at end of file
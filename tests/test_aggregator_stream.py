@@ -0,0 +1,53 @@
+"""NewsAggregator.stream 测试（用本地采集器，不访问网络）"""
+
+import asyncio
+
+from src.collectors import BaseCollector, NewsAggregator
+from src.models import NewsItem
+
+
+class _SleepyCollector(BaseCollector):
+    def __init__(self, label: str, delay: float, titles: list[str]):
+        super().__init__()
+        self.label = label
+        self.delay = delay
+        self.titles = titles
+
+    @property
+    def name(self) -> str:
+        return self.label
+
+    async def collect(self) -> list[NewsItem]:
+        await asyncio.sleep(self.delay)
+        return [NewsItem(title=t, source=self.label) for t in self.titles]
+
+
+def _aggregator(*collectors) -> NewsAggregator:
+    agg = NewsAggregator(include_international=False, include_playwright=False)
+    agg.collectors = list(collectors)
+    return agg
+
+
+def _drain(agg: NewsAggregator, timeout=None) -> list[tuple[str, list[str]]]:
+    async def main():
+        return [(name, [i.title for i in items]) async for name, items in agg.stream(timeout=timeout)]
+    return asyncio.run(main())
+
+
+def test_stream_yields_in_completion_order_with_dedup():
+    agg = _aggregator(
+        _SleepyCollector("slow", 0.05, ["a", "b"]),
+        _SleepyCollector("fast", 0.0, ["b", "c"]),
+    )
+    assert _drain(agg) == [("fast", ["b", "c"]), ("slow", ["a"])]
+
+
+def test_stream_collector_deadline_and_overall_timeout():
+    hang = _SleepyCollector("hang", 5.0, ["y"])
+    hang.deadline = 0.05
+    agg = _aggregator(_SleepyCollector("ok", 0.0, ["x"]), hang)
+    assert _drain(agg) == [("ok", ["x"]), ("hang", [])]
+
+    hang.deadline = 10
+    # 整体时限到期后放弃未完成的来源
+    assert _drain(agg, timeout=0.05) == [("ok", ["x"])]
@@ -0,0 +1,69 @@
+"""AI 响应缓存测试"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.services import ai_client
+from src.services.ai_cache import AICache, cache_key
+from src.services.ai_client import AIClient, AIRequest
+
+PAYLOAD = {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": "板块映射"}], "stream": False}
+
+
+def test_key_ignores_transport_params_only():
+    assert cache_key(PAYLOAD) == cache_key({**PAYLOAD, "stream": True})
+    assert cache_key(PAYLOAD) != cache_key({**PAYLOAD, "max_tokens": 11})
+    assert cache_key(PAYLOAD) != cache_key({**PAYLOAD, "model": "other"})
+
+
+def test_ttl_and_persistence(tmp_path):
+    cache = AICache(directory=tmp_path, ttl=60)
+    cache.put("k", "answer", "sector_map")
+    assert AICache(directory=tmp_path, ttl=60).get("k") == "answer"  # 重新加载后仍命中
+
+    expired = AICache(directory=tmp_path, ttl=0)
+    time.sleep(0.01)
+    assert expired.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_lru_eviction(tmp_path):
+    cache = AICache(directory=tmp_path, max_entries=2)
+    cache.put("a", "1")
+    time.sleep(0.01)
+    cache.put("b", "2")
+    time.sleep(0.01)
+    assert cache.get("a") == "1"  # a 变为最近使用
+    time.sleep(0.01)
+    cache.put("c", "3")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+
+def test_client_serves_repeat_requests_from_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"AI": ["软件"]}'}}]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(ai_client.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    monkeypatch.setattr(ai_client, "ai_cache", AICache(directory=tmp_path))
+    monkeypatch.setattr(ai_client.settings, "claude_api_key", "test")
+
+    def send(**kw):
+        req = AIRequest(messages=[{"role": "user", "content": "映射 AI"}], purpose="sector_map", **kw)
+        return asyncio.run(AIClient().send(req))
+
+    assert send() == send() == '{"AI": ["软件"]}'
+    assert len(calls) == 1
+    send(cache=False)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(ai_client, "ai_cache", AICache(directory=tmp_path, enabled=False))
+    send()
+    assert len(calls) == 3
@@ -0,0 +1,99 @@
+"""AIClient 共享连接、并发限制和在途请求合并测试"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services import ai_client
+from src.services.ai_cache import AICache
+from src.services.ai_client import AIClient, AIRequest, close_ai_client
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """模拟 chat/completions：回显提示词，记录请求数、在途峰值和创建的客户端数"""
+    state = {"calls": 0, "active": 0, "peak": 0, "clients": 0, "status": []}
+
+    async def handler(request):
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.02)
+        state["active"] -= 1
+        if state["status"]:
+            return httpx.Response(state["status"].pop(0))
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"re:{prompt}"}}]})
+
+    real_client = httpx.AsyncClient
+
+    def make_client(**kw):
+        state["clients"] += 1
+        return real_client(transport=httpx.MockTransport(handler), **kw)
+
+    monkeypatch.setattr(ai_client.httpx, "AsyncClient", make_client)
+    monkeypatch.setattr(ai_client, "ai_cache", AICache(directory=tmp_path, enabled=False))
+    monkeypatch.setattr(ai_client.settings, "claude_api_key", "test")
+    monkeypatch.setattr(ai_client.settings, "ai_concurrency", 2)
+    monkeypatch.setattr(ai_client.settings, "ai_rate", 100.0)
+    monkeypatch.setattr(ai_client, "_shared", None)
+    return state
+
+
+def _req(prompt: str) -> AIRequest:
+    return AIRequest(messages=[{"role": "user", "content": prompt}], purpose="test")
+
+
+def test_concurrency_limit_and_shared_connection(server):
+    async def main():
+        results = await asyncio.gather(*(AIClient().send(_req(f"p{i}")) for i in range(6)))
+        await close_ai_client()
+        return results
+
+    assert asyncio.run(main()) == [f"re:p{i}" for i in range(6)]
+    assert server["calls"] == 6
+    assert server["peak"] == 2
+    assert server["clients"] == 1
+
+
+def test_identical_in_flight_requests_are_coalesced(server):
+    async def main():
+        first = await asyncio.gather(*(AIClient().send(_req("same")) for _ in range(5)))
+        second = await AIClient().send(_req("same"))  # 前一批已完成，重新请求
+        await close_ai_client()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == ["re:same"] * 5 and second == "re:same"
+    assert server["calls"] == 2
+
+
+def test_rate_limited_response_slows_down_and_retries(server, monkeypatch):
+    server["status"] = [429]
+    monkeypatch.setattr(ai_client.random, "uniform", lambda a, b: 0)
+    monkeypatch.setattr(ai_client.asyncio, "sleep", _fast_sleep)
+
+    async def main():
+        result = await AIClient().send(_req("x"))
+        rate = ai_client._shared.bucket.rate
+        await close_ai_client()
+        return result, rate
+
+    result, rate = asyncio.run(main())
+    assert result == "re:x" and server["calls"] == 2
+    assert rate < 100.0
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _fast_sleep(seconds):
+    await _real_sleep(min(seconds, 0.02))
+
+
+def test_missing_api_key_fails_fast(monkeypatch):
+    monkeypatch.setattr(ai_client.settings, "claude_api_key", "")
+    with pytest.raises(RuntimeError, match="CLAUDE_API_KEY"):
+        AIClient()
@@ -0,0 +1,99 @@
+"""流式分析测试：SSE 解析、增量 JSON 板块输出、行情缓存"""
+
+import asyncio
+import json
+
+import httpx
+
+from src.services import ai_client
+from src.services.ai_cache import AICache
+from src.services.ai_client import AIClient, AIRequest, JsonArrayStream, parse_json_with_repair
+from src.services.fund_service import FundService
+
+ANALYSIS = """```json
+{
+  "market_view": "🎯 科技{主线}，\\"黄金\\"避险",
+  "sectors": [
+    {"name": "芯片", "heat": 5, "tags": ["国产[替代]", "}"], "extra": {"a": [1, 2]}},
+    {"name": "黄金", "heat": 4, "analysis": "金价新高，},注意回调",},
+    {"name": "证券", "heat": 3}
+  ],
+  "risk_alerts": [{"name": "不是板块"}]
+}
+```"""
+
+
+def test_array_stream_emits_each_sector_once_in_order():
+    stream = JsonArrayStream("sectors")
+    emitted = []
+    for i in range(1, len(ANALYSIS) + 1):
+        emitted.extend(stream.feed(ANALYSIS[:i]))
+    assert [s["name"] for s in emitted] == ["芯片", "黄金", "证券"]
+    assert emitted[0]["tags"] == ["国产[替代]", "}"]
+    assert stream.done
+    assert emitted == parse_json_with_repair(ANALYSIS)["sectors"]
+
+
+def test_array_stream_restarts_when_text_restarts():
+    stream = JsonArrayStream("sectors")
+    assert stream.feed('{"sectors": [{"name": "芯片"}, {"na') == [{"name": "芯片"}]
+    assert stream.feed('{"sectors": [{"name": "AI"}') == [{"name": "AI"}]
+
+
+def _sse(text: str, size: int = 7) -> bytes:
+    lines = [": keep-alive"]
+    for i in range(0, len(text), size):
+        lines.append("data: " + json.dumps({"choices": [{"delta": {"content": text[i:i + size]}}]}, ensure_ascii=False))
+    lines.append("data: " + json.dumps({"choices": [], "usage": {"prompt_tokens": 100, "completion_tokens": 50}}))
+    lines.append("data: [DONE]")
+    return ("\n\n".join(lines) + "\n\n").encode()
+
+
+def test_client_streams_sse_and_caches_full_text(tmp_path, monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, content=_sse(ANALYSIS), headers={"content-type": "text/event-stream"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(ai_client.httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    monkeypatch.setattr(ai_client, "ai_cache", AICache(directory=tmp_path))
+    monkeypatch.setattr(ai_client.settings, "claude_api_key", "test")
+
+    def send():
+        stream = JsonArrayStream("sectors")
+        seen = []
+        req = AIRequest(messages=[{"role": "user", "content": "分析"}], purpose="analyze",
+                        on_text=lambda text: seen.extend(s["name"] for s in stream.feed(text)))
+        return asyncio.run(AIClient().send(req)), seen
+
+    text, seen = send()
+    assert text == ANALYSIS.strip()
+    assert seen == ["芯片", "黄金", "证券"]
+    assert calls[0]["stream"] is True
+
+    # 缓存命中时回调一次完整文本，下游同样拿到全部板块
+    assert send() == (text, ["芯片", "黄金", "证券"])
+    assert len(calls) == 1
+
+
+def test_batch_get_funds_reuses_recent_quotes(monkeypatch):
+    service = FundService()
+    fetched = []
+
+    async def fetch(client, secids):
+        fetched.append(secids)
+        return [{"f12": s.split(".")[1], "f14": "ETF", "f2": 1000, "f3": 100, "f6": 1e8} for s in secids]
+
+    monkeypatch.setattr(service, "_fetch_batch_with_retry", fetch)
+
+    async def main():
+        await service.batch_get_funds(["512480", "159995"])
+        result = await service.batch_get_funds(["512480", "159995", "518880"])
+        await service.aclose()
+        return result
+
+    result = asyncio.run(main())
+    assert set(result) == {"512480", "159995", "518880"}
+    assert fetched == [["1.512480", "0.159995"], ["1.518880"]]
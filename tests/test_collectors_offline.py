@@ -0,0 +1,48 @@
+"""采集器离线回放测试：所有采集器都能从录制中采到数据，不访问网络"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.collectors import NewsAggregator, rss_base
+from src.collectors.http_cache import HttpCache
+from src.collectors.replay import Recording
+
+
+@pytest.fixture
+def aggregator(tmp_path, monkeypatch):
+    monkeypatch.setattr(rss_base, "http_cache", HttpCache(path=tmp_path / "http_cache.json"))
+    recording = Recording()
+    aggregator = NewsAggregator()
+    for collector in [*aggregator.collectors, *aggregator.playwright_collectors]:
+        recording.attach(collector)
+    return aggregator
+
+
+def test_every_collector_has_a_recording(aggregator):
+    async def main():
+        results = {}
+        for collector in [*aggregator.collectors, *aggregator.playwright_collectors]:
+            results[collector.name] = len(await collector.collect())
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 14
+    assert all(count >= 20 for count in results.values()), results
+
+
+def test_collect_all_offline(aggregator):
+    collection = asyncio.run(aggregator.collect_all())
+    assert len(collection.items) > 200
+    assert len({item.source for item in collection.items}) == 14
+    published = [i.published_at.replace(tzinfo=None) for i in collection.items if i.published_at]
+    assert published == sorted(published, reverse=True)
+
+
+def test_unrecorded_url_is_404():
+    async def main():
+        async with httpx.AsyncClient(transport=Recording().transport()) as client:
+            return await client.get("https://example.com/live")
+
+    assert asyncio.run(main()).status_code == 404
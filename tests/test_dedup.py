@@ -0,0 +1,52 @@
+"""近似重复新闻检测测试"""
+
+from src.collectors.dedup import dedup_news, hamming, normalize, simhash
+from src.models import NewsItem
+
+TELEGRAPH = "央行今日开展2000亿元7天期逆回购操作，中标利率持平于1.50%，当日实现净投放1500亿元"
+
+
+def test_normalize_strips_prefix_and_punctuation():
+    assert normalize("【央行开展逆回购】财联社3月2日电，央行今日开展操作。") == "央行今日开展操作"
+    assert normalize("金十数据3月2日讯：Fed holds rates") == "fedholdsrates"
+
+
+def test_simhash_close_for_near_copies():
+    a = simhash(normalize(TELEGRAPH))
+    b = simhash(normalize("财联社3月2日电，" + TELEGRAPH.replace("，", ",")))
+    c = simhash(normalize("宁德时代发布新一代钠离子电池，能量密度提升至200Wh/kg，计划年内量产"))
+    assert hamming(a, b) == 0
+    assert hamming(a, c) > 10
+
+
+def test_dedup_clusters_cross_source_copies():
+    items = [
+        NewsItem(title="财联社3月2日电，" + TELEGRAPH, source="财联社"),
+        NewsItem(title=TELEGRAPH[:30], source="金十数据"),  # 截断转载
+        NewsItem(title=TELEGRAPH.replace("，", " "), source="华尔街见闻"),
+        NewsItem(title=TELEGRAPH, source="财联社"),  # 同源重复不重复计数
+        NewsItem(title="宁德时代发布新一代钠离子电池，能量密度提升至200Wh/kg", source="财联社"),
+    ]
+    kept = dedup_news(items)
+    assert [i.source for i in kept] == ["财联社", "财联社"]
+    assert kept[0].dup_count == 3
+    assert kept[1].dup_count == 1
+
+
+def test_threshold_configurable():
+    a = NewsItem(title="沪指午间收盘上涨0.52%，创业板指涨1.1%，两市成交额8000亿元", source="A")
+    b = NewsItem(title="沪指午间收盘上涨0.61%，创业板指涨1.3%，两市成交额8200亿元", source="B")
+    d = hamming(simhash(normalize(a.title)), simhash(normalize(b.title)))
+    assert len(dedup_news([a.model_copy(), b.model_copy()], max_distance=d - 1, prefix_len=100)) == 2
+    assert len(dedup_news([a.model_copy(), b.model_copy()], max_distance=d, prefix_len=100)) == 1
+
+
+def test_template_headlines_sharing_a_prefix_are_kept():
+    titles = [
+        "Stocks making the biggest moves midday: Nvidia, Tesla, Boeing and more",
+        "Stocks making the biggest moves after hours: Netflix, Intel, Snap",
+        "Here are the biggest analyst calls of the day: Apple, Microsoft and more",
+        "Here are the biggest analyst calls of the day: Nike, Amazon",
+    ]
+    kept = dedup_news([NewsItem(title=t, source="CNBC") for t in titles])
+    assert [i.title for i in kept] == titles
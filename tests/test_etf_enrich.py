@@ -0,0 +1,98 @@
+"""ETF 批量富化测试：按长度分批、输出无法解析时拆批重试"""
+
+import asyncio
+import json
+
+from src.services import fund_service as fund_module
+from src.services.fund_service import FundService, plan_batches
+
+
+def _info(code: str, scope: str = "投资于标的指数成份股") -> dict:
+    return {"code": code, "name": f"ETF{code}", "scope": scope}
+
+
+def test_plan_batches_by_token_budget_and_count():
+    short = [_info(f"51{i:04d}") for i in range(10)]
+    assert [len(b) for b in plan_batches(short, budget=10_000, max_items=4)] == [4, 4, 2]
+
+    long = [_info(f"15{i:04d}", scope="芯片" * 100) for i in range(5)]
+    batches = plan_batches(long, budget=450, max_items=40)
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [i for b in batches for i in b] == long
+
+    # 单条超预算时独占一批，不丢弃
+    assert [len(b) for b in plan_batches(long[:2], budget=10, max_items=40)] == [1, 1]
+
+
+class FakeClient:
+    """超过 limit 只的批次返回坏 JSON；drop 中的代码第一次被省略"""
+
+    def __init__(self, limit: int, drop=()):
+        self.limit = limit
+        self.drop = set(drop)
+        self.batches = []
+
+    async def send(self, req):
+        prompt = req.messages[0]["content"]
+        codes = [line.split()[1] for line in prompt.splitlines() if line.startswith("- ") and line[2:4].isdigit()]
+        self.batches.append(len(codes))
+        if len(codes) > self.limit:
+            return "服务繁忙，请稍后"
+        out = {}
+        for code in codes:
+            if code in self.drop:
+                self.drop.discard(code)
+                continue
+            out[code] = {"sector": "芯片", "related": ["AI"], "desc": "半导体龙头", "tags": ["半导体"]}
+        return json.dumps(out, ensure_ascii=False)
+
+
+def test_failed_batches_are_split_and_missing_items_retried(monkeypatch):
+    client = FakeClient(limit=3, drop={"510005"})
+    monkeypatch.setattr(fund_module, "AIClient", lambda: client)
+    infos = [_info(f"51000{i}") for i in range(8)]
+
+    result = asyncio.run(FundService()._enrich_etfs(infos))
+
+    assert set(result) == {info["code"] for info in infos}
+    assert result["510000"] == {"sector": "芯片", "related": ["AI"], "desc": "半导体龙头", "tags": ["半导体"]}
+    # 8 → 4+4 → 2+2+2+2，其中漏掉的 510005 单独重试
+    assert sorted(client.batches) == [1, 2, 2, 2, 2, 4, 4, 8]
+
+
+def test_single_item_failure_gives_up(monkeypatch):
+    client = FakeClient(limit=0)
+    monkeypatch.setattr(fund_module, "AIClient", lambda: client)
+    assert asyncio.run(FundService()._enrich_etfs([_info("510000"), _info("510001")])) == {}
+    assert client.batches == [2, 1, 1]
+
+
+def test_api_errors_are_not_split(monkeypatch):
+    class BrokenClient:
+        calls = 0
+
+        async def send(self, req):
+            BrokenClient.calls += 1
+            raise RuntimeError("Insufficient Balance")
+
+    monkeypatch.setattr(fund_module, "AIClient", BrokenClient)
+    infos = [_info(f"51000{i}") for i in range(8)]
+    assert asyncio.run(FundService().enrich_etfs(infos)) == {}
+    assert BrokenClient.calls == 1
+
+
+def test_enrich_etfs_with_fixed_sector_list(monkeypatch):
+    client = FakeClient(limit=40)
+    prompts = []
+    send = client.send
+
+    async def record(req):
+        prompts.append(req.messages[0]["content"])
+        return await send(req)
+
+    client.send = record
+    monkeypatch.setattr(fund_module, "AIClient", lambda: client)
+    result = asyncio.run(FundService().enrich_etfs([_info("510000")], sectors=["芯片", "黄金"]))
+    assert result["510000"]["sector"] == "芯片"
+    assert "只能从以下板块中选择（related 同样）：芯片、黄金" in prompts[0]
+    assert '"sector": "行业板块或其他"' in prompts[0]
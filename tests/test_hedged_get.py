@@ -0,0 +1,120 @@
+"""对冲请求与耗时统计测试（httpx.MockTransport，不访问网络）"""
+
+import asyncio
+
+import httpx
+
+from src.collectors import base
+from src.collectors.base import BaseCollector
+from src.collectors.latency import LatencyTracker
+
+
+class _HedgedCollector(BaseCollector):
+    hedge = True
+    hedge_min_delay = 0.01
+
+    async def collect(self):
+        return []
+
+
+def _collector(handler) -> _HedgedCollector:
+    collector = _HedgedCollector()
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return collector
+
+
+def test_latency_tracker_p90_and_persist(tmp_path):
+    tracker = LatencyTracker(path=tmp_path / "latency.json", max_samples=10)
+    assert tracker.p90("x") is None
+    for v in range(1, 13):
+        tracker.record("x", v / 10)
+    # 只保留最近 10 个样本：0.3 .. 1.2
+    assert tracker.p90("x") == 1.2
+    tracker.save()
+    assert LatencyTracker(path=tmp_path / "latency.json").p90("x") == 1.2
+
+
+def test_hedge_fires_when_first_request_is_slow(tmp_path, monkeypatch):
+    tracker = LatencyTracker(path=tmp_path / "latency.json")
+    for _ in range(10):
+        tracker.record("_HedgedCollector", 0.02)
+    monkeypatch.setattr(base, "latency_tracker", tracker)
+
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1.0)  # 第一个请求卡住
+            return httpx.Response(200, text="slow")
+        return httpx.Response(200, text="fast")
+
+    async def main():
+        collector = _collector(handler)
+        try:
+            return await collector.hedged_get("https://example.com/feed")
+        finally:
+            await collector.close()
+
+    resp = asyncio.run(main())
+    assert resp.text == "fast"
+    assert calls == 2
+    # 发出过对冲的请求不计入 p90 样本
+    assert tracker._data()["_HedgedCollector"] == [0.02] * 10
+
+
+def test_no_hedge_without_history(tmp_path, monkeypatch):
+    tracker = LatencyTracker(path=tmp_path / "latency.json")
+    monkeypatch.setattr(base, "latency_tracker", tracker)
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text="ok")
+
+    async def main():
+        collector = _collector(handler)
+        try:
+            return await collector.hedged_get("https://example.com/feed")
+        finally:
+            await collector.close()
+
+    assert asyncio.run(main()).text == "ok"
+    assert calls == 1
+    assert len(tracker._data()["_HedgedCollector"]) == 1
+
+
+def test_cancelled_caller_does_not_leak_requests(tmp_path, monkeypatch):
+    tracker = LatencyTracker(path=tmp_path / "latency.json")
+    for _ in range(10):
+        tracker.record("_HedgedCollector", 0.02)
+    monkeypatch.setattr(base, "latency_tracker", tracker)
+    cancelled = 0
+
+    async def handler(request):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return httpx.Response(200, text="slow")
+
+    async def main():
+        collector = _collector(handler)
+        try:
+            # 等待首个请求时（对冲前）和等待对冲结果时各取消一次
+            for timeout in (0.005, 0.05):
+                try:
+                    await asyncio.wait_for(collector.hedged_get("https://example.com/feed"), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        finally:
+            await collector.close()
+
+    assert asyncio.run(main()) == []
+    assert cancelled == 3
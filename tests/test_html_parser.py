@@ -0,0 +1,60 @@
+"""HTML 解析后端测试：各后端在样例页面上的提取结果必须一致"""
+
+import asyncio
+import re
+from pathlib import Path
+
+import pytest
+
+from src.collectors import html_parser
+from src.collectors.cls_playwright import CLSPlaywrightCollector
+from src.collectors.eastmoney_playwright import EastMoneyPlaywrightCollector
+from src.collectors.html_parser import available_backends, parse_html
+from src.collectors.jin10 import Jin10Collector
+from src.collectors.sina_playwright import SinaPlaywrightCollector
+from src.collectors.stcn import StcnCollector
+from src.collectors.wallstreetcn import WallStreetCNCollector
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+COLLECTORS = {
+    "cls": CLSPlaywrightCollector,
+    "sina": SinaPlaywrightCollector,
+    "eastmoney": EastMoneyPlaywrightCollector,
+    "wallstreetcn": WallStreetCNCollector,
+    "jin10": Jin10Collector,
+}
+
+SNIPPET = """<html><body><div id="a"><p class="x y">  你好 <b>世界</b> </p><a href="/n/1">链接</a><span>09:30:15 开盘</span></div></body></html>"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_node_api(backend):
+    doc = parse_html(SNIPPET, backend)
+    p = doc.select_one("#a p")
+    assert p.text() == "你好世界"
+    assert p.attr("class") == "x y"
+    assert p.attr("title", "-") == "-"
+    assert [a.attr("href") for a in doc.select("a[href]")] == ["/n/1"]
+    assert doc.select_one("table") is None
+    assert doc.select_one("#a").parent.parent.parent is None  # div -> body -> html -> 文档
+    [el] = doc.elements_with_text(re.compile(r"\d{2}:\d{2}:\d{2}"))
+    assert el.text() == "09:30:15 开盘"
+
+
+def _extract(source: str, backend: str, monkeypatch) -> list[tuple]:
+    monkeypatch.setattr(html_parser, "DEFAULT_BACKEND", backend)
+    html = (FIXTURES / f"{source}.html").read_text()
+    if source == "stcn":
+        items = StcnCollector().parse_page(html)
+    else:
+        items = asyncio.run(COLLECTORS[source]().parse_page("https://example.com/", html))
+    return [(i.title, i.content, i.url, i.published_at and i.published_at.strftime("%H:%M")) for i in items]
+
+
+@pytest.mark.parametrize("source", ["stcn", *COLLECTORS])
+def test_backends_agree_on_fixtures(source, monkeypatch):
+    baseline = _extract(source, "html.parser", monkeypatch)
+    assert len(baseline) >= 20
+    for backend in available_backends():
+        assert _extract(source, backend, monkeypatch) == baseline, backend
@@ -0,0 +1,51 @@
+"""本地K线库测试"""
+
+from src.services.kline_store import KlineStore
+
+
+BARS = [
+    ("2026-01-05", 1.00),
+    ("2026-01-06", 1.01),
+    ("2026-01-07", 1.02),
+    ("2026-01-08", 1.03),
+]
+
+
+def test_plan_requires_full_fetch_until_deep_enough(tmp_path):
+    store = KlineStore(root=tmp_path)
+    assert store.plan("1.518880", 3) is None
+
+    store.replace("1.518880", BARS, depth=3)
+    # 从倒数第二根开始增量拉取
+    assert store.plan("1.518880", 3) == "2026-01-07"
+    # 需要的根数超过上次全量拉取深度，仍需全量
+    assert store.plan("1.518880", 200) is None
+
+
+def test_update_appends_and_overwrites_last_bar(tmp_path):
+    store = KlineStore(root=tmp_path)
+    store.replace("1.518880", BARS, depth=4)
+
+    delta = [("2026-01-07", 1.02), ("2026-01-08", 1.04), ("2026-01-09", 1.05)]
+    assert store.update("1.518880", delta)
+    assert store.load("1.518880")[-3:] == delta
+    assert len(store.load("1.518880")) == 5
+
+    # 重新从磁盘读取
+    reloaded = KlineStore(root=tmp_path)
+    assert reloaded.load("1.518880") == store.load("1.518880")
+
+
+def test_update_detects_price_adjustment(tmp_path):
+    store = KlineStore(root=tmp_path)
+    store.replace("1.518880", BARS, depth=4)
+
+    # 已收盘K线价格变了（除权后前复权价重算），拒绝拼接
+    assert not store.update("1.518880", [("2026-01-07", 0.98), ("2026-01-08", 0.99)])
+    assert store.load("1.518880") == BARS
+
+
+def test_max_bars_trims_oldest(tmp_path):
+    store = KlineStore(root=tmp_path, max_bars=3)
+    store.replace("0.159915", BARS, depth=4)
+    assert [d for d, _ in store.load("0.159915")] == ["2026-01-06", "2026-01-07", "2026-01-08"]
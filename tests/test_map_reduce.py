@@ -0,0 +1,86 @@
+"""分片汇总分析测试"""
+
+import asyncio
+import json
+
+from src.analyzers import map_reduce, realtime
+from src.collectors.base import classify_news
+from src.models import NewsCategory, NewsItem
+
+ITEMS = [
+    *[NewsItem(title=f"央行政策{i}", source="财联社") for i in range(70)],
+    *[NewsItem(title=f"半导体板块涨停{i}", source="东方财富") for i in range(10)],
+    NewsItem(title="Fed holds rates", source="CNBC", category=NewsCategory.INTERNATIONAL),
+    NewsItem(title="某公司发布财报", source="新浪财经"),
+]
+
+
+class FakeClient:
+    """按提示词里的类别返回要点；fail 中的类别抛错"""
+
+    def __init__(self, fail=(), delay=0.01):
+        self.fail = fail
+        self.delay = delay
+        self.active = self.peak = 0
+        self.prompts = []
+        self.cached = []
+
+    async def send(self, req):
+        prompt = req.messages[0]["content"]
+        self.prompts.append(prompt)
+        self.cached.append(req.cache)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if req.purpose == "analyze":
+            return json.dumps({"sectors": [{"name": "芯片", "heat": 4, "direction": "利好"}]})
+        if any(f"「{name}」" in prompt for name in self.fail):
+            raise TimeoutError("timeout")
+        return "要点如下：\n- 芯片：国产替代，利好\n- 黄金：避险，利好"
+
+
+def test_classify_and_shard():
+    assert classify_news("央行宣布降准") == NewsCategory.MACRO
+    assert classify_news("美联储维持利率") == NewsCategory.INTERNATIONAL
+    shards = map_reduce.shard_news(ITEMS)
+    assert [(s.label, len(s.items)) for s in shards] == [
+        ("宏观政策", 60), ("宏观政策（2）", 10), ("行业板块", 10), ("公司动态", 1), ("国际市场", 1),
+    ]
+
+
+def test_bounded_concurrency_and_partial_failure(monkeypatch):
+    client = FakeClient(fail=("公司动态",))
+    monkeypatch.setattr(map_reduce, "AIClient", lambda: client)
+
+    digest, covered = asyncio.run(map_reduce.summarize_shards(ITEMS, concurrency=2))
+
+    assert client.peak == 2 and len(client.prompts) == 5
+    assert len(covered) == len(ITEMS) - 1 and ITEMS[-1] not in covered
+    assert "### 宏观政策（60条）\n- 芯片：国产替代，利好\n- 黄金：避险，利好" in digest
+    assert "### 宏观政策（2）（10条）" in digest
+    assert digest.endswith("（以下分片汇总失败，未纳入：公司动态1条）")
+
+
+def test_analyze_reduces_over_shard_summaries_and_falls_back(monkeypatch):
+    monkeypatch.setattr(realtime.settings, "map_reduce_threshold", 50)
+    client = FakeClient()
+    monkeypatch.setattr(map_reduce, "AIClient", lambda: client)
+    monkeypatch.setattr(realtime, "AIClient", lambda: client)
+
+    sent = []
+    result = asyncio.run(realtime.analyze(ITEMS, sent=sent))
+    assert result["sectors"][0]["name"] == "芯片"
+    assert sent == [item for shard in map_reduce.shard_news(ITEMS) for item in shard.items]
+    assert "以下为按类别提炼的新闻要点" in client.prompts[-1]
+    assert "央行政策0" not in client.prompts[-1]
+    assert not any(client.cached)  # 每次都不同的分析请求不进响应缓存
+
+    # 所有分片失败：退回单次分析，直接送新闻列表
+    client = FakeClient(fail=tuple(map_reduce.CATEGORY_NAMES.values()))
+    monkeypatch.setattr(map_reduce, "AIClient", lambda: client)
+    monkeypatch.setattr(realtime, "AIClient", lambda: client)
+    assert asyncio.run(realtime.analyze(ITEMS))["sectors"]
+    assert "央行政策0" in client.prompts[-1]
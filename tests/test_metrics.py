@@ -0,0 +1,86 @@
+"""运行指标测试"""
+
+import asyncio
+import json
+
+from src.collectors import rss_base
+from src.collectors.cls_news import CLSNewsCollector
+from src.collectors.http_cache import HttpCache
+from src.collectors.replay import Recording
+from src.config import settings
+from src.metrics import HISTORY_LIMIT, Metrics, metrics
+
+
+def test_timers_and_counters_aggregate_by_labels():
+    m = Metrics()
+    m.observe("stage_seconds", 0.5, stage="collect")
+    m.observe("stage_seconds", 1.5, stage="collect")
+    m.observe("stage_seconds", 2.0, stage="ai_analyze")
+    m.inc("http_bytes", 100, host="a")
+    m.inc("http_bytes", 50, host="a")
+    with m.timer("stage_seconds", stage="save"):
+        pass
+
+    stats = m.timer_stats("stage_seconds", stage="collect")
+    assert (stats.count, stats.total, stats.max) == (2, 2.0, 1.5)
+    assert m.counter("http_bytes", host="a") == 150
+    assert m.counter("http_bytes", host="b") == 0
+    assert m.timer_stats("stage_seconds", stage="save").count == 1
+
+
+def test_prometheus_text():
+    m = Metrics()
+    m.observe("ai_request_seconds", 1.25, model="deepseek", purpose="analyze")
+    m.inc("http_requests", host="www.cls.cn", status=200)
+    m.inc("zz_last", 1)
+    text = m.to_prometheus(extra={"collect": {"timers": [], "counters": [
+        {"name": "collector_items", "labels": {"collector": "Jin10Collector"}, "value": 30},
+        {"name": "http_requests", "labels": {"host": "www.jin10.com", "status": "200"}, "value": 2},
+    ]}})
+    assert "# TYPE etfwind_ai_request_seconds_sum counter" in text
+    assert 'etfwind_ai_request_seconds_sum{model="deepseek",purpose="analyze"} 1.25' in text
+    assert 'etfwind_http_requests_total{host="www.cls.cn",status="200"} 1' in text
+    assert 'etfwind_collector_items_total{collector="Jin10Collector",phase="collect"} 30' in text
+    # 同一指标跨 phase 的样本连续输出，TYPE 只声明一次
+    lines = text.splitlines()
+    families = [line.split("{")[0].split(" ")[0] for line in lines if not line.startswith("#")]
+    positions = [i for i, f in enumerate(families) if f == "etfwind_http_requests_total"]
+    assert len(positions) == 2 and positions[1] == positions[0] + 1
+    assert lines.count("# TYPE etfwind_http_requests_total counter") == 1
+
+
+def test_write_json_prom_and_bounded_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_prometheus", True)
+    history = tmp_path / "archive" / "metrics_history.jsonl"
+    m = Metrics()
+    m.observe("stage_seconds", 3.0, stage="ai_analyze")
+    collect = Metrics()
+    collect.inc("collector_items", 50, collector="CLSNewsCollector")
+
+    for _ in range(HISTORY_LIMIT + 3):
+        m.write(tmp_path / "metrics.json", extra={"collect": collect.snapshot()}, history=history)
+
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["timers"][0]["labels"] == {"stage": "ai_analyze"}
+    assert data["collect"]["counters"][0]["value"] == 50
+    assert (tmp_path / "metrics.prom").read_text().startswith("# TYPE")
+    lines = history.read_text().splitlines()
+    assert len(lines) == HISTORY_LIMIT
+    last = json.loads(lines[-1])
+    assert last["timers"] == {"stage_seconds{stage=ai_analyze}": 3.0}
+    assert last["collect"]["counters"] == {"collector_items{collector=CLSNewsCollector}": 50}
+
+
+def test_collectors_record_host_and_collector_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(rss_base, "http_cache", HttpCache(path=tmp_path / "http_cache.json"))
+    cls = CLSNewsCollector()
+    Recording().attach(cls)
+    before_items = metrics.counter("collector_items", collector=cls.name)
+    before_bytes = metrics.counter("http_bytes", host="www.cls.cn")
+
+    items = asyncio.run(cls.safe_collect())
+
+    assert metrics.counter("collector_items", collector=cls.name) - before_items == len(items) > 0
+    assert metrics.counter("http_bytes", host="www.cls.cn") - before_bytes > 10_000
+    assert metrics.counter("http_requests", host="www.cls.cn", status=200) >= 1
+    assert metrics.timer_stats("collector_seconds", collector=cls.name).count >= 1
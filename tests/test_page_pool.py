@@ -0,0 +1,40 @@
+"""Playwright 页面池与资源拦截测试（不启动浏览器）"""
+
+import asyncio
+import time
+
+from src.collectors.jin10 import Jin10Collector
+from src.collectors.playwright_base import PagePool
+
+
+def test_same_domain_spaced_other_domains_parallel():
+    pool = PagePool(max_pages=3, domain_interval=(0.1, 0.1))
+    opened: dict[str, list[float]] = {}
+
+    async def turn(domain: str):
+        await pool._wait_turn(domain)
+        opened.setdefault(domain, []).append(time.monotonic())
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(turn("a.com"), turn("a.com"), turn("b.com"), turn("c.com"))
+        return start
+
+    start = asyncio.run(main())
+    a1, a2 = opened["a.com"]
+    assert a2 - a1 >= 0.09
+    # 不同域名无需等待
+    assert opened["b.com"][0] - start < 0.05
+    assert opened["c.com"][0] - start < 0.05
+
+
+def test_resource_blocking_rules():
+    collector = Jin10Collector()
+    assert not collector.should_block("https://www.jin10.com/", "document")
+    assert not collector.should_block("https://flash-api.jin10.com/get_flash_list", "xhr")
+    assert collector.should_block("https://cdn.jin10.com/logo.png", "image")
+    assert collector.should_block("https://www.jin10.com/app.css", "stylesheet")
+    # 统计脚本即使是允许的类型也拦截
+    assert collector.should_block("https://hm.baidu.com/hm.js?abc", "script")
+    assert collector.should_block("https://ssl.google-analytics.com/ga.js", "script")
+    assert not collector.should_block("https://notbaidu.com/app.js", "script")
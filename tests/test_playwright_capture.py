@@ -0,0 +1,67 @@
+"""Playwright 采集器接口捕获解析测试"""
+
+import asyncio
+
+from src.collectors.cls_playwright import CLSPlaywrightCollector
+from src.collectors.jin10 import Jin10Collector
+from src.collectors.wallstreetcn import WallStreetCNCollector
+from src.metrics import metrics
+from src.models import NewsItem
+
+
+def test_jin10_parse_captured():
+    payload = {
+        "status": 200,
+        "data": [
+            {"time": "2026-03-02 14:25:13", "type": 0, "data": {"content": "<b>美联储</b>维持利率不变，符合市场预期"}},
+            {"time": "2026-03-02 14:20:00", "type": 1, "data": {}},  # 数据类条目，无正文
+            {"time": "2026-03-02 14:25:13", "type": 0, "data": {"content": "<b>美联储</b>维持利率不变，符合市场预期"}},
+        ],
+    }
+    items = Jin10Collector().parse_captured("https://www.jin10.com/", [payload])
+    assert len(items) == 1
+    assert items[0].title == "美联储维持利率不变，符合市场预期"
+    assert items[0].published_at.isoformat() == "2026-03-02T14:25:13+08:00"
+
+
+def test_wallstreetcn_parse_captured():
+    payload = {"code": 20000, "data": {"items": [
+        {"content_text": "欧洲三大股指收盘涨跌不一，德国DAX指数涨0.5%", "display_time": 1772432713,
+         "uri": "https://wallstreetcn.com/livenews/1"},
+        {"content_text": "短讯", "display_time": 1772432700},
+    ]}}
+    items = WallStreetCNCollector().parse_captured("https://wallstreetcn.com/live/global", [payload])
+    assert len(items) == 1
+    assert items[0].url == "https://wallstreetcn.com/livenews/1"
+    assert items[0].published_at.utcoffset().total_seconds() == 8 * 3600
+
+
+def test_cls_parse_captured_reuses_telegraph_parser():
+    payload = {"error": 0, "data": {"roll_data": [
+        {"title": "", "content": "【央行开展逆回购操作】央行今日开展2000亿元逆回购操作", "ctime": 1772432713,
+         "shareurl": "https://api3.cls.cn/share/article/1"},
+    ]}}
+    items = CLSPlaywrightCollector().parse_captured("https://www.cls.cn/telegraph", [payload])
+    assert len(items) == 1
+    assert items[0].source == "财联社电报"
+    assert items[0].category.value == "macro"
+    assert items[0].url == "https://api3.cls.cn/share/article/1"
+
+
+def test_empty_capture_falls_back():
+    assert Jin10Collector().parse_captured("https://www.jin10.com/", [None, {"data": None}]) == []
+
+
+def test_safe_collect_records_blocking_summary():
+    class Fake(CLSPlaywrightCollector):
+        async def collect(self):
+            self.blocked.update({"image": 3, "font": 1})
+            self.bytes_saved = 4096
+            return [NewsItem(title="央行开展逆回购操作", source="财联社电报")]
+
+    collector = Fake()
+    before = metrics.counter("playwright_blocked_requests", collector=collector.name)
+    items_before = metrics.counter("collector_items", collector=collector.name)
+    assert len(asyncio.run(collector.safe_collect())) == 1
+    assert metrics.counter("playwright_blocked_requests", collector=collector.name) - before == 4
+    assert metrics.counter("collector_items", collector=collector.name) - items_before == 1
@@ -0,0 +1,62 @@
+"""分析提示词预算测试"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from src.analyzers import realtime
+from src.analyzers.prompt_budget import BEIJING_TZ, format_news_line, pack_news
+from src.models import NewsItem
+from src.services.ai_client import estimate_tokens
+
+NOW = datetime(2026, 3, 2, 15, 0, tzinfo=BEIJING_TZ)
+
+
+def _item(title: str, source: str = "财联社", hours_ago: float = 1, dup: int = 1) -> NewsItem:
+    return NewsItem(title=title, source=source, dup_count=dup, published_at=NOW - timedelta(hours=hours_ago))
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("黄金价格突破2800美元") == 8 + 1
+    assert estimate_tokens("Fed holds rates") == 4
+
+
+def test_everything_fits_keeps_original_order():
+    items = [_item(f"新闻{i}", hours_ago=i) for i in range(5)]
+    packed = pack_news(items, budget=10_000, now=NOW)
+    assert packed.items == items and packed.dropped == 0
+    assert packed.render().splitlines()[0] == format_news_line(1, items[0])
+
+
+def test_budget_prefers_recent_multi_source_and_diverse_items():
+    old = [_item(f"财联社旧闻{i}", hours_ago=30 + i) for i in range(20)]
+    fresh = [_item(f"财联社快讯{i}", hours_ago=0.5) for i in range(6)]
+    other = _item("BBC report", source="BBC", hours_ago=2)
+    hot = _item("多家媒体报道的重大新闻", hours_ago=20, dup=4)
+    items = [*old, *fresh, other, hot]
+
+    budget = sum(estimate_tokens(format_news_line(len(items), i)) + 1 for i in [*fresh[:4], other, hot])
+    packed = pack_news(items, budget=budget, now=NOW)
+
+    assert hot in packed.items and other in packed.items
+    assert not set(map(id, old)) & set(map(id, packed.items))
+    assert packed.dropped == len(items) - len(packed.items)
+    assert estimate_tokens(packed.render().rsplit("\n", 1)[0]) <= budget
+    assert packed.render().endswith(f"（另有 {packed.dropped} 条较旧或来源重复的新闻因篇幅省略）")
+
+
+def test_analyze_reports_only_items_that_fit(monkeypatch):
+    class FakeClient:
+        async def send(self, req):
+            return json.dumps({"sectors": []})
+
+    monkeypatch.setattr(realtime, "AIClient", FakeClient)
+    monkeypatch.setattr(realtime.settings, "map_reduce_threshold", 0)
+    monkeypatch.setattr(realtime.settings, "analysis_input_tokens", 0)
+    items = [_item(f"财联社快讯{i}" * 20, hours_ago=i % 48) for i in range(400)]
+
+    sent = []
+    asyncio.run(realtime.analyze(items, sent=sent))
+    assert 0 < len(sent) < len(items)
+    assert {id(i) for i in sent} <= {id(i) for i in items}
@@ -0,0 +1,95 @@
+"""主机令牌桶调度器测试"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.http_pool import HostPool
+from src.services.rate_limiter import HostPolicy, HostScheduler, parse_policies
+
+
+def test_parse_policies():
+    policies = parse_policies("sina_kline=2:4:1, eastmoney_push2his=12:12,bad,x=abc")
+    assert policies["sina_kline"].rate == 2
+    assert policies["sina_kline"].burst == 4
+    assert policies["sina_kline"].concurrency == 1
+    assert policies["eastmoney_push2his"].concurrency == 5  # 未指定时沿用默认
+    assert "x" not in policies and "bad" not in policies
+
+
+def test_host_keys_share_default_bucket():
+    scheduler = HostScheduler()
+    assert scheduler.key_for("push2his.eastmoney.com") == "eastmoney_push2his"
+    assert scheduler.bucket("unknown.example.com").policy == scheduler.policies["default"]
+
+
+def test_burst_then_rate_limited():
+    scheduler = HostScheduler({"t": HostPolicy(rate=50, burst=3, concurrency=10)}, host_keys={})
+
+    async def hit():
+        async with scheduler.slot("t"):
+            pass
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(hit() for _ in range(8)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    # 突发 3 个立即放行，其余 5 个按 50 req/s 放行，约 0.1s
+    assert elapsed >= 0.08
+    stats = scheduler.stats()["t"]
+    assert stats["requests"] == 8
+    assert stats["throttled"] >= 1
+    assert stats["max_queue_depth"] >= 5
+
+
+def test_concurrency_cap():
+    scheduler = HostScheduler({"t": HostPolicy(rate=1000, burst=100, concurrency=2)}, host_keys={})
+    peak = 0
+
+    async def hit():
+        nonlocal peak
+        async with scheduler.slot("t") as bucket:
+            peak = max(peak, bucket.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(hit() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+
+def test_adaptive_backoff_and_recovery():
+    scheduler = HostScheduler({"t": HostPolicy(rate=8, burst=8, min_rate=1)}, host_keys={})
+    for _ in range(5):
+        scheduler.penalize("t")
+    bucket = scheduler.bucket("t")
+    assert bucket.rate == 1  # 不低于下限
+    assert bucket.tokens <= 0
+    for _ in range(20):
+        scheduler.reward("t")
+    assert bucket.rate == 8  # 不超过配置速率
+    assert scheduler.stats()["t"]["backoffs"] == 5
+
+
+def test_transport_errors_slow_the_host_down():
+    scheduler = HostScheduler({"t": HostPolicy(rate=8, burst=8, min_rate=1)}, host_keys={"example.com": "t"})
+    pool = HostPool(scheduler=scheduler)
+
+    def handler(request):
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    async def main():
+        pool._clients["example.com"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.ConnectTimeout):
+                await pool.get("https://example.com/kline")
+            return scheduler.bucket("example.com").rate, scheduler.stats()["t"]["backoffs"]
+        finally:
+            await pool.aclose()
+
+    assert asyncio.run(main()) == (4, 1)
@@ -0,0 +1,101 @@
+"""信号复盘计算测试 - 与逐条循环的参考实现对比"""
+
+import random
+from datetime import date, timedelta
+
+from src.services.review_engine import compute_review
+
+
+def _reference(signals, code_to_kline, benchmark_kline, horizons):
+    """逐信号线性扫描的参考实现"""
+    def pick(dates, entry_date):
+        for i, d in enumerate(dates):
+            if d >= entry_date:
+                return i
+        return None
+
+    bench_dates = [d for d, _ in benchmark_kline]
+    bench_closes = [c for _, c in benchmark_kline]
+    out = {}
+    for h in horizons:
+        returns, excess = [], []
+        for s in signals:
+            kline = code_to_kline.get(s.get("etf_code"), [])
+            if not kline:
+                continue
+            dates = [d for d, _ in kline]
+            closes = [c for _, c in kline]
+            idx = pick(dates, s["date"])
+            if idx is None or idx + h >= len(closes):
+                continue
+            ret = (closes[idx + h] - closes[idx]) / closes[idx] * 100
+            returns.append(ret)
+            bidx = pick(bench_dates, s["date"])
+            if bidx is not None and bidx + h < len(bench_closes):
+                bret = (bench_closes[bidx + h] - bench_closes[bidx]) / bench_closes[bidx] * 100
+                excess.append(ret - bret)
+        if returns:
+            out[str(h)] = {
+                "count": len(returns),
+                "win_rate": round(sum(1 for r in returns if r > 0) / len(returns) * 100, 1),
+                "avg_return": round(sum(returns) / len(returns), 2),
+                "avg_excess": round(sum(excess) / len(excess), 2) if excess else 0,
+            }
+        else:
+            out[str(h)] = {"count": 0, "win_rate": 0, "avg_return": 0, "avg_excess": 0}
+    return out
+
+
+def _trading_days(start: date, n: int, skip: int = 0) -> list[str]:
+    days, d = [], start
+    while len(days) < n:
+        if d.weekday() < 5 and (not skip or d.toordinal() % skip):
+            days.append(d.isoformat())
+        d += timedelta(days=1)
+    return days
+
+
+def test_matches_reference_implementation():
+    rng = random.Random(42)
+    start = date(2026, 1, 1)
+    bench = [(d, 4000 + rng.uniform(-50, 50)) for d in _trading_days(start, 120)]
+    code_to_kline = {
+        # 部分 ETF 有停牌（缺交易日）
+        code: [(d, 1 + rng.uniform(-0.1, 0.1)) for d in _trading_days(start, 100 + i * 5, skip=7 + i)]
+        for i, code in enumerate(["518880", "512480", "159915"])
+    }
+    code_to_kline["000000"] = []
+    signals = [
+        {
+            "date": (start + timedelta(days=rng.randint(0, 170))).isoformat(),
+            "etf_code": rng.choice(list(code_to_kline) + ["999999"]),
+        }
+        for _ in range(200)
+    ]
+    horizons = [1, 3, 7, 20]
+
+    assert compute_review(signals, code_to_kline, bench, horizons) == \
+        _reference(signals, code_to_kline, bench, horizons)
+
+
+def test_empty_inputs():
+    horizons = [1, 3]
+    empty = {"count": 0, "win_rate": 0, "avg_return": 0, "avg_excess": 0}
+    assert compute_review([], {}, [], horizons) == {"1": empty, "3": empty}
+
+    kline = [("2026-01-05", 1.0), ("2026-01-06", 1.1)]
+    result = compute_review([{"date": "2026-01-05", "etf_code": "518880"}], {"518880": kline}, [], horizons)
+    assert result["1"] == {"count": 1, "win_rate": 100.0, "avg_return": 10.0, "avg_excess": 0}
+    assert result["3"] == empty
+
+
+def test_unparsable_signal_dates_are_skipped():
+    kline = [("2026-01-05", 1.0), ("2026-01-06", 1.1)]
+    signals = [
+        {"date": "2026/01/05", "etf_code": "518880"},
+        {"date": "", "etf_code": "518880"},
+        {"date": None, "etf_code": "518880"},
+        {"date": "2026-01-05", "etf_code": "518880"},
+    ]
+    result = compute_review(signals, {"518880": kline}, kline, [1])
+    assert result["1"] == {"count": 1, "win_rate": 100.0, "avg_return": 10.0, "avg_excess": 0.0}
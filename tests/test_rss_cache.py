@@ -0,0 +1,88 @@
+"""RSS 条件请求缓存测试（httpx.MockTransport，不访问网络）"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from src.collectors import rss_base
+from src.collectors.http_cache import HttpCache
+from src.collectors.rss_base import RSSCollector
+from src.models import NewsItem
+
+FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<item><guid>g1</guid><title>Fed holds rates steady</title><link>https://x/1</link>
+<pubDate>Mon, 02 Mar 2026 08:00:00 GMT</pubDate></item>
+<item><guid>g2</guid><title>Oil jumps 3%</title><link>https://x/2</link></item>
+</channel></rss>"""
+
+
+class _Feed(RSSCollector):
+    RSS_URL = "https://example.com/feed.xml"
+    SOURCE_NAME = "Example"
+    MAX_AGE_HOURS = None
+
+
+def _run(collector, handler):
+    async def main():
+        collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await collector.collect()
+        finally:
+            await collector.close()
+    return asyncio.run(main())
+
+
+def test_conditional_get_reuses_cached_items(tmp_path, monkeypatch):
+    cache = HttpCache(path=tmp_path / "http_cache.json")
+    monkeypatch.setattr(rss_base, "http_cache", cache)
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=FEED, headers={"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 08:00:00 GMT"})
+
+    first = _run(_Feed(), handler)
+    assert [i.title for i in first] == ["Fed holds rates steady", "Oil jumps 3%"]
+    assert "if-none-match" not in seen_headers[0]
+
+    cache.save()
+    monkeypatch.setattr(rss_base, "http_cache", HttpCache(path=tmp_path / "http_cache.json"))
+    second = _run(_Feed(), handler)
+    assert seen_headers[1]["if-modified-since"] == "Mon, 02 Mar 2026 08:00:00 GMT"
+    assert [i.title for i in second] == [i.title for i in first]
+    assert second[0].published_at == first[0].published_at
+
+
+def test_known_guids_are_not_reparsed(monkeypatch):
+    collector = _Feed()
+    known = {"g1": {"title": "cached title", "source": "Example"}}
+    calls = []
+    original = collector._parse_item
+    monkeypatch.setattr(collector, "_parse_item", lambda el: calls.append(1) or original(el))
+
+    entries = collector._parse_entries(FEED, known)
+    assert [(g, i.title) for g, i in entries] == [("g1", "cached title"), ("g2", "Oil jumps 3%")]
+    assert len(calls) == 1
+
+
+def test_not_modified_feed_still_drops_old_entries(tmp_path, monkeypatch):
+    cache = HttpCache(path=tmp_path / "http_cache.json")
+    monkeypatch.setattr(rss_base, "http_cache", cache)
+
+    class Recent(_Feed):
+        MAX_AGE_HOURS = 48
+
+    fresh = datetime.now(timezone.utc) - timedelta(hours=1)
+    stale = datetime.now(timezone.utc) - timedelta(days=5)
+    cache.store(Recent.RSS_URL, '"v1"', None, [
+        ("g1", NewsItem(title="Fed holds rates steady", source="Example", published_at=fresh)),
+        ("g2", NewsItem(title="Oil jumps 3%", source="Example", published_at=stale)),
+        ("g3", NewsItem(title="No date", source="Example")),
+    ])
+
+    items = _run(Recent(), lambda request: httpx.Response(304))
+    assert [i.title for i in items] == ["Fed holds rates steady", "No date"]
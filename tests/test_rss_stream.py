@@ -0,0 +1,77 @@
+"""RSS/Atom 流式解析测试"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+
+from src.collectors import rss_base
+from src.collectors.http_cache import HttpCache
+from src.collectors.rss_base import RSSCollector
+
+
+class _Feed(RSSCollector):
+    RSS_URL = "https://example.com/feed.xml"
+    SOURCE_NAME = "Example"
+
+
+def _rss(n: int, start_hours_ago: float = 0, step_hours: float = 1) -> str:
+    now = datetime.now(timezone.utc)
+    items = "".join(
+        f"<item><guid>g{i}</guid><title>Headline {i}</title>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=start_hours_ago + i * step_hours))}</pubDate></item>"
+        for i in range(n)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{items}</channel></rss>'
+
+
+def test_atom_and_rss_in_single_pass():
+    atom = """<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><id>tag:a,1</id><title>Atom headline</title><link href="https://a/1"/>
+  <updated>2099-01-01T00:00:00Z</updated><summary>s</summary></entry>
+</feed>"""
+    entries = _Feed()._parse_entries(atom)
+    assert [(g, i.title, i.url) for g, i in entries] == [("tag:a,1", "Atom headline", "https://a/1")]
+    assert len(_Feed()._parse_entries(_rss(3))) == 3
+
+
+def test_stops_at_max_items_and_age_cutoff():
+    collector = _Feed()
+    collector.MAX_ITEMS = 4
+    assert [i.title for _, i in collector._parse_entries(_rss(10))] == [f"Headline {i}" for i in range(4)]
+
+    collector = _Feed()
+    collector.MAX_AGE_HOURS = 24
+    # 每条间隔 10 小时：0/10/20 小时前的保留，更早的丢弃
+    assert len(collector._parse_entries(_rss(20, step_hours=10))) == 3
+
+
+def test_stream_stops_downloading_early(tmp_path, monkeypatch):
+    monkeypatch.setattr(rss_base, "http_cache", HttpCache(path=tmp_path / "cache.json"))
+    body = _rss(200).encode()
+    chunk = 512
+    sent = 0
+
+    class _Chunked(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            nonlocal sent
+            for i in range(0, len(body), chunk):
+                sent += 1
+                yield body[i:i + chunk]
+
+    async def main():
+        collector = _Feed()
+        collector.MAX_ITEMS = 5
+        collector._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda req: httpx.Response(200, stream=_Chunked()))
+        )
+        try:
+            return await collector.collect()
+        finally:
+            await collector.close()
+
+    items = asyncio.run(main())
+    assert len(items) == 5
+    assert sent < len(body) // chunk // 4
@@ -0,0 +1,50 @@
+"""板块别名索引测试"""
+
+import json
+
+from src.services.sector_index import SectorIndex, normalize
+
+MASTER = {
+    "sector_list": ["芯片", "AI", "黄金", "新能源车", "光伏"],
+    "etfs": {
+        "512480": {"sector": "芯片", "tags": ["半导体", "集成电路"], "related": ["AI"]},
+        "159995": {"sector": "芯片", "tags": ["半导体", "国产替代"]},
+        "515070": {"sector": "AI", "tags": ["人工智能", "算力"], "related": ["芯片"]},
+        "518880": {"sector": "黄金", "tags": ["贵金属", "避险"]},
+        "515030": {"sector": "新能源车", "tags": ["电动车", "锂电池"]},
+        "515790": {"sector": "光伏", "tags": ["太阳能", "硅料"]},
+    },
+}
+
+
+def test_normalize_strips_suffixes():
+    assert normalize(" 半导体板块 ") == "半导体"
+    assert normalize("cpo概念") == "CPO"
+    assert normalize("AI产业链") == "AI"
+    assert normalize("ETF") == "ETF"
+
+
+def test_resolve_match_order():
+    index = SectorIndex(MASTER)
+    assert index.resolve("芯片") == (["芯片"], "exact")
+    assert index.resolve("半导体概念") == (["芯片"], "alias")
+    assert index.resolve("人工智能") == (["AI"], "alias")
+    assert index.resolve("锂电池产业") == (["新能源车"], "substring")
+    assert index.resolve("太阳能电") == (["光伏"], "substring")
+    assert index.resolve("集成电") == (["芯片"], "substring")
+    assert index.resolve("贵金属价") == (["黄金"], "substring")
+    assert index.resolve("人工智慧") == (["AI"], "ngram")
+    assert index.resolve("航运") == ([], "none")
+
+
+def test_learn_keeps_valid_sectors_and_round_trips(tmp_path):
+    path = tmp_path / "sector_aliases.json"
+    index = SectorIndex.load(MASTER, learned_file=path)
+    accepted = index.learn({"航运": ["不存在"], "CPO": ["AI", "芯片", "不存在"]})
+    assert accepted == {"CPO": ["AI", "芯片"]}
+    index.save()
+
+    reloaded = SectorIndex.load(MASTER, learned_file=path)
+    assert json.loads(path.read_text()) == {"CPO": ["AI", "芯片"]}
+    assert reloaded.resolve("CPO概念") == (["AI", "芯片"], "learned")
+    assert reloaded.resolve("航运") == ([], "none")
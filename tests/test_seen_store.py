@@ -0,0 +1,38 @@
+"""已分析新闻指纹库测试"""
+
+from src.collectors.seen_store import SeenStore, build_seen_digest
+from src.models import NewsItem
+
+
+def _items(*titles):
+    return [NewsItem(title=t, source="财联社") for t in titles]
+
+
+def test_tag_add_and_persist(tmp_path):
+    path = tmp_path / "seen.json"
+    store = SeenStore(path=path, today="2026-03-02")
+    first = _items("央行开展2000亿元逆回购操作", "宁德时代发布钠离子电池")
+    assert store.tag(first) == 2
+    store.add(first)
+    store.save()
+
+    store = SeenStore(path=path, today="2026-03-02")
+    # 转载时标点/前缀不同也视为已分析
+    later = _items("财联社3月2日电，央行开展2000亿元逆回购操作。", "沪指午后翻红")
+    assert store.tag(later) == 1
+    assert [i.is_new for i in later] == [False, True]
+
+
+def test_resets_on_new_day(tmp_path):
+    path = tmp_path / "seen.json"
+    store = SeenStore(path=path, today="2026-03-02")
+    store.add(_items("央行开展2000亿元逆回购操作"))
+    store.save()
+    assert len(SeenStore(path=path, today="2026-03-03")) == 0
+
+
+def test_digest_prefers_cross_source_items():
+    items = _items("a" * 50, "bbb", "ccc")
+    items[2].dup_count = 3
+    digest = build_seen_digest(items, limit=2, width=10)
+    assert digest.splitlines() == ["- ccc", "- aaaaaaaaaa", "- ……另有 1 条"]
@@ -0,0 +1,22 @@
+"""交易日历测试"""
+
+import numpy as np
+
+from src.services.trading_calendar import TradingCalendar, to_ordinal, to_ordinals
+
+# 2026-01-01(四) 元旦休市，01-03/04 周末
+DAYS = ["2026-01-02", "2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08", "2026-01-09"]
+
+
+def test_positions_find_first_trading_day_not_before():
+    cal = TradingCalendar.from_kline([(d, 1.0) for d in DAYS])
+    assert len(cal) == 6
+    queries = ["2026-01-01", "2026-01-02", "2026-01-04", "2026-01-06", "2026-01-09", "2026-01-12"]
+    # 元旦和周末落到下一个交易日，超出范围为 len
+    assert cal.positions(to_ordinals(queries)).tolist() == [0, 0, 1, 2, 5, 6]
+
+
+def test_ordinal_helpers():
+    assert to_ordinal("2026-01-05") == to_ordinals(["2026-01-05"])[0]
+    assert to_ordinal("bad") is None
+    assert isinstance(to_ordinals(DAYS), np.ndarray)